@@ -0,0 +1,290 @@
+"""Asyncio helpers for processing large batches of colors.
+
+Every function in this module splits its input into chunks and hands the
+control back to the event loop between them, so converting a huge color set
+does not block other coroutines. Heavy batches can be offloaded to an executor
+(a thread or a process pool) by passing it as the `executor` argument.
+
+The `iter_*` functions stream their results: at most `max_pending` chunks are
+being processed or waiting to be consumed at any given time, so the memory
+usage stays bounded regardless of the size of the input.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from functools import partial
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
+
+from .color import Color
+from .convert import convert, converter
+from .harmony import HARMONY_RULES, HarmonyRule
+
+DEFAULT_CHUNK_SIZE = 1024
+DEFAULT_MAX_PENDING = 4
+
+
+def _harmony_chunk(
+    chunk: "List[Color]", rule: str, kwargs: dict
+) -> "List[HarmonyRule]":
+    apply_rule = getattr(Color, f"harmony_{rule}")
+
+    return [apply_rule(color, **kwargs) for color in chunk]
+
+
+async def _iter_chunks(
+    values: "Union[Iterable[Any], AsyncIterable[Any]]", chunk_size: int
+) -> "AsyncIterator[List[Any]]":
+    if hasattr(values, "__aiter__"):
+        chunk = []
+        async for value in values:
+            chunk.append(value)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+        return
+
+    iterator = iter(values)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+async def _run_chunk(
+    func: "Callable[[List[Any]], List[Any]]",
+    chunk: "List[Any]",
+    executor: "Optional[Executor]",
+) -> "List[Any]":
+    if executor is None:
+        return func(chunk)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, func, chunk)
+
+
+async def _pipeline(
+    values: "Union[Iterable[Any], AsyncIterable[Any]]",
+    func: "Callable[[List[Any]], List[Any]]",
+    chunk_size: int,
+    max_pending: int,
+    executor: "Optional[Executor]",
+) -> "AsyncIterator[Any]":
+    if chunk_size < 1:
+        raise ValueError(
+            f"Expected chunk_size to be a positive integer, but got {chunk_size}"
+        )
+
+    if max_pending < 1:
+        raise ValueError(
+            f"Expected max_pending to be a positive integer, but got {max_pending}"
+        )
+
+    loop = asyncio.get_running_loop()
+
+    # Every chunk takes a slot before it is read from the input, and gives it
+    # back once its results are consumed. The producer waits for a free slot,
+    # so at most max_pending chunks are read, processed or waiting at once.
+    # The queue passes them to the consumer in order and never blocks, as it
+    # can not hold more chunks than there are slots
+    slots = asyncio.Semaphore(max_pending)
+    queue = asyncio.Queue()
+
+    async def produce() -> None:
+        chunks = _iter_chunks(values, chunk_size)
+        try:
+            while True:
+                await slots.acquire()
+                try:
+                    chunk = await chunks.__anext__()
+                except StopAsyncIteration:
+                    break
+
+                queue.put_nowait(
+                    asyncio.ensure_future(_run_chunk(func, chunk, executor))
+                )
+        except Exception as exc:
+            failed = loop.create_future()
+            failed.set_exception(exc)
+            queue.put_nowait(failed)
+        else:
+            queue.put_nowait(None)
+        finally:
+            await chunks.aclose()
+
+    producer = asyncio.ensure_future(produce())
+
+    try:
+        while True:
+            pending = await queue.get()
+            if pending is None:
+                break
+
+            for result in await pending:
+                yield result
+
+            slots.release()
+    finally:
+        producer.cancel()
+        while not queue.empty():
+            pending = queue.get_nowait()
+            if pending is not None:
+                pending.cancel()
+
+
+def iter_convert(
+    values: "Union[Iterable[Any], AsyncIterable[Any]]",
+    src: str,
+    dst: str,
+    *,
+    transform: "Optional[str]" = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_pending: int = DEFAULT_MAX_PENDING,
+    executor: "Optional[Executor]" = None,
+) -> "AsyncIterator[Any]":
+    """Converts colors from one color space to another, yielding the results
+    one by one in the order of the input.
+
+    Args:
+        values (Iterable | AsyncIterable): colors in the source color space.
+        Hex colors are passed as strings, all other spaces as tuples
+        (e.g. (61, 255, 226) for RGB)
+        src (str): the source color space, see ciris.convert.spaces()
+        dst (str): the target color space
+        transform (str, optional): the name of a transform to apply on the
+        way, e.g. "simulate_protanopia", see ciris.convert.transforms()
+        chunk_size (int): how many colors are converted at once
+        max_pending (int): how many chunks may be in flight at once
+        executor (Executor, optional): an executor to run the conversion in.
+        If omitted, the conversion runs in the event loop's thread
+
+    Raises:
+        ValueError: if the conversion is not possible
+        ValueError: if the transform is not registered
+
+    Returns:
+        AsyncIterator: an async iterator over the converted colors
+    """
+    # Fails early if the conversion is not possible
+    converter(src, dst, transform)
+
+    return _pipeline(
+        values,
+        partial(convert, src=src, dst=dst, transform=transform),
+        chunk_size,
+        max_pending,
+        executor,
+    )
+
+
+async def convert_many(
+    values: "Union[Iterable[Any], AsyncIterable[Any]]",
+    src: str,
+    dst: str,
+    *,
+    transform: "Optional[str]" = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_pending: int = DEFAULT_MAX_PENDING,
+    executor: "Optional[Executor]" = None,
+) -> "List[Any]":
+    """Converts colors from one color space to another. This is a
+    convenience wrapper around iter_convert() that collects the results
+    into a list, see its documentation for the description of the arguments
+
+    Returns:
+        List: a list of converted colors
+    """
+    return [
+        value
+        async for value in iter_convert(
+            values,
+            src,
+            dst,
+            transform=transform,
+            chunk_size=chunk_size,
+            max_pending=max_pending,
+            executor=executor,
+        )
+    ]
+
+
+def iter_harmonies(
+    colors: "Union[Iterable[Color], AsyncIterable[Color]]",
+    rule: str,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_pending: int = DEFAULT_MAX_PENDING,
+    executor: "Optional[Executor]" = None,
+    **kwargs: "Any",
+) -> "AsyncIterator[HarmonyRule]":
+    """Applies a color harmony rule to every color, yielding the resulting
+    HarmonyRule objects one by one in the order of the input.
+
+    Args:
+        colors (Iterable[Color] | AsyncIterable[Color]): the base colors
+        rule (str): the harmony rule to apply ("complementary",
+        "split_complementary", "triadic", "tetradic" or "analogous")
+        chunk_size (int): how many colors are processed at once
+        max_pending (int): how many chunks may be in flight at once
+        executor (Executor, optional): an executor to run the calculations in
+        **kwargs: extra arguments for the Color.harmony_<rule> method (e.g. phi)
+
+    Raises:
+        ValueError: if the harmony rule is not supported
+
+    Returns:
+        AsyncIterator[HarmonyRule]: an async iterator over the harmony rules
+    """
+    if rule not in HARMONY_RULES:
+        raise ValueError(
+            f"Expected harmony rule to be one of {', '.join(HARMONY_RULES)}, but got {rule!r}"
+        )
+
+    return _pipeline(
+        colors,
+        partial(_harmony_chunk, rule=rule, kwargs=kwargs),
+        chunk_size,
+        max_pending,
+        executor,
+    )
+
+
+async def harmonies(
+    colors: "Union[Iterable[Color], AsyncIterable[Color]]",
+    rule: str,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_pending: int = DEFAULT_MAX_PENDING,
+    executor: "Optional[Executor]" = None,
+    **kwargs: "Any",
+) -> "List[HarmonyRule]":
+    """Applies a color harmony rule to every color. This is a convenience
+    wrapper around iter_harmonies() that collects the results into a list,
+    see its documentation for the description of the arguments
+
+    Returns:
+        List[HarmonyRule]: a list of harmony rules
+    """
+    return [
+        harmony
+        async for harmony in iter_harmonies(
+            colors,
+            rule,
+            chunk_size=chunk_size,
+            max_pending=max_pending,
+            executor=executor,
+            **kwargs,
+        )
+    ]
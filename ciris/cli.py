@@ -0,0 +1,373 @@
+"""The `ciris` command line tool.
+
+Converts colors between color spaces or applies harmony rules to them in
+bulk, e.g. in build scripts:
+
+    $ printf '#3DFFE2\\n#FCBA03\\n' | ciris --to rgb
+    61,255,226
+    252,186,3
+
+The input is read from the files passed as arguments or from the standard
+input in chunks of lines, and the output of every chunk is written with a
+single call, so the memory usage does not depend on the size of the input.
+With --jobs N the chunks are processed by N worker processes, and at most
+2 * N chunks are in flight at any given time.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+
+from .color import Color
+from .convert import converter, spaces, transforms
+from .harmony import HARMONY_RULES, PHI_RULES
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+
+FORMATS = ("lines", "csv", "ndjson")
+
+DEFAULT_CHUNK_SIZE = 4096
+
+# Size of the read buffer of the input files
+BUFFER_SIZE = 1 << 16
+
+
+def _parse_number(field: str) -> float:
+    try:
+        return int(field)
+    except ValueError:
+        return float(field)
+
+
+def _parse_fields(fields: "List[str]", space: str) -> "Any":
+    if space == "hex":
+        if len(fields) != 1:
+            raise ValueError(
+                f"Expected a single hex-string, but got {len(fields)} values"
+            )
+        return fields[0]
+
+    return tuple(_parse_number(field) for field in fields)
+
+
+def _iter_records(
+    lines: "List[str]", fmt: str, src: str, first_line: int
+) -> "Iterator[Tuple[int, Any]]":
+    """Yields the line number and the parsed color of every non-empty
+    record"""
+    if fmt == "csv":
+        reader = csv.reader(lines)
+        for row in reader:
+            fields = [field.strip() for field in row]
+            if any(fields):
+                # A quoted field may span several lines, so the number of
+                # the last line of the record is reported
+                line_number = first_line + reader.line_num - 1
+                yield line_number, partial(_parse_fields, fields, src)
+        return
+
+    for line_number, line in enumerate(lines, first_line):
+        line = line.strip()
+        if not line:
+            continue
+
+        if fmt == "ndjson":
+            yield line_number, partial(_parse_json, line)
+        else:
+            yield line_number, partial(
+                _parse_fields, line.replace(",", " ").split(), src
+            )
+
+
+def _parse_json(line: str) -> "Any":
+    value = json.loads(line)
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _format_values(values: "List[Any]", fmt: str) -> str:
+    if fmt == "ndjson":
+        value = values[0] if len(values) == 1 else values
+        return json.dumps(value) + "\n"
+
+    if fmt == "csv":
+        buffer = io.StringIO()
+        fields = []
+        for value in values:
+            fields.extend([value] if isinstance(value, str) else value)
+        csv.writer(buffer, lineterminator="\n").writerow(fields)
+        return buffer.getvalue()
+
+    return (
+        " ".join(
+            value if isinstance(value, str) else ",".join(map(str, value))
+            for value in values
+        )
+        + "\n"
+    )
+
+
+def _color_hsv(color: "Color") -> "Tuple[int, int, int]":
+    # Color stores saturation and value as fractions
+    return (color.h, int(round(color.s * 100)), int(round(color.v * 100)))
+
+
+def _transformer(
+    src: str,
+    dst: str,
+    rule: "Optional[str]",
+    phi: "Optional[int]",
+    transform: "Optional[str]" = None,
+) -> "Callable[[Any], List[Any]]":
+    if rule is None:
+        convert = converter(src, dst, transform)
+        return lambda value: [convert(value)]
+
+    # The transform is applied to every color of the harmony
+    to_hsv = converter(src, "hsv")
+    from_hsv = converter("hsv", dst, transform)
+    apply_rule = getattr(Color, f"harmony_{rule}")
+    kwargs = {} if phi is None else {"phi": phi}
+
+    def transform(value: "Any") -> "List[Any]":
+        harmony = apply_rule(Color(*to_hsv(value)), **kwargs)
+        colors = [harmony.get_base_color(), *harmony.get_secondary_colors()]
+
+        return [from_hsv(_color_hsv(color)) for color in colors]
+
+    return transform
+
+
+def _process_chunk(
+    lines: "List[str]",
+    name: str,
+    first_line: int,
+    *,
+    fmt: str,
+    src: str,
+    dst: str,
+    rule: "Optional[str]",
+    phi: "Optional[int]",
+    transform: "Optional[str]" = None,
+) -> str:
+    """Converts a chunk of input lines into the output text. Runs in the
+    worker processes, so it only takes picklable arguments"""
+    apply = _transformer(src, dst, rule, phi, transform)
+    output = []
+
+    for line_number, parse in _iter_records(lines, fmt, src, first_line):
+        try:
+            values = apply(parse())
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"{name}:{line_number}: {exc}") from None
+
+        output.append(_format_values(values, fmt))
+
+    return "".join(output)
+
+
+def _read_chunks(
+    paths: "Sequence[str]", fmt: str, chunk_size: int
+) -> "Iterator[Tuple[List[str], str, int]]":
+    """Yields chunks of lines along with the name of the input and the number
+    of the first line in the chunk"""
+    for path in paths or ["-"]:
+        if path == "-":
+            name, file = "<stdin>", sys.stdin
+        else:
+            # The csv module expects the newlines to be left untranslated
+            name = path
+            file = open(
+                path,
+                encoding="utf-8",
+                newline="" if fmt == "csv" else None,
+                buffering=BUFFER_SIZE,
+            )
+
+        try:
+            first_line = 1
+            while True:
+                lines = list(islice(file, chunk_size))
+                if not lines:
+                    break
+
+                yield lines, name, first_line
+                first_line += len(lines)
+        finally:
+            if file is not sys.stdin:
+                file.close()
+
+
+def _run(
+    chunks: "Iterator[Tuple[List[str], str, int]]",
+    process: "Callable[..., str]",
+    jobs: int,
+    out: "io.TextIOBase",
+) -> None:
+    if jobs == 1:
+        for chunk in chunks:
+            out.write(process(*chunk))
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # The results are written in the input order. Reading stops while
+        # 2 * jobs chunks are waiting, so a slow consumer does not make the
+        # input pile up in memory
+        pending = deque()
+
+        try:
+            for chunk in chunks:
+                pending.append(executor.submit(process, *chunk))
+                if len(pending) >= 2 * jobs:
+                    out.write(pending.popleft().result())
+
+            while pending:
+                out.write(pending.popleft().result())
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _build_parser() -> "argparse.ArgumentParser":
+    parser = argparse.ArgumentParser(
+        prog="ciris",
+        description="Converts colors between color spaces or applies color harmony rules to them.",
+    )
+    parser.add_argument(
+        "files",
+        nargs="*",
+        metavar="FILE",
+        help="the input files. The standard input is read if omitted or '-'",
+    )
+    parser.add_argument(
+        "-f",
+        "--from",
+        dest="src",
+        choices=spaces(),
+        default="hex",
+        help="the color space of the input (default: hex)",
+    )
+    parser.add_argument(
+        "-t",
+        "--to",
+        dest="dst",
+        choices=spaces(),
+        default="hex",
+        help="the color space of the output (default: hex)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="lines",
+        help="the format of the input and the output: one color per line "
+        "with the values separated by commas or spaces, CSV rows or JSON "
+        "values (default: lines)",
+    )
+    parser.add_argument(
+        "--harmony",
+        choices=HARMONY_RULES,
+        metavar="RULE",
+        help="output the colors of a harmony rule applied to every input "
+        f"color, the base color first. One of {', '.join(HARMONY_RULES)}",
+    )
+    parser.add_argument(
+        "--phi",
+        type=int,
+        help="the offset of the split_complementary and analogous rules",
+    )
+    parser.add_argument(
+        "--transform",
+        choices=transforms(),
+        metavar="NAME",
+        help="transform every output color, e.g. simulate a color vision "
+        f"deficiency. One of {', '.join(transforms())}",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="the number of worker processes (default: 1)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"how many lines are processed at once (default: {DEFAULT_CHUNK_SIZE})",
+    )
+
+    return parser
+
+
+def main(argv: "Optional[Sequence[str]]" = None) -> int:
+    """Runs the command line tool
+
+    Args:
+        argv (Sequence[str], optional): the command line arguments. Default
+        is sys.argv[1:]
+
+    Returns:
+        int: the exit code
+    """
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    if args.jobs < 1:
+        parser.error(f"Expected --jobs to be positive, but got {args.jobs}")
+
+    if args.chunk_size < 1:
+        parser.error(
+            f"Expected --chunk-size to be positive, but got {args.chunk_size}"
+        )
+
+    if args.phi is not None and args.harmony not in PHI_RULES:
+        parser.error(
+            f"--phi is only supported by the {' and '.join(PHI_RULES)} rules"
+        )
+
+    try:
+        # Fails early if the conversion is not possible
+        _transformer(
+            args.src, args.dst, args.harmony, args.phi, args.transform
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    process = partial(
+        _process_chunk,
+        fmt=args.format,
+        src=args.src,
+        dst=args.dst,
+        rule=args.harmony,
+        phi=args.phi,
+        transform=args.transform,
+    )
+
+    try:
+        _run(
+            _read_chunks(args.files, args.format, args.chunk_size),
+            process,
+            args.jobs,
+            sys.stdout,
+        )
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # The reader went away (e.g. `ciris ... | head`). Python would
+        # complain again when flushing stdout at exit, so it is redirected
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    except (OSError, ValueError) as exc:
+        print(f"{parser.prog}: error: {exc}", file=sys.stderr)
+        return 1
+
+    return 0
@@ -0,0 +1,314 @@
+"""Merging near-duplicate colors.
+
+ColorClusters assigns every color to the closest representative within the
+tolerance, or makes it the representative of a new cluster if there is none.
+Representatives are bucketed in a grid of cells as wide as the tolerance, so
+a color is only compared with the representatives in the 27 cells around it,
+and every distinct color is only looked up once. The work grows linearly
+with the number of colors, and the memory with the number of clusters and
+distinct colors, so millions of colors can be streamed through it in chunks.
+
+The first color of a cluster is its representative, thus the clusters depend
+on the order of the input. Every color is within the tolerance from its
+representative, and the representatives are further than the tolerance from
+each other.
+"""
+
+import math
+from array import array
+from copy import copy
+
+from .color import Color, _rgb_to_hsv
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Dict, Iterable, List, Tuple
+
+    Point = Tuple[float, float, float]
+
+
+# "rgb": Euclidean distance between RGB channel values [0..255]
+# "hsv": Euclidean distance in the HSV cylinder, with saturation (the radius)
+#        and value (the height) in range [0..100]. Unlike the plain distance
+#        between HSV values, it ignores the hue of the shades of gray
+# "lab": the CIE76 color difference (delta E) in CIELAB, a perceptual space,
+#        where 2.3 is about the smallest noticeable difference
+SPACES = ("rgb", "hsv", "lab")
+
+# sRGB (D65) to CIE XYZ, scaled by the reference white, so that white is
+# (1, 1, 1)
+_XYZ_MATRIX = (
+    (0.4124564 / 0.95047, 0.3575761 / 0.95047, 0.1804375 / 0.95047),
+    (0.2126729, 0.7151522, 0.0721750),
+    (0.0193339 / 1.08883, 0.1191920 / 1.08883, 0.9503041 / 1.08883),
+)
+
+_LINEAR_TABLE: "List[float]" = []
+
+
+def _lab_component(t: float) -> float:
+    if t > 216 / 24389:
+        return t ** (1 / 3)
+    return t * 841 / 108 + 4 / 29
+
+
+def _rgb_to_lab(r: int, g: int, b: int) -> "Point":
+    if not _LINEAR_TABLE:
+        from .cvd import _decode
+
+        _LINEAR_TABLE.extend(_decode(i) for i in range(256))
+
+    lr, lg, lb = _LINEAR_TABLE[r], _LINEAR_TABLE[g], _LINEAR_TABLE[b]
+    (m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = _XYZ_MATRIX
+
+    fx = _lab_component(m00 * lr + m01 * lg + m02 * lb)
+    fy = _lab_component(m10 * lr + m11 * lg + m12 * lb)
+    fz = _lab_component(m20 * lr + m21 * lg + m22 * lb)
+
+    return (116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz))
+
+
+def _hsv_point(h: float, s: float, v: float) -> "Point":
+    # Saturation and value are fractions, like they are stored by Color
+    angle = math.radians(h)
+    return (s * 100 * math.cos(angle), s * 100 * math.sin(angle), v * 100)
+
+
+class ColorClusters:
+    def __init__(self, tolerance: float, space: str = "rgb") -> None:
+        """Creates an empty set of clusters. Colors are added to it with the
+        add and update methods, which return the cluster of every color
+
+        Args:
+            tolerance (float): the maximum distance between a color and the
+            representative of its cluster. 0 only merges exact duplicates
+            space (str): the space the distance is measured in: "rgb", "hsv"
+            or "lab" (perceptual). Default is "rgb"
+
+        Raises:
+            ValueError: if the tolerance is negative
+            ValueError: if the space is not supported
+        """
+        if tolerance < 0:
+            raise ValueError(
+                f"Expected tolerance to be non-negative, but got {tolerance}"
+            )
+
+        if space not in SPACES:
+            raise ValueError(
+                f"Expected color space to be one of {', '.join(SPACES)}, but got {space!r}"
+            )
+
+        self.tolerance = tolerance
+        self.space = space
+
+        self._cell_size = tolerance if tolerance > 0 else 1
+        self._limit = tolerance * tolerance + 1e-9
+
+        self._representatives: "List[Color]" = []
+        self._points: "List[Point]" = []
+        self._counts: "List[int]" = []
+
+        # Cell -> clusters whose representative is in the cell
+        self._grid: "Dict[Tuple[int, int, int], List[int]]" = {}
+
+        # Color -> cluster, so that the duplicates skip the grid search.
+        # Colors are keyed by their HSV values, RGB pixels by the packed
+        # (r << 16) | (g << 8) | b integer
+        self._cache: "Dict[object, int]" = {}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(tolerance={self.tolerance}, space={self.space!r}, clusters={len(self)})"
+
+    def __len__(self) -> int:
+        return len(self._representatives)
+
+    @property
+    def representatives(self) -> "List[Color]":
+        """The representatives of the clusters, in the order the clusters
+        were created. The colors are copies, so modifying them does not
+        affect the clusters"""
+        return [copy(color) for color in self._representatives]
+
+    @property
+    def counts(self) -> "List[int]":
+        """The number of colors in every cluster"""
+        return list(self._counts)
+
+    def _cell(self, point: "Point") -> "Tuple[int, int, int]":
+        size = self._cell_size
+        return (
+            math.floor(point[0] / size),
+            math.floor(point[1] / size),
+            math.floor(point[2] / size),
+        )
+
+    def _assign(
+        self, point: "Point", make_color: "Callable[[], Color]"
+    ) -> int:
+        x, y, z = point
+        cx, cy, cz = cell = self._cell(point)
+        points = self._points
+        grid = self._grid
+
+        best = -1
+        best_distance = self._limit
+
+        for i in (cx - 1, cx, cx + 1):
+            for j in (cy - 1, cy, cy + 1):
+                for k in (cz - 1, cz, cz + 1):
+                    for cluster in grid.get((i, j, k), ()):
+                        px, py, pz = points[cluster]
+                        distance = (
+                            (px - x) * (px - x)
+                            + (py - y) * (py - y)
+                            + (pz - z) * (pz - z)
+                        )
+                        # The older cluster wins a tie
+                        if distance < best_distance or (
+                            distance == best_distance and cluster < best
+                        ):
+                            best = cluster
+                            best_distance = distance
+
+        if best < 0:
+            best = len(self._representatives)
+            self._representatives.append(make_color())
+            self._points.append(point)
+            self._counts.append(0)
+            grid.setdefault(cell, []).append(best)
+
+        return best
+
+    def add(self, color: "Color") -> int:
+        """Adds a color
+
+        Args:
+            color (Color): the color to add. If it becomes a representative,
+            a copy of it is stored
+
+        Returns:
+            int: the position of the color's cluster in representatives
+        """
+        key = (color.h, color.s, color.v)
+        cluster = self._cache.get(key)
+
+        if cluster is None:
+            if self.space == "hsv":
+                point = _hsv_point(color.h, color.s, color.v)
+            elif self.space == "rgb":
+                point = color.as_rgb()
+            else:
+                point = _rgb_to_lab(*color.as_rgb())
+
+            cluster = self._assign(point, lambda: copy(color))
+            self._cache[key] = cluster
+
+        self._counts[cluster] += 1
+
+        return cluster
+
+    def add_rgb(self, r: int, g: int, b: int) -> int:
+        """Adds a color defined by its RGB channel values. Its representative
+        is created with Color.from_rgb()
+
+        Args:
+            r (int): Red (from 0 up to 255)
+            g (int): Green (from 0 up to 255)
+            b (int): Blue (from 0 up to 255)
+
+        Raises:
+            ValueError: if either of Red, Green or Blue is not in range [0..255]
+
+        Returns:
+            int: the position of the color's cluster in representatives
+        """
+        if not (0 <= r <= 255) or not (0 <= g <= 255) or not (0 <= b <= 255):
+            raise ValueError(
+                f"Expected R, G, B channel values to be in range [0..255], but got {r}, {g}, {b}"
+            )
+
+        key = (r << 16) | (g << 8) | b
+        cluster = self._cache.get(key)
+        if cluster is None:
+            cluster = self._assign_rgb(r, g, b, key)
+
+        self._counts[cluster] += 1
+
+        return cluster
+
+    def _assign_rgb(self, r: int, g: int, b: int, key: int) -> int:
+        if self.space == "hsv":
+            h, s, v = _rgb_to_hsv(r, g, b)
+            point = _hsv_point(h, s * 0.01, v * 0.01)
+        elif self.space == "rgb":
+            point = (r, g, b)
+        else:
+            point = _rgb_to_lab(r, g, b)
+
+        cluster = self._assign(point, lambda: Color.from_rgb(r, g, b))
+        self._cache[key] = cluster
+
+        return cluster
+
+    def update(self, colors: "Iterable[Color]") -> "List[int]":
+        """Adds the colors from a batch
+
+        Args:
+            colors (Iterable[Color]): the colors to add
+
+        Returns:
+            List[int]: the cluster of every color, see add()
+        """
+        return [self.add(color) for color in colors]
+
+    def update_pixels(self, pixels: bytes) -> "array[int]":
+        """Adds the pixels from a buffer that stores them row by row, 3 bytes
+        (red, green, blue) per pixel
+
+        Args:
+            pixels (bytes): the pixel buffer
+
+        Raises:
+            ValueError: if the buffer size is not a multiple of 3
+
+        Returns:
+            array[int]: the cluster of every pixel, see add()
+        """
+        if len(pixels) % 3:
+            raise ValueError(
+                f"Expected the buffer size to be a multiple of 3, but got {len(pixels)}"
+            )
+
+        cache = self._cache
+        counts = self._counts
+        clusters = array("L", [0]) * (len(pixels) // 3)
+
+        for position, i in enumerate(range(0, len(pixels), 3)):
+            r, g, b = pixels[i], pixels[i + 1], pixels[i + 2]
+            key = (r << 16) | (g << 8) | b
+            cluster = cache.get(key)
+            if cluster is None:
+                cluster = self._assign_rgb(r, g, b, key)
+
+            counts[cluster] += 1
+            clusters[position] = cluster
+
+        return clusters
+
+
+def dedupe(
+    colors: "Iterable[Color]", tolerance: float, space: str = "rgb"
+) -> "Tuple[List[Color], List[int]]":
+    """Merges the colors that are within the tolerance from each other. See
+    ColorClusters for the description of the arguments, and for processing
+    the colors in chunks
+
+    Returns:
+        Tuple[List[Color], List[int]]: the representatives of the clusters,
+        and the position of every input color's representative in that list
+    """
+    clusters = ColorClusters(tolerance, space)
+    mapping = clusters.update(colors)
+
+    return clusters.representatives, mapping
@@ -0,0 +1,770 @@
+"""The Color class, the core of ciris"""
+
+# typing and typing_extensions are only needed by type checkers, importing
+# them at runtime would make `import ciris` noticeably slower
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Tuple
+
+    from typing_extensions import Self
+
+    from .harmony import HarmonyRule
+
+
+def _rgb_to_hsv(r: float, g: float, b: float) -> "Tuple[int, int, int]":
+    """Converts RGB channel values in range [0..255] to integer HSV values"""
+    r_clamp = r / 255
+    g_clamp = g / 255
+    b_clamp = b / 255
+
+    c_max = max(r_clamp, g_clamp, b_clamp)
+    c_min = min(r_clamp, g_clamp, b_clamp)
+
+    delta = c_max - c_min
+
+    # Get Hue
+    if c_max == c_min:
+        hue = 0
+
+    elif c_max == r_clamp:
+        hue = 60 * (0 + (g_clamp - b_clamp) / delta)
+    elif c_max == g_clamp:
+        hue = 60 * (2 + (b_clamp - r_clamp) / delta)
+    elif c_max == b_clamp:
+        hue = 60 * (4 + (r_clamp - g_clamp) / delta)
+
+    # Get  Saturation
+    if c_max == 0:
+        saturation = 0
+    else:
+        saturation = (delta / c_max) * 100
+
+    # Get Value
+    value = c_max * 100
+
+    # The red sector spans across 0 degrees, so its hue may come out negative
+    return (
+        int(round(hue)) % 360,
+        int(round(saturation)),
+        int(round(value)),
+    )
+
+
+_HEX_DIGITS = "0123456789ABCDEFabcdef"
+
+
+def _hex_to_rgb(clr_hex: str) -> "Tuple[int, int, int]":
+    """Converts a 7-symbol hex-string to RGB channel values"""
+    # int() also accepts signs, underscores and whitespace, e.g. "#-1-1-1".
+    # Stripping the hex digits leaves nothing only if they are all there is
+    if (
+        not isinstance(clr_hex, str)
+        or len(clr_hex) != 7
+        or clr_hex[0] != "#"
+        or clr_hex[1:].strip(_HEX_DIGITS)
+    ):
+        raise ValueError(
+            f"Expected a hex-string in 6-digit format (e.g. #FFFFFF, #06AC9F), but got {clr_hex!r}"
+        )
+
+    return (
+        int(clr_hex[1:3], base=16),
+        int(clr_hex[3:5], base=16),
+        int(clr_hex[5:7], base=16),
+    )
+
+
+def _rgb_to_hex(r: int, g: int, b: int) -> str:
+    """Converts RGB channel values to a 7-symbol hex-string"""
+    return f"#{r:02X}{g:02X}{b:02X}"
+
+
+def _hsv_to_rgb(h: float, s: float, v: float) -> "Tuple[int, int, int]":
+    """Converts HSV values to RGB channel values. Note that saturation and
+    value are expected to be in range [0..1], like they are stored by Color"""
+    chroma = v * s
+
+    h_dash = (h % 360) / 60.0
+
+    x_buf = chroma * (1 - abs(h_dash % 2 - 1))
+
+    if 0 <= h_dash < 1:
+        rgb_d = (chroma, x_buf, 0)
+
+    if 1 <= h_dash < 2:
+        rgb_d = (x_buf, chroma, 0)
+
+    if 2 <= h_dash < 3:
+        rgb_d = (0, chroma, x_buf)
+
+    if 3 <= h_dash < 4:
+        rgb_d = (0, x_buf, chroma)
+
+    if 4 <= h_dash < 5:
+        rgb_d = (x_buf, 0, chroma)
+
+    if 5 <= h_dash < 6:
+        rgb_d = (chroma, 0, x_buf)
+
+    m = v - chroma
+
+    r1, g1, b1 = rgb_d
+
+    r, g, b = (r1 + m, g1 + m, b1 + m)
+
+    return (
+        round(r * 255),
+        round(g * 255),
+        round(b * 255),
+    )
+
+
+def _rgb_to_cmyk(r: int, g: int, b: int) -> "Tuple[int, int, int, int]":
+    """Converts RGB channel values to integer CMYK percentages"""
+    r_dash, g_dash, b_dash = r / 255, g / 255, b / 255
+
+    k = 1 - max(r_dash, g_dash, b_dash)
+
+    # Black has no color components, and the formulas below divide by zero
+    if k == 1:
+        return (0, 0, 0, 100)
+
+    c = (1 - r_dash - k) / (1 - k)
+    m = (1 - g_dash - k) / (1 - k)
+    y = (1 - b_dash - k) / (1 - k)
+
+    return (
+        int(round(c, 2) * 100),
+        int(round(m, 2) * 100),
+        int(round(y, 2) * 100),
+        int(round(k, 2) * 100),
+    )
+
+
+def _cmyk_to_rgb(
+    c: float, m: float, y: float, k: float
+) -> "Tuple[float, float, float]":
+    """Converts CMYK percentages to RGB channel values. The values are not
+    rounded, Color.from_cmyk passes them to the RGB to HSV conversion as is"""
+    c = c * 0.01
+    m = m * 0.01
+    y = y * 0.01
+    k = k * 0.01
+
+    r = 255 * (1 - c) * (1 - k)
+    g = 255 * (1 - m) * (1 - k)
+    b = 255 * (1 - y) * (1 - k)
+
+    return (r, g, b)
+
+
+def _hsv_to_hsl(h: float, s: float, v: float) -> "Tuple[int, int, int]":
+    """Converts HSV values to integer HSL values. Like in _hsv_to_rgb,
+    saturation and value are expected to be in range [0..1]"""
+    lightness = v * (1 - s / 2)
+
+    if lightness == 0 or lightness == 1:
+        saturation = 0
+    else:
+        saturation = (v - lightness) / min(lightness, 1 - lightness)
+
+    return (
+        h,
+        int(round(saturation * 100)),
+        int(round(lightness * 100)),
+    )
+
+
+def _hsl_to_hsv(h: float, s: float, l: float) -> "Tuple[int, int, int]":
+    """Converts HSL values (saturation and lightness in range [0..100]) to
+    integer HSV values"""
+    s = s * 0.01
+    l = l * 0.01
+
+    value = l + s * min(l, 1 - l)
+
+    if value == 0:
+        saturation = 0
+    else:
+        saturation = 2 * (1 - l / value)
+
+    return (
+        int(round(h)),
+        int(round(saturation * 100)),
+        int(round(value * 100)),
+    )
+
+
+def _hsv_to_hwb(h: float, s: float, v: float) -> "Tuple[int, int, int]":
+    """Converts HSV values to integer HWB values. Like in _hsv_to_rgb,
+    saturation and value are expected to be in range [0..1]"""
+    return (
+        h,
+        int(round((1 - s) * v * 100)),
+        int(round((1 - v) * 100)),
+    )
+
+
+def _hwb_to_hsv(h: float, w: float, b: float) -> "Tuple[int, int, int]":
+    """Converts HWB values (whiteness and blackness in range [0..100]) to
+    integer HSV values"""
+    w = w * 0.01
+    b = b * 0.01
+
+    # Whiteness and blackness that add up to more than 100% describe a shade
+    # of gray, they are scaled down like CSS does it
+    if w + b >= 1:
+        return (int(round(h)), 0, int(round(w / (w + b) * 100)))
+
+    value = 1 - b
+
+    return (
+        int(round(h)),
+        int(round((1 - w / value) * 100)),
+        int(round(value * 100)),
+    )
+
+
+class Color:
+    def __init__(self, h: int, s: int, v: int) -> None:
+        """Creates a Color object. It uses HSV color scheme as its primary,
+        thus its usage is required for direct initialization (c = Color(...)).
+        For initializing the object using a different color space please use
+        the appropriate initializer function
+
+        Args:
+            h (int): Hue (from 0 up tp 360)
+            s (int): Saturation (from 0 up to 100)
+            v (int): Value (from 0 up to 100)
+
+        Raises:
+            ValueError: if Hue is not in range [0..360]
+            ValueError: if Saturation is not in range [0..100]
+            ValueError: if Value is not in range [0..100]
+        """
+
+        if not (0 <= h <= 360):
+            raise ValueError(
+                f"Expected Hue to be in range [0..360], but got {h}"
+            )
+
+        if not (0 <= s <= 100):
+            raise ValueError(
+                f"Expected Saturation to be in range [0..100], but got {s}"
+            )
+
+        if not (0 <= v <= 100):
+            raise ValueError(
+                f"Expected Value to be in range [0..100], but got {v}"
+            )
+
+        self.h = h
+        self.s = s * 0.01  # Need to clamp the value in range [0..1]
+        self.v = v * 0.01  # Need to clamp the value in range [0..1]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(h={self.h}, s={self.s}, v={self.v})"
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+    def __eq__(self, __o: object) -> bool:
+        return isinstance(__o, Color) and (
+            (self.h == __o.h) and (self.s == __o.s) and (self.v == __o.v)
+        )
+
+    def __ne__(self, __o: object) -> bool:
+        return not self.__eq__(__o)
+
+    def __hash__(self) -> int:
+        hash_str = f"{self.h},{self.s},{self.v}"
+        return hash(hash_str)
+
+    @classmethod
+    def from_rgb(cls, r: int, g: int, b: int) -> "Self":
+        """Initializes the Color class using RGB color space
+
+        Args:
+            r (int): Red
+            g (int): Green
+            b (int): Blue
+
+        Raises:
+            ValueError: if either of Red, Green or Blue is not in range [0..255]
+        """
+
+        if not (0 <= r <= 255) or not (0 <= g <= 255) or not (0 <= b <= 255):
+            raise ValueError(
+                f"Expected R, G, B channel values to be in range [0..255], but got {r}, {g}, {b}"
+            )
+
+        return cls(*_rgb_to_hsv(r, g, b))
+
+    @classmethod
+    def from_hsv(cls, h: int, s: int, v: int) -> "Self":
+        """Creates the Color object using the HSV color space. This function
+        is equivalent to direct initialization and was added for consistency
+
+        Args:
+            h (int): Hue
+            s (int): Saturation
+            v (int): Value
+        """
+        if not (0 <= h <= 360):
+            raise ValueError(
+                f"Expected Hue to be in range [0..360], but got {h}"
+            )
+
+        if not (0 <= s <= 100):
+            raise ValueError(
+                f"Expected Saturation to be in range [0..100], but got {s}"
+            )
+
+        if not (0 <= v <= 100):
+            raise ValueError(
+                f"Expected Value to be in range [0..100], but got {v}"
+            )
+
+        return cls(h, s, v)
+
+    @classmethod
+    def from_hex(cls, clr_hex: str) -> "Self":
+        """Creates the Color object using the HEX string
+
+        Args:
+            clr_hex (str): a hex-string (7-symbol). Other formats, such as a
+            9-symbol string, which includes opacity, is not supported at the moment.
+            The support may be added later, but for now any string that is not a 7-symbol
+            hex will throw an error
+
+        Raises:
+            ValueError: is hex-string's format is unsupported
+        """
+        return cls.from_rgb(*_hex_to_rgb(clr_hex))
+
+    @classmethod
+    def from_cmyk(cls, c: int, m: int, y: int, k: int) -> "Self":
+        """Creates the Color object using CMYK namespace.
+        This function needs to be supplied with integers representing the percentages
+        of the color channels. For example, if CMYK color is defined like cmyk(76%, 0%, 11%, 0%),
+        then the functions' arguments will look like this: from_cmyk(76, 0, 11, 0)
+
+        Args:
+            c (int): Cyan
+            m (int): Magenta
+            y (int): Yellow
+            k (int): Key
+
+        Raises:
+            ValueError: if either C, M, Y or K is not in range [0..100]
+        """
+        if (
+            not (0 <= c <= 100)
+            or not (0 <= m <= 100)
+            or not (0 <= y <= 100)
+            or not (0 <= k <= 100)
+        ):
+            raise ValueError(
+                f"Expected C, M, Y, K to be in range [0..100], bu got {c}, {m}, {y}, {k}"
+            )
+
+        return cls.from_rgb(*_cmyk_to_rgb(c, m, y, k))
+
+    @classmethod
+    def from_hsl(cls, h: int, s: int, l: int) -> "Self":
+        """Creates the Color object using the HSL color space. The values are
+        converted to HSV directly, without going through RGB
+
+        Args:
+            h (int): Hue (from 0 up to 360)
+            s (int): Saturation (from 0 up to 100)
+            l (int): Lightness (from 0 up to 100)
+
+        Raises:
+            ValueError: if Hue is not in range [0..360]
+            ValueError: if Saturation or Lightness is not in range [0..100]
+        """
+        if not (0 <= h <= 360):
+            raise ValueError(
+                f"Expected Hue to be in range [0..360], but got {h}"
+            )
+
+        if not (0 <= s <= 100) or not (0 <= l <= 100):
+            raise ValueError(
+                f"Expected Saturation and Lightness to be in range [0..100], but got {s}, {l}"
+            )
+
+        return cls(*_hsl_to_hsv(h, s, l))
+
+    @classmethod
+    def from_hwb(cls, h: int, w: int, b: int) -> "Self":
+        """Creates the Color object using the HWB color space. The values are
+        converted to HSV directly, without going through RGB. If Whiteness
+        and Blackness add up to more than 100, they are scaled down
+        proportionally, which results in a shade of gray
+
+        Args:
+            h (int): Hue (from 0 up to 360)
+            w (int): Whiteness (from 0 up to 100)
+            b (int): Blackness (from 0 up to 100)
+
+        Raises:
+            ValueError: if Hue is not in range [0..360]
+            ValueError: if Whiteness or Blackness is not in range [0..100]
+        """
+        if not (0 <= h <= 360):
+            raise ValueError(
+                f"Expected Hue to be in range [0..360], but got {h}"
+            )
+
+        if not (0 <= w <= 100) or not (0 <= b <= 100):
+            raise ValueError(
+                f"Expected Whiteness and Blackness to be in range [0..100], but got {w}, {b}"
+            )
+
+        return cls(*_hwb_to_hsv(h, w, b))
+
+    def as_hsv(self) -> "Tuple[int, int, int]":
+        """Represents the current color in HSV color space
+
+        Returns:
+            Tuple[int, int, int]: a tuple containing Hue, Saturation and Value
+        """
+        return (
+            self.h,
+            self.s * 100,
+            self.v * 100,
+        )
+
+    def as_rgb(self) -> "Tuple[int, int, int]":
+        """Represents the current color in RGB color space
+
+        Returns:
+            Tuple[int, int, int]: a tuple containing Red, Green and Blue
+        """
+        return _hsv_to_rgb(self.h, self.s, self.v)
+
+    def as_hex(self) -> str:
+        """Represents the current color as a 7-symbol hex-string
+
+        Returns:
+            str: a hex-string
+        """
+
+        return _rgb_to_hex(*self.as_rgb())
+
+    def as_cmyk(self) -> "Tuple[int, int, int, int]":
+        """Represents the current color in CMYK color space
+
+        Returns:
+            Tuple[int, int, int, int]: a tuple containing Cyan, Magenta, Yellow and Key
+        """
+        return _rgb_to_cmyk(*self.as_rgb())
+
+    def as_hsl(self) -> "Tuple[int, int, int]":
+        """Represents the current color in HSL color space
+
+        Returns:
+            Tuple[int, int, int]: a tuple containing Hue, Saturation and
+            Lightness
+        """
+        return _hsv_to_hsl(self.h, self.s, self.v)
+
+    def as_hwb(self) -> "Tuple[int, int, int]":
+        """Represents the current color in HWB color space
+
+        Returns:
+            Tuple[int, int, int]: a tuple containing Hue, Whiteness and
+            Blackness
+        """
+        return _hsv_to_hwb(self.h, self.s, self.v)
+
+    def as_cvd(
+        self, kind: str, severity: float = 1.0
+    ) -> "Tuple[int, int, int]":
+        """Represents the current color the way it is seen by a person with a
+        color vision deficiency, without changing it
+
+        Args:
+            kind (str): the type of the deficiency: "protanopia",
+            "deuteranopia" or "tritanopia"
+            severity (float): from 0 (normal vision) up to 1 (dichromacy).
+            Default is 1
+
+        Raises:
+            ValueError: if the deficiency is not supported
+            ValueError: if severity is not in range [0..1]
+
+        Returns:
+            Tuple[int, int, int]: a tuple containing Red, Green and Blue
+        """
+        from . import cvd
+
+        return cvd.simulator(kind, severity=severity, lut=False)(self.as_rgb())
+
+    def as_daltonized(self, kind: str) -> "Tuple[int, int, int]":
+        """Represents the current color adjusted for a person with a color
+        vision deficiency, without changing it
+
+        Args:
+            kind (str): the type of the deficiency: "protanopia",
+            "deuteranopia" or "tritanopia"
+
+        Raises:
+            ValueError: if the deficiency is not supported
+
+        Returns:
+            Tuple[int, int, int]: a tuple containing Red, Green and Blue
+        """
+        from . import cvd
+
+        return cvd.daltonizer(kind, lut=False)(self.as_rgb())
+
+    def hue_shift(self, amount: int) -> "Self":
+        """Shifts the color's hue by a specified amount.
+
+        Args:
+            amount (int): amount to shift hue by
+        """
+
+        new_hue = self.h + amount
+
+        if new_hue > 360:
+            new_hue = new_hue - 360
+
+        if new_hue < 0:
+            new_hue = 360 + new_hue
+
+        self.h = new_hue
+
+        return self
+
+    def lighten(self, amount: int) -> "Self":
+        """Lightens the color by a specified percentage. For example,
+        if you need to lighten a color by 25%, the function call will look like
+        color_obj.lighten(25)
+
+        Args:
+            amount (int): the amount to lighten the color by
+        """
+        new_value = self.v + amount * 0.01
+
+        if new_value > 1.0:
+            new_value = 1.0
+
+        if new_value < 0.0:
+            new_value = 0.0
+
+        self.v = new_value
+
+        return self
+
+    def darken(self, amount: int) -> "Self":
+        """Darkens the color by a specified percentage. For example,
+        if you need to darken a color by 25%, the function call will look like
+        color_obj.darken(25)
+
+        Args:
+            amount (int): the amount to darken the color by
+
+        Args:
+            amount (int): the amount to darken the color by
+        """
+        self.lighten(amount * -1)
+
+        return self
+
+    def invert(self) -> "Self":
+        """Inverts the current color"""
+        self.hue_shift(180)
+
+        return self
+
+    def adjust_saturation(self, amount: int) -> "Self":
+        """Adjusts the color's saturation level.
+
+        Args:
+            amount (int): how much to adjust the level by. If the adjustment
+            brings the saturation level out of range [0..100], then the level will be
+            capped. For example, calling Color.adjust_saturation(-10000) on cyan
+            will make the color a shade of gray.
+        """
+        new_s = self.s + amount * 0.01
+
+        if new_s > 1.0:
+            new_s = 1.0
+
+        if new_s < 0.0:
+            new_s = 0.0
+
+        self.s = new_s
+
+        return self
+
+    def _set_rgb(self, r: int, g: int, b: int) -> None:
+        h, s, v = _rgb_to_hsv(r, g, b)
+
+        self.h = h
+        self.s = s * 0.01
+        self.v = v * 0.01
+
+    def simulate_cvd(self, kind: str, severity: float = 1.0) -> "Self":
+        """Changes the color to the way it is seen by a person with a color
+        vision deficiency. To process many colors or whole images at once,
+        use the functions from the ciris.cvd module
+
+        Args:
+            kind (str): the type of the deficiency: "protanopia",
+            "deuteranopia" or "tritanopia"
+            severity (float): from 0 (normal vision) up to 1 (dichromacy).
+            Default is 1
+
+        Raises:
+            ValueError: if the deficiency is not supported
+            ValueError: if severity is not in range [0..1]
+        """
+        self._set_rgb(*self.as_cvd(kind, severity))
+
+        return self
+
+    def daltonize(self, kind: str) -> "Self":
+        """Adjusts the color so that it is easier to tell apart from the others
+        for a person with a color vision deficiency
+
+        Args:
+            kind (str): the type of the deficiency: "protanopia",
+            "deuteranopia" or "tritanopia"
+
+        Raises:
+            ValueError: if the deficiency is not supported
+        """
+        self._set_rgb(*self.as_daltonized(kind))
+
+        return self
+
+    def harmony_complementary(self) -> "HarmonyRule":
+        """Applies the complementary color harmony rule to the color
+
+        Returns:
+            HarmonyRule: A HarmonyRule class describing the rule and containing
+            all the colors
+        """
+        from .harmony import HarmonyRule
+
+        return HarmonyRule(
+            "complementary",
+            self,
+            [
+                Color.from_hsv(
+                    self.h, int(self.s * 100), int(self.v * 100)
+                ).hue_shift(180)
+            ],
+        )
+
+    def harmony_split_complementary(self, phi: int = 150) -> "HarmonyRule":
+        """Applies the split complementary color harmony rule to the color
+
+        Arguments:
+            phi (int): an offset that will be used. Default is 150 degrees
+
+        Returns:
+            HarmonyRule: A HarmonyRule class describing the rule and containing
+            all the colors
+        """
+
+        from .harmony import HarmonyRule
+
+        return HarmonyRule(
+            "split_complementary",
+            self,
+            [
+                Color.from_hsv(
+                    self.h, int(self.s * 100), int(self.v * 100)
+                ).hue_shift(phi),
+                Color.from_hsv(
+                    self.h, int(self.s * 100), int(self.v * 100)
+                ).hue_shift(360 - phi),
+            ],
+        )
+
+    def harmony_triadic(self) -> "HarmonyRule":
+        """Applies the triadic color harmony rule to the color
+
+        Returns:
+            HarmonyRule: A HarmonyRule class describing the rule and containing
+            all the colors
+        """
+        from .harmony import HarmonyRule
+
+        return HarmonyRule(
+            "triadic",
+            self,
+            [
+                Color.from_hsv(
+                    self.h, int(self.s * 100), int(self.v * 100)
+                ).hue_shift(120),
+                Color.from_hsv(
+                    self.h, int(self.s * 100), int(self.v * 100)
+                ).hue_shift(240),
+            ],
+        )
+
+    def harmony_tetradic(self) -> "HarmonyRule":
+        """Applies the tetradic color harmony rule to the color
+
+        Returns:
+            HarmonyRule: A HarmonyRule class describing the rule and containing
+            all the colors
+        """
+
+        phi = 90
+
+        from .harmony import HarmonyRule
+
+        return HarmonyRule(
+            "tetradic",
+            self,
+            [
+                Color.from_hsv(
+                    self.h, int(self.s * 100), int(self.v * 100)
+                ).hue_shift(phi),
+                Color.from_hsv(
+                    self.h, int(self.s * 100), int(self.v * 100)
+                ).hue_shift(phi * 2),
+                Color.from_hsv(
+                    self.h, int(self.s * 100), int(self.v * 100)
+                ).hue_shift(phi * 3),
+            ],
+        )
+
+    # This function will return 2 secondary colors, but there's also a rule
+    # for three secondary colors
+    #
+    # This might be implemented as a separate function in the future
+    def harmony_analogous(self, phi: int = 30) -> "HarmonyRule":
+        """Applies the analogous color harmony rule to the color. The resulting
+        scheme consists of a base color and 2 derived colors, thus resulting in
+        a 3-color palette
+
+        Arguments:
+            phi (int): an offset that will be used. Default is 30 degrees
+
+        Returns:
+            HarmonyRule: A HarmonyRule class describing the rule and containing
+            3 total colors
+        """
+
+        from .harmony import HarmonyRule
+
+        return HarmonyRule(
+            "analogous",
+            self,
+            [
+                Color.from_hsv(
+                    self.h, int(self.s * 100), int(self.v * 100)
+                ).hue_shift(phi * -1),
+                Color.from_hsv(
+                    self.h, int(self.s * 100), int(self.v * 100)
+                ).hue_shift(phi),
+            ],
+        )
@@ -0,0 +1,467 @@
+"""A graph of conversions between color spaces.
+
+Every color space is a node of the graph, and every conversion kernel is an
+edge. A kernel converts a single color from one space to another without
+creating a Color object: hex colors are strings, colors in all the other
+spaces are tuples. To convert between two spaces that are not connected
+directly, the cheapest chain of kernels is found and fused into a single
+function, which is cached until the graph changes.
+
+The built-in spaces are "hex", "rgb", "hsv", "hsl", "hwb" and "cmyk". The
+kernels use the same formulas as the Color class and round the colors to the
+integer HSV values stored by Color, so converting between two different
+spaces gives the same result as going through a Color object, e.g.
+Color.from_hex(...).as_cmyk(). The exception is "hex" and "rgb", which are
+two notations of the same channel values: the conversion between them is
+exact, while Color.from_rgb(...).as_rgb() may change a channel by up to 3
+units. Converting a built-in space to itself returns the values as they are
+once they are checked, the same way the kernels check them.
+
+A conversion can also apply a transform on the way, e.g. a color vision
+deficiency simulation from ciris.cvd. A transform works in a single space:
+the colors are converted to it, transformed and converted to the target.
+"""
+
+import heapq
+from functools import partial
+
+from .color import (
+    _cmyk_to_rgb,
+    _hex_to_rgb,
+    _hsl_to_hsv,
+    _hsv_to_hsl,
+    _hsv_to_hwb,
+    _hsv_to_rgb,
+    _hwb_to_hsv,
+    _rgb_to_cmyk,
+    _rgb_to_hex,
+    _rgb_to_hsv,
+)
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+    Kernel = Callable[[Any], Any]
+
+
+# src -> dst -> (kernel, cost)
+_KERNELS: "Dict[str, Dict[str, Tuple[Kernel, float]]]" = {}
+
+# name -> (space, function returning the kernel). The built-in transforms
+# build their lookup tables when they are first used
+_TRANSFORMS: "Dict[str, Tuple[str, Callable[[], Kernel]]]" = {}
+
+# (src, dst, transform) -> fused kernel. Cleared every time the graph or the
+# transforms change
+_CONVERTERS: "Dict[Tuple[str, str, Optional[str]], Kernel]" = {}
+
+
+def register_space(name: str) -> None:
+    """Adds a color space to the graph. Spaces are also added automatically
+    by register_kernel()
+
+    Args:
+        name (str): the name of the color space
+    """
+    _KERNELS.setdefault(name, {})
+
+
+def register_kernel(
+    src: str, dst: str, kernel: "Kernel", cost: float = 1.0
+) -> None:
+    """Adds a conversion kernel to the graph, replacing the existing one
+    for the same pair of spaces.
+
+    A direct kernel between two spaces that are already connected through
+    other ones (e.g. hex to CMYK) is used instead of the chain as long as its
+    cost is lower than the total cost of the chain.
+
+    Args:
+        src (str): the source color space
+        dst (str): the target color space
+        kernel (Callable): a function that takes a single color in the
+        source space and returns it in the target space
+        cost (float): the relative cost of the conversion. Default is 1
+
+    Raises:
+        ValueError: if the cost is not positive
+    """
+    if cost <= 0:
+        raise ValueError(f"Expected cost to be positive, but got {cost}")
+
+    register_space(src)
+    register_space(dst)
+
+    _KERNELS[src][dst] = (kernel, cost)
+    _CONVERTERS.clear()
+
+
+def register_transform(name: str, space: str, kernel: "Kernel") -> None:
+    """Adds a transform that can be applied during conversions, replacing
+    the existing one with the same name
+
+    Args:
+        name (str): the name of the transform
+        space (str): the color space the transform works in
+        kernel (Callable): a function that takes a single color in the
+        space and returns the transformed color in the same space
+    """
+    register_space(space)
+
+    _TRANSFORMS[name] = (space, lambda: kernel)
+    _CONVERTERS.clear()
+
+
+def spaces() -> "List[str]":
+    """Returns the names of the registered color spaces
+
+    Returns:
+        List[str]: the names, sorted alphabetically
+    """
+    return sorted(_KERNELS)
+
+
+def transforms() -> "List[str]":
+    """Returns the names of the registered transforms
+
+    Returns:
+        List[str]: the names, sorted alphabetically
+    """
+    return sorted(_TRANSFORMS)
+
+
+def find_path(src: str, dst: str) -> "List[str]":
+    """Finds the cheapest chain of conversions between two color spaces
+
+    Args:
+        src (str): the source color space
+        dst (str): the target color space
+
+    Raises:
+        ValueError: if either of the spaces is not registered
+        ValueError: if there is no way to convert between the spaces
+
+    Returns:
+        List[str]: the spaces on the way, including src and dst
+    """
+    for space in (src, dst):
+        if space not in _KERNELS:
+            raise ValueError(
+                f"Expected color space to be one of {', '.join(spaces())}, but got {space!r}"
+            )
+
+    # Dijkstra's algorithm. The graph is tiny, so no further tricks needed
+    queue = [(0.0, src, [src])]
+    visited = set()
+
+    while queue:
+        cost, space, path = heapq.heappop(queue)
+        if space == dst:
+            return path
+
+        if space in visited:
+            continue
+        visited.add(space)
+
+        for neighbor, (_, edge_cost) in _KERNELS[space].items():
+            if neighbor not in visited:
+                heapq.heappush(
+                    queue, (cost + edge_cost, neighbor, path + [neighbor])
+                )
+
+    raise ValueError(f"There is no conversion from {src!r} to {dst!r}")
+
+
+def _fuse(kernels: "List[Kernel]") -> "Kernel":
+    if len(kernels) == 1:
+        return kernels[0]
+
+    def fused(value: "Any") -> "Any":
+        for kernel in kernels:
+            value = kernel(value)
+        return value
+
+    return fused
+
+
+def converter(
+    src: str, dst: str, transform: "Optional[str]" = None
+) -> "Kernel":
+    """Returns a function that converts a single color between two color
+    spaces along the cheapest path
+
+    Args:
+        src (str): the source color space
+        dst (str): the target color space
+        transform (str, optional): the name of a transform to apply on the
+        way, see transforms()
+
+    Raises:
+        ValueError: if the conversion is not possible, see find_path()
+        ValueError: if the transform is not registered
+
+    Returns:
+        Callable: the conversion function
+    """
+    fused = _CONVERTERS.get((src, dst, transform))
+    if fused is not None:
+        return fused
+
+    if transform is not None:
+        if transform not in _TRANSFORMS:
+            raise ValueError(
+                f"Expected transform to be one of {', '.join(transforms())}, but got {transform!r}"
+            )
+
+        space, build = _TRANSFORMS[transform]
+        kernels = [converter(src, space), build()]
+        if space != dst:
+            kernels.append(converter(space, dst))
+
+        fused = _fuse(kernels)
+    elif src == dst and src in _KERNELS:
+        fused = _identity(_CHECKS.get(src))
+    else:
+        path = find_path(src, dst)
+        fused = _fuse([_KERNELS[a][b][0] for a, b in zip(path, path[1:])])
+
+    _CONVERTERS[(src, dst, transform)] = fused
+
+    return fused
+
+
+def convert(
+    values: "Iterable[Any]",
+    src: str,
+    dst: str,
+    transform: "Optional[str]" = None,
+) -> "List[Any]":
+    """Converts a batch of colors between two color spaces
+
+    Args:
+        values (Iterable): colors in the source space. Hex colors are passed
+        as strings, all the other spaces as tuples
+        src (str): the source color space
+        dst (str): the target color space
+        transform (str, optional): the name of a transform to apply on the
+        way, e.g. "simulate_protanopia", see transforms()
+
+    Raises:
+        ValueError: if the conversion is not possible, see find_path()
+        ValueError: if the transform is not registered
+        ValueError: if a color is out of range of its color space
+
+    Returns:
+        List: the converted colors
+    """
+    kernel = converter(src, dst, transform)
+
+    return [kernel(value) for value in values]
+
+
+def _identity(check: "Optional[Callable[[Any], None]]") -> "Kernel":
+    if check is None:
+        return lambda value: value
+
+    def identity(value: "Any") -> "Any":
+        check(value)
+        return value
+
+    return identity
+
+
+def _check_arity(value: "Any", names: "Tuple[str, ...]") -> None:
+    # A tuple of the wrong length would otherwise fail with a TypeError about
+    # the arguments of the check functions
+    try:
+        count = len(value)
+    except TypeError:
+        count = None
+
+    if isinstance(value, str) or count != len(names):
+        raise ValueError(
+            f"Expected {len(names)} values ({', '.join(names)}), but got {value!r}"
+        )
+
+
+def _check_hex(clr_hex: str) -> None:
+    _hex_to_rgb(clr_hex)
+
+
+def _check_rgb(rgb: "Tuple[float, float, float]") -> None:
+    _check_arity(rgb, ("R", "G", "B"))
+    r, g, b = rgb
+    if not (0 <= r <= 255) or not (0 <= g <= 255) or not (0 <= b <= 255):
+        raise ValueError(
+            f"Expected R, G, B channel values to be in range [0..255], but got {r}, {g}, {b}"
+        )
+
+
+def _check_hsv(hsv: "Tuple[float, float, float]") -> None:
+    _check_arity(hsv, ("H", "S", "V"))
+    h, s, v = hsv
+    if not (0 <= h <= 360) or not (0 <= s <= 100) or not (0 <= v <= 100):
+        raise ValueError(
+            f"Expected H to be in range [0..360] and S, V in range [0..100], but got {h}, {s}, {v}"
+        )
+
+
+def _check_hsl(hsl: "Tuple[float, float, float]") -> None:
+    _check_arity(hsl, ("H", "S", "L"))
+    h, s, l = hsl
+    if not (0 <= h <= 360) or not (0 <= s <= 100) or not (0 <= l <= 100):
+        raise ValueError(
+            f"Expected H to be in range [0..360] and S, L in range [0..100], but got {h}, {s}, {l}"
+        )
+
+
+def _check_hwb(hwb: "Tuple[float, float, float]") -> None:
+    _check_arity(hwb, ("H", "W", "B"))
+    h, w, b = hwb
+    if not (0 <= h <= 360) or not (0 <= w <= 100) or not (0 <= b <= 100):
+        raise ValueError(
+            f"Expected H to be in range [0..360] and W, B in range [0..100], but got {h}, {w}, {b}"
+        )
+
+
+def _check_cmyk(cmyk: "Tuple[float, float, float, float]") -> None:
+    _check_arity(cmyk, ("C", "M", "Y", "K"))
+    c, m, y, k = cmyk
+    if (
+        not (0 <= c <= 100)
+        or not (0 <= m <= 100)
+        or not (0 <= y <= 100)
+        or not (0 <= k <= 100)
+    ):
+        raise ValueError(
+            f"Expected C, M, Y, K to be in range [0..100], but got {c}, {m}, {y}, {k}"
+        )
+
+
+# The checks of the built-in spaces, run when converting a space to itself
+_CHECKS: "Dict[str, Callable[[Any], None]]" = {
+    "hex": _check_hex,
+    "rgb": _check_rgb,
+    "hsv": _check_hsv,
+    "hsl": _check_hsl,
+    "hwb": _check_hwb,
+    "cmyk": _check_cmyk,
+}
+
+
+def _rgb_to_hsv_kernel(rgb: "Tuple[int, int, int]") -> "Tuple[int, int, int]":
+    _check_rgb(rgb)
+    return _rgb_to_hsv(*rgb)
+
+
+def _hsv_to_rgb_kernel(hsv: "Tuple[int, int, int]") -> "Tuple[int, int, int]":
+    _check_hsv(hsv)
+    h, s, v = hsv
+    return _hsv_to_rgb(h, s * 0.01, v * 0.01)
+
+
+def _hsv_to_hsl_kernel(hsv: "Tuple[int, int, int]") -> "Tuple[int, int, int]":
+    _check_hsv(hsv)
+    h, s, v = hsv
+    return _hsv_to_hsl(h, s * 0.01, v * 0.01)
+
+
+def _hsl_to_hsv_kernel(hsl: "Tuple[int, int, int]") -> "Tuple[int, int, int]":
+    _check_hsl(hsl)
+    return _hsl_to_hsv(*hsl)
+
+
+def _hsv_to_hwb_kernel(hsv: "Tuple[int, int, int]") -> "Tuple[int, int, int]":
+    _check_hsv(hsv)
+    h, s, v = hsv
+    return _hsv_to_hwb(h, s * 0.01, v * 0.01)
+
+
+def _hwb_to_hsv_kernel(hwb: "Tuple[int, int, int]") -> "Tuple[int, int, int]":
+    _check_hwb(hwb)
+    return _hwb_to_hsv(*hwb)
+
+
+def _rgb_to_hex_kernel(rgb: "Tuple[int, int, int]") -> str:
+    _check_rgb(rgb)
+    return _rgb_to_hex(*rgb)
+
+
+def _hsv_to_cmyk_kernel(
+    hsv: "Tuple[int, int, int]",
+) -> "Tuple[int, int, int, int]":
+    _check_hsv(hsv)
+    h, s, v = hsv
+    return _rgb_to_cmyk(*_hsv_to_rgb(h, s * 0.01, v * 0.01))
+
+
+def _cmyk_to_hsv_kernel(
+    cmyk: "Tuple[int, int, int, int]",
+) -> "Tuple[int, int, int]":
+    # Color.from_cmyk does not round the intermediate RGB values, neither
+    # does this kernel
+    _check_cmyk(cmyk)
+    return _rgb_to_hsv(*_cmyk_to_rgb(*cmyk))
+
+
+# The fused kernels below skip the intermediate tuples, but still round the
+# color to the integer HSV values, like Color does
+
+
+def _rgb_to_cmyk_kernel(
+    rgb: "Tuple[int, int, int]",
+) -> "Tuple[int, int, int, int]":
+    _check_rgb(rgb)
+    h, s, v = _rgb_to_hsv(*rgb)
+    return _rgb_to_cmyk(*_hsv_to_rgb(h, s * 0.01, v * 0.01))
+
+
+def _cmyk_to_rgb_kernel(
+    cmyk: "Tuple[int, int, int, int]",
+) -> "Tuple[int, int, int]":
+    _check_cmyk(cmyk)
+    h, s, v = _rgb_to_hsv(*_cmyk_to_rgb(*cmyk))
+    return _hsv_to_rgb(h, s * 0.01, v * 0.01)
+
+
+def _hex_to_cmyk_kernel(clr_hex: str) -> "Tuple[int, int, int, int]":
+    h, s, v = _rgb_to_hsv(*_hex_to_rgb(clr_hex))
+    return _rgb_to_cmyk(*_hsv_to_rgb(h, s * 0.01, v * 0.01))
+
+
+register_kernel("hex", "rgb", _hex_to_rgb)
+register_kernel("rgb", "hex", _rgb_to_hex_kernel)
+register_kernel("rgb", "hsv", _rgb_to_hsv_kernel)
+register_kernel("hsv", "rgb", _hsv_to_rgb_kernel)
+register_kernel("hsv", "cmyk", _hsv_to_cmyk_kernel)
+register_kernel("cmyk", "hsv", _cmyk_to_hsv_kernel)
+register_kernel("hsv", "hsl", _hsv_to_hsl_kernel)
+register_kernel("hsl", "hsv", _hsl_to_hsv_kernel)
+register_kernel("hsv", "hwb", _hsv_to_hwb_kernel)
+register_kernel("hwb", "hsv", _hwb_to_hsv_kernel)
+
+register_kernel("rgb", "cmyk", _rgb_to_cmyk_kernel, cost=1.5)
+register_kernel("cmyk", "rgb", _cmyk_to_rgb_kernel, cost=1.5)
+register_kernel("hex", "cmyk", _hex_to_cmyk_kernel, cost=1.5)
+
+
+def _cvd_transform(factory: str, kind: str) -> "Kernel":
+    # ciris.cvd is only imported once one of its transforms is used
+    from . import cvd
+
+    return getattr(cvd, factory)(kind)
+
+
+# The color vision deficiency transforms use the lookup tables, so they may
+# differ from Color.as_cvd() and Color.as_daltonized() by one unit. The kinds
+# are the ones in ciris.cvd.KINDS
+for _kind in ("protanopia", "deuteranopia", "tritanopia"):
+    _TRANSFORMS[f"simulate_{_kind}"] = (
+        "rgb",
+        partial(_cvd_transform, "simulator", _kind),
+    )
+    _TRANSFORMS[f"daltonize_{_kind}"] = (
+        "rgb",
+        partial(_cvd_transform, "daltonizer", _kind),
+    )
@@ -0,0 +1,306 @@
+"""Parsing and formatting of CSS colors.
+
+Supports the rgb(), rgba(), hsl(), hsla() and hwb() functional notations, in
+both the comma-separated and the space-separated syntax, as well as 3, 4, 6
+and 8-digit hex colors. Parsed colors use the same representation as
+ciris.convert: a 7-symbol hex-string, or a tuple for the other spaces, plus
+the alpha channel that CSS allows, but Color does not store.
+
+iter_colors() and convert_css() scan whole stylesheets with a single regular
+expression, so the text between the colors is skipped in C, and convert_css()
+converts every distinct color once.
+"""
+
+import math
+import re
+
+from .convert import converter
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+# The color spaces of the CSS notations
+SPACES = ("hex", "rgb", "hsl", "hwb")
+
+# Degrees in an angle unit
+_ANGLE_UNITS = {
+    "deg": 1.0,
+    "grad": 0.9,
+    "rad": 180 / math.pi,
+    "turn": 360.0,
+}
+
+_NUMBER = re.compile(
+    r"([+-]?(?:\d+\.?\d*|\.\d+)(?:e[+-]?\d+)?)(%|deg|grad|rad|turn)?",
+    re.IGNORECASE,
+)
+
+_FUNCTION = re.compile(r"(rgba?|hsla?|hwb)\(([^()]*)\)", re.IGNORECASE)
+
+_HEX = re.compile(r"#([0-9a-f]{8}|[0-9a-f]{6}|[0-9a-f]{3,4})", re.IGNORECASE)
+
+# Comments, strings and url() references are matched, so that the colors
+# inside of them (e.g. the fragment in url(#fade)) are skipped. A hex color
+# must be followed by the end of a declaration (";", "}" or the end of the
+# text) before any "{", so that it is not confused with an id selector. The
+# lookahead at the start lets the regular expression engine skip most of the
+# positions after checking a single character
+_TOKENS = re.compile(
+    r"""
+    (?=[/"'#rhuRHU])
+    (?:
+        (?P<comment>/\*.*?(?:\*/|\Z))
+        | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+        | (?<![\w-])(?P<url>url\([^()"']*\))
+        | (?<![\w-])(?P<function>(?:rgba?|hsla?|hwb)\([^()]*\))
+        | (?P<hex>\#(?:[0-9a-f]{8}|[0-9a-f]{6}|[0-9a-f]{3,4})(?![\w-]))
+          (?=[^{};]*(?:[;}]|\Z))
+    )
+    """,
+    re.IGNORECASE | re.DOTALL | re.VERBOSE,
+)
+
+
+def _whole(number: float) -> float:
+    # Keeps the formatted values as short as CSS authors write them
+    return int(number) if float(number).is_integer() else number
+
+
+def _clamp(number: float, low: float, high: float) -> float:
+    return _whole(min(max(number, low), high))
+
+
+def _parse_number(token: str, css: str) -> "Tuple[float, str]":
+    if token.lower() == "none":
+        return 0.0, ""
+
+    match = _NUMBER.fullmatch(token)
+    if match is None:
+        raise ValueError(f"Expected a CSS color, but got {css!r}")
+
+    return float(match.group(1)), (match.group(2) or "").lower()
+
+
+def _parse_alpha(token: "Optional[str]", css: str) -> "Optional[float]":
+    if token is None:
+        return None
+
+    number, unit = _parse_number(token, css)
+    if unit == "%":
+        number /= 100
+    elif unit:
+        raise ValueError(f"Expected a CSS color, but got {css!r}")
+
+    return _clamp(number, 0, 1)
+
+
+def _parse_function(
+    name: str, args: str, css: str
+) -> "Tuple[str, Any, Optional[float]]":
+    name = name.lower()
+    space = name.rstrip("a") if name != "hwb" else name
+
+    # Both rgb(1, 2, 3, 0.5) and rgb(1 2 3 / 0.5) are valid
+    channels, _, alpha = args.partition("/")
+    tokens = channels.replace(",", " ").split()
+
+    if alpha:
+        alpha_token = alpha.strip()
+    elif len(tokens) == 4:
+        alpha_token = tokens.pop()
+    else:
+        alpha_token = None
+
+    if len(tokens) != 3:
+        raise ValueError(f"Expected a CSS color, but got {css!r}")
+
+    values = [_parse_number(token, css) for token in tokens]
+
+    if space == "rgb":
+        channels = []
+        for number, unit in values:
+            if unit == "%":
+                number = number * 255 / 100
+            elif unit:
+                raise ValueError(f"Expected a CSS color, but got {css!r}")
+
+            # CSS rounds the halves up, unlike round()
+            channels.append(int(_clamp(number, 0, 255) + 0.5))
+
+        return space, tuple(channels), _parse_alpha(alpha_token, css)
+
+    (hue, hue_unit), *percentages = values
+    if hue_unit == "%" or (hue_unit and hue_unit not in _ANGLE_UNITS):
+        raise ValueError(f"Expected a CSS color, but got {css!r}")
+
+    hue = _whole((hue * _ANGLE_UNITS.get(hue_unit, 1.0)) % 360)
+
+    value = [hue]
+    for number, unit in percentages:
+        if unit not in ("", "%"):
+            raise ValueError(f"Expected a CSS color, but got {css!r}")
+        value.append(_clamp(number, 0, 100))
+
+    return space, tuple(value), _parse_alpha(alpha_token, css)
+
+
+def _parse_hex(digits: str) -> "Tuple[str, Any, Optional[float]]":
+    if len(digits) in (3, 4):
+        digits = "".join(digit * 2 for digit in digits)
+
+    alpha = None
+    if len(digits) == 8:
+        alpha = _whole(round(int(digits[6:], base=16) / 255, 3))
+
+    return "hex", f"#{digits[:6].upper()}", alpha
+
+
+def parse_color(css: str) -> "Tuple[str, Any, Optional[float]]":
+    """Parses a CSS color
+
+    Args:
+        css (str): a color in the rgb(), rgba(), hsl(), hsla() or hwb()
+        notation, or a hex color, e.g. "hsl(171deg 100% 62% / 50%)"
+
+    Raises:
+        ValueError: if the color can not be parsed
+
+    Returns:
+        Tuple[str, Any, Optional[float]]: the color space ("hex", "rgb", "hsl"
+        or "hwb"), the color in it (e.g. (171, 100, 62)), and the alpha
+        channel in range [0..1], or None if it is omitted
+    """
+    text = css.strip()
+
+    match = _FUNCTION.fullmatch(text)
+    if match is not None:
+        return _parse_function(match.group(1), match.group(2), css)
+
+    match = _HEX.fullmatch(text)
+    if match is not None:
+        return _parse_hex(match.group(1))
+
+    raise ValueError(f"Expected a CSS color, but got {css!r}")
+
+
+def _format_number(number: float) -> str:
+    return f"{round(number, 2):g}"
+
+
+def format_color(
+    space: str, value: "Any", alpha: "Optional[float]" = None
+) -> str:
+    """Formats a color in the CSS notation of its color space
+
+    Args:
+        space (str): "hex", "rgb", "hsl" or "hwb"
+        value (Any): the color, e.g. (171, 100, 62) for "hsl"
+        alpha (float, optional): the alpha channel in range [0..1]
+
+    Raises:
+        ValueError: if the color space has no CSS notation
+
+    Returns:
+        str: the color, e.g. "hsl(171 100% 62%)". The functional notations
+        use the modern space-separated syntax
+    """
+    if space == "hex":
+        if alpha is None:
+            return value
+        return f"{value}{int(round(alpha * 255)):02X}"
+
+    if space == "rgb":
+        channels = " ".join(_format_number(channel) for channel in value)
+    elif space in ("hsl", "hwb"):
+        hue, first, second = value
+        channels = f"{_format_number(hue)} {_format_number(first)}% {_format_number(second)}%"
+    else:
+        raise ValueError(
+            f"Expected color space to be one of {', '.join(SPACES)}, but got {space!r}"
+        )
+
+    if alpha is None:
+        return f"{space}({channels})"
+
+    return f"{space}({channels} / {_format_number(alpha)})"
+
+
+def iter_colors(
+    stylesheet: str,
+) -> "Iterator[Tuple[int, int, str, Any, Optional[float]]]":
+    """Finds the colors in a stylesheet. Colors inside comments and strings,
+    as well as the ones that can not be parsed (e.g. rgb(var(--red) 0 0)),
+    are skipped
+
+    Args:
+        stylesheet (str): the CSS code
+
+    Returns:
+        Iterator[Tuple[int, int, str, Any, Optional[float]]]: the start and
+        the end position of every color in the text, followed by the result
+        of parse_color()
+    """
+    for match in _TOKENS.finditer(stylesheet):
+        kind = match.lastgroup
+
+        if kind == "function":
+            text = match.group()
+            paren = text.index("(")
+            try:
+                parsed = _parse_function(
+                    text[:paren], text[paren + 1 : -1], text
+                )
+            except ValueError:
+                continue
+        elif kind == "hex":
+            parsed = _parse_hex(match.group()[1:])
+        else:
+            continue
+
+        yield (match.start(), match.end(), *parsed)
+
+
+def convert_css(stylesheet: str, space: str) -> str:
+    """Rewrites every color in a stylesheet in the notation of the given
+    color space, keeping the alpha channel
+
+    Args:
+        stylesheet (str): the CSS code
+        space (str): "hex", "rgb", "hsl" or "hwb"
+
+    Raises:
+        ValueError: if the color space has no CSS notation
+
+    Returns:
+        str: the CSS code with the converted colors
+    """
+    if space not in SPACES:
+        raise ValueError(
+            f"Expected color space to be one of {', '.join(SPACES)}, but got {space!r}"
+        )
+
+    # Stylesheets repeat the same colors over and over again, so every
+    # distinct color is only converted once
+    converted: "Dict[str, str]" = {}
+    parts: "List[str]" = []
+    position = 0
+
+    for start, end, src, value, alpha in iter_colors(stylesheet):
+        text = stylesheet[start:end]
+
+        replacement = converted.get(text)
+        if replacement is None:
+            replacement = format_color(
+                space, converter(src, space)(value), alpha
+            )
+            converted[text] = replacement
+
+        parts.append(stylesheet[position:start])
+        parts.append(replacement)
+        position = end
+
+    parts.append(stylesheet[position:])
+
+    return "".join(parts)
@@ -0,0 +1,369 @@
+"""Color vision deficiency (color blindness) simulation and daltonization.
+
+The simulation uses the matrices from Machado, Oliveira and Fernandes,
+"A Physiologically-based Model for Simulation of Color Vision Deficiency"
+(2009). Daltonization shifts the colors that a color blind person cannot
+tell apart towards the ones they can see (Fidaner, Lin and Ozguven, 2005).
+
+All the matrices operate on linear RGB values. The functions in this module
+work on RGB tuples and on pixel buffers (3 bytes per pixel, row by row).
+simulator() and daltonizer() return the transforms of a single RGB color,
+which are also registered in ciris.convert, e.g. as "simulate_protanopia".
+A single Color can be represented with Color.as_cvd() and
+Color.as_daltonized(), or changed with Color.simulate_cvd() and
+Color.daltonize().
+"""
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Dict, Iterable, List, Tuple
+
+    Matrix = Tuple[
+        Tuple[float, float, float],
+        Tuple[float, float, float],
+        Tuple[float, float, float],
+    ]
+
+
+KINDS = ("protanopia", "deuteranopia", "tritanopia")
+
+IDENTITY = (
+    (1.0, 0.0, 0.0),
+    (0.0, 1.0, 0.0),
+    (0.0, 0.0, 1.0),
+)
+
+SIMULATION_MATRICES = {
+    "protanopia": (
+        (0.152286, 1.052583, -0.204868),
+        (0.114503, 0.786281, 0.099216),
+        (-0.003882, -0.048116, 1.051998),
+    ),
+    "deuteranopia": (
+        (0.367322, 0.860646, -0.227968),
+        (0.280085, 0.672501, 0.047413),
+        (-0.011820, 0.042940, 0.968881),
+    ),
+    "tritanopia": (
+        (1.255528, -0.076749, -0.178779),
+        (-0.078411, 0.930809, 0.147602),
+        (0.004733, 0.691367, 0.303900),
+    ),
+}
+
+# Redistributes the error between the original and the simulated color
+# (the information that is lost) to the channels that are still perceived
+ERROR_SHIFT = (
+    (0.0, 0.0, 0.0),
+    (0.7, 1.0, 0.0),
+    (0.7, 0.0, 1.0),
+)
+
+# Resolution of the table used to encode linear values back to sRGB. 16 bits
+# keep the result within one unit of the exact formula even in the shadows,
+# where the sRGB curve is the steepest
+_ENCODE_STEPS = 65535
+
+
+def _multiply(a: "Matrix", b: "Matrix") -> "Matrix":
+    return tuple(
+        tuple(sum(a[i][k] * b[k][j] for k in range(3)) for j in range(3))
+        for i in range(3)
+    )
+
+
+def _daltonization_matrix(simulation: "Matrix") -> "Matrix":
+    # daltonized = rgb + SHIFT * (rgb - SIMULATION * rgb), which collapses
+    # into a single matrix: I + SHIFT * (I - SIMULATION)
+    lost = tuple(
+        tuple(IDENTITY[i][j] - simulation[i][j] for j in range(3))
+        for i in range(3)
+    )
+    shifted = _multiply(ERROR_SHIFT, lost)
+
+    return tuple(
+        tuple(IDENTITY[i][j] + shifted[i][j] for j in range(3))
+        for i in range(3)
+    )
+
+
+DALTONIZATION_MATRICES = {
+    kind: _daltonization_matrix(matrix)
+    for kind, matrix in SIMULATION_MATRICES.items()
+}
+
+
+def _check_kind(kind: str) -> None:
+    if kind not in KINDS:
+        raise ValueError(
+            f"Expected the deficiency to be one of {', '.join(KINDS)}, but got {kind!r}"
+        )
+
+
+def _simulation_matrix(kind: str, severity: float) -> "Matrix":
+    _check_kind(kind)
+
+    if not (0.0 <= severity <= 1.0):
+        raise ValueError(
+            f"Expected severity to be in range [0..1], but got {severity}"
+        )
+
+    matrix = SIMULATION_MATRICES[kind]
+    if severity == 1.0:
+        return matrix
+
+    # Anomalous trichromacy is approximated by blending with the identity
+    return tuple(
+        tuple(
+            IDENTITY[i][j] * (1 - severity) + matrix[i][j] * severity
+            for j in range(3)
+        )
+        for i in range(3)
+    )
+
+
+def _daltonization_matrix_for(kind: str) -> "Matrix":
+    _check_kind(kind)
+
+    return DALTONIZATION_MATRICES[kind]
+
+
+def _decode(channel: float) -> float:
+    c = channel / 255
+    if c <= 0.04045:
+        return c / 12.92
+    return ((c + 0.055) / 1.055) ** 2.4
+
+
+def _encode(linear: float) -> int:
+    if linear <= 0.0:
+        return 0
+    if linear >= 1.0:
+        return 255
+    if linear <= 0.0031308:
+        c = linear * 12.92
+    else:
+        c = 1.055 * linear ** (1 / 2.4) - 0.055
+    return int(round(c * 255))
+
+
+_DECODE_TABLE: "List[float]" = []
+_ENCODE_TABLE = b""
+
+
+def _tables() -> "Tuple[List[float], bytes]":
+    global _DECODE_TABLE, _ENCODE_TABLE
+
+    # The tables are built on first use, the encoding one takes a few
+    # milliseconds to compute
+    if not _DECODE_TABLE:
+        _ENCODE_TABLE = bytes(
+            _encode(i / _ENCODE_STEPS) for i in range(_ENCODE_STEPS + 1)
+        )
+        _DECODE_TABLE = [_decode(i) for i in range(256)]
+
+    return _DECODE_TABLE, _ENCODE_TABLE
+
+
+def _transformer(
+    matrix: "Matrix", lut: bool
+) -> "Callable[[int, int, int], Tuple[int, int, int]]":
+    (m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = matrix
+
+    if not lut:
+
+        def transform(r: int, g: int, b: int) -> "Tuple[int, int, int]":
+            lr, lg, lb = _decode(r), _decode(g), _decode(b)
+            return (
+                _encode(m00 * lr + m01 * lg + m02 * lb),
+                _encode(m10 * lr + m11 * lg + m12 * lb),
+                _encode(m20 * lr + m21 * lg + m22 * lb),
+            )
+
+        return transform
+
+    decode, encode = _tables()
+    steps = _ENCODE_STEPS
+
+    def transform_lut(r: int, g: int, b: int) -> "Tuple[int, int, int]":
+        lr, lg, lb = decode[r], decode[g], decode[b]
+        nr = m00 * lr + m01 * lg + m02 * lb
+        ng = m10 * lr + m11 * lg + m12 * lb
+        nb = m20 * lr + m21 * lg + m22 * lb
+        return (
+            encode[int(min(max(nr, 0.0), 1.0) * steps + 0.5)],
+            encode[int(min(max(ng, 0.0), 1.0) * steps + 0.5)],
+            encode[int(min(max(nb, 0.0), 1.0) * steps + 0.5)],
+        )
+
+    return transform_lut
+
+
+def _kernel(
+    matrix: "Matrix", lut: bool
+) -> "Callable[[Tuple[int, int, int]], Tuple[int, int, int]]":
+    transform = _transformer(matrix, lut)
+
+    def kernel(rgb: "Tuple[int, int, int]") -> "Tuple[int, int, int]":
+        r, g, b = rgb
+        # The lookup tables would silently wrap negative channel values
+        if not (0 <= r <= 255) or not (0 <= g <= 255) or not (0 <= b <= 255):
+            raise ValueError(
+                f"Expected R, G, B channel values to be in range [0..255], but got {r}, {g}, {b}"
+            )
+
+        return transform(r, g, b)
+
+    return kernel
+
+
+def _transform_values(
+    values: "Iterable[Tuple[int, int, int]]", matrix: "Matrix", lut: bool
+) -> "List[Tuple[int, int, int]]":
+    kernel = _kernel(matrix, lut)
+
+    return [kernel(rgb) for rgb in values]
+
+
+def _transform_pixels(pixels: bytes, matrix: "Matrix", lut: bool) -> bytearray:
+    if len(pixels) % 3:
+        raise ValueError(
+            f"Expected the buffer size to be a multiple of 3, but got {len(pixels)}"
+        )
+
+    transform = _transformer(matrix, lut)
+    result = bytearray(len(pixels))
+
+    # Images usually contain a lot of repeated colors, so every distinct
+    # packed RGB value is only transformed once
+    cache: "Dict[int, bytes]" = {}
+
+    for i in range(0, len(pixels), 3):
+        r, g, b = pixels[i], pixels[i + 1], pixels[i + 2]
+        key = (r << 16) | (g << 8) | b
+        rgb = cache.get(key)
+        if rgb is None:
+            rgb = bytes(transform(r, g, b))
+            cache[key] = rgb
+        result[i : i + 3] = rgb
+
+    return result
+
+
+def simulator(
+    kind: str, *, severity: float = 1.0, lut: bool = True
+) -> "Callable[[Tuple[int, int, int]], Tuple[int, int, int]]":
+    """Returns a function that simulates a color vision deficiency on a
+    single RGB color. See simulate() for the description of the arguments
+
+    Raises:
+        ValueError: if the deficiency is not supported
+        ValueError: if severity is not in range [0..1]
+
+    Returns:
+        Callable: the transform. It raises ValueError if a channel value is
+        not in range [0..255]
+    """
+    return _kernel(_simulation_matrix(kind, severity), lut)
+
+
+def daltonizer(
+    kind: str, *, lut: bool = True
+) -> "Callable[[Tuple[int, int, int]], Tuple[int, int, int]]":
+    """Returns a function that daltonizes a single RGB color. See
+    daltonize() for the description of the arguments
+
+    Raises:
+        ValueError: if the deficiency is not supported
+
+    Returns:
+        Callable: the transform. It raises ValueError if a channel value is
+        not in range [0..255]
+    """
+    return _kernel(_daltonization_matrix_for(kind), lut)
+
+
+def simulate(
+    values: "Iterable[Tuple[int, int, int]]",
+    kind: str,
+    *,
+    severity: float = 1.0,
+    lut: bool = True,
+) -> "List[Tuple[int, int, int]]":
+    """Simulates how the colors are seen by a person with a color vision
+    deficiency.
+
+    Args:
+        values (Iterable[Tuple[int, int, int]]): RGB colors
+        kind (str): "protanopia", "deuteranopia" or "tritanopia"
+        severity (float): from 0 (normal vision) up to 1 (dichromacy)
+        lut (bool): use the lookup tables for the sRGB transfer function.
+        They are faster, but may differ from the exact formula by one unit
+
+    Raises:
+        ValueError: if the deficiency is not supported
+        ValueError: if severity is not in range [0..1]
+        ValueError: if a channel value is not in range [0..255]
+
+    Returns:
+        List[Tuple[int, int, int]]: the simulated RGB colors
+    """
+    return _transform_values(values, _simulation_matrix(kind, severity), lut)
+
+
+def simulate_pixels(
+    pixels: bytes,
+    kind: str,
+    *,
+    severity: float = 1.0,
+    lut: bool = True,
+) -> bytearray:
+    """Simulates a color vision deficiency on a pixel buffer. See simulate()
+    for the description of the arguments
+
+    Raises:
+        ValueError: if the buffer size is not a multiple of 3
+
+    Returns:
+        bytearray: the simulated pixel buffer
+    """
+    return _transform_pixels(pixels, _simulation_matrix(kind, severity), lut)
+
+
+def daltonize(
+    values: "Iterable[Tuple[int, int, int]]",
+    kind: str,
+    *,
+    lut: bool = True,
+) -> "List[Tuple[int, int, int]]":
+    """Adjusts the colors so that they are easier to tell apart for a person
+    with a color vision deficiency.
+
+    Args:
+        values (Iterable[Tuple[int, int, int]]): RGB colors
+        kind (str): "protanopia", "deuteranopia" or "tritanopia"
+        lut (bool): use the lookup tables for the sRGB transfer function
+
+    Raises:
+        ValueError: if the deficiency is not supported
+        ValueError: if a channel value is not in range [0..255]
+
+    Returns:
+        List[Tuple[int, int, int]]: the daltonized RGB colors
+    """
+    return _transform_values(values, _daltonization_matrix_for(kind), lut)
+
+
+def daltonize_pixels(
+    pixels: bytes, kind: str, *, lut: bool = True
+) -> bytearray:
+    """Daltonizes a pixel buffer. See daltonize() for the description of the
+    arguments
+
+    Raises:
+        ValueError: if the buffer size is not a multiple of 3
+
+    Returns:
+        bytearray: the daltonized pixel buffer
+    """
+    return _transform_pixels(pixels, _daltonization_matrix_for(kind), lut)
@@ -0,0 +1,71 @@
+"""The HarmonyRule data container returned by Color.harmony_* methods"""
+
+from dataclasses import dataclass
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import List
+
+    from .color import Color
+
+
+# The rules supported by the Color.harmony_<rule> methods
+HARMONY_RULES = (
+    "complementary",
+    "split_complementary",
+    "triadic",
+    "tetradic",
+    "analogous",
+)
+
+# The rules that accept the phi argument
+PHI_RULES = ("split_complementary", "analogous")
+
+
+@dataclass
+class HarmonyRule:
+    """A dataclass that represents a certain color harmony rule and contains
+    all the colors that are related to it.
+
+    Note that this class is a data container. It is only storing data. The actual
+    calculation is done by Color.harmony_<harmony_type> methods.
+
+    Attributes:
+        rule_type: [str] -> An attribute that stores the type of the rule.
+        The valid values are "complementary", "split_complementary", "triadic",
+        "tetradic", "analogous"
+
+        base_color: Color -> A Color object that was used to derive the secondary colors.
+        secondary_colors: List[Colors] -> A list of colors that were derived from the base color according to
+        the applied harmony rule
+
+    """
+
+    rule_type: str
+    base_color: "Color"
+    secondary_colors: "List[Color]"
+
+    def get_base_color(self) -> "Color":
+        """Returns the base color of a harmony rule (the root color)
+
+        Returns:
+            Color: the Color object containing the base color info
+        """
+        return self.base_color
+
+    def get_secondary_colors(self) -> "List[Color]":
+        """Returns the secondary colors of the harmony rule (the colors that
+        were derived from the base color according to the rule)
+
+        Returns:
+            List[Color]: A list of Color objects that contain the secondary color info
+        """
+        return self.secondary_colors
+
+    def get_harmony_rule_type(self) -> str:
+        """Returns the type of harmony rule
+
+        Returns:
+            str: the type
+        """
+        return self.rule_type
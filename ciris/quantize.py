@@ -0,0 +1,324 @@
+"""Quantization of RGB pixel buffers to a fixed palette of colors.
+
+A pixel buffer is a bytes-like object that stores the pixels row by row,
+3 bytes (red, green, blue) per pixel. The result of the quantization is an
+index buffer: a bytearray with one byte per pixel, which is the index of the
+pixel's color in the palette.
+"""
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from typing import (
+        Dict,
+        Iterable,
+        Iterator,
+        List,
+        Optional,
+        Sequence,
+        Tuple,
+    )
+
+    from .color import Color
+
+
+METHODS = ("nearest", "bayer", "floyd_steinberg")
+
+# 4x4 Bayer threshold matrix
+BAYER_MATRIX = (
+    (0, 8, 2, 10),
+    (12, 4, 14, 6),
+    (3, 11, 1, 9),
+    (15, 7, 13, 5),
+)
+
+
+def _check_method(method: str) -> None:
+    if method not in METHODS:
+        raise ValueError(
+            f"Expected the method to be one of {', '.join(METHODS)}, but got {method!r}"
+        )
+
+
+def _palette_to_rgb(
+    palette: "Sequence[Color]",
+) -> "List[Tuple[int, int, int]]":
+    if not (1 <= len(palette) <= 256):
+        raise ValueError(
+            f"Expected the palette to contain from 1 up to 256 colors, but got {len(palette)}"
+        )
+
+    return [color.as_rgb() for color in palette]
+
+
+def _find_nearest(
+    palette: "List[Tuple[int, int, int]]", r: int, g: int, b: int
+) -> int:
+    best_index = 0
+    best_distance = 3 * 256 * 256
+
+    for index, (pr, pg, pb) in enumerate(palette):
+        distance = (r - pr) ** 2 + (g - pg) ** 2 + (b - pb) ** 2
+        if distance < best_distance:
+            best_index = index
+            best_distance = distance
+
+    return best_index
+
+
+def _bayer_offsets(spread: float) -> "List[List[int]]":
+    # Precomputes the offset added to every channel for each cell of the
+    # Bayer matrix, so that the inner loop only does a lookup
+    return [
+        [int(round(spread * ((cell + 0.5) / 16 - 0.5))) for cell in row]
+        for row in BAYER_MATRIX
+    ]
+
+
+def _iter_rows(
+    rows: "Iterable[bytes]",
+    width: int,
+    palette: "List[Tuple[int, int, int]]",
+    method: str,
+    row_offset: int,
+    spread: "Optional[float]",
+) -> "Iterator[bytearray]":
+    row_size = width * 3
+
+    # Maps a packed 24-bit RGB value to the index of the nearest palette
+    # color. Dithering only produces a limited set of distinct values, so
+    # most lookups hit the cache
+    cache: "Dict[int, int]" = {}
+
+    if method == "bayer":
+        if spread is None:
+            spread = 256 / len(palette) ** (1 / 3)
+        offsets = _bayer_offsets(spread)
+
+    if method == "floyd_steinberg":
+        # Errors carried over to the current and to the next row. Two extra
+        # pixels on each side spare the bounds checks in the inner loop
+        errors = [0.0] * (row_size + 6)
+        next_errors = [0.0] * (row_size + 6)
+
+    for y, row in enumerate(rows, row_offset):
+        if len(row) != row_size:
+            raise ValueError(
+                f"Expected every row to contain {row_size} bytes, but got {len(row)}"
+            )
+
+        indices = bytearray(width)
+
+        if method == "nearest":
+            for x in range(width):
+                i = x * 3
+                key = (row[i] << 16) | (row[i + 1] << 8) | row[i + 2]
+                index = cache.get(key)
+                if index is None:
+                    index = _find_nearest(
+                        palette, row[i], row[i + 1], row[i + 2]
+                    )
+                    cache[key] = index
+                indices[x] = index
+
+        elif method == "bayer":
+            row_offsets = offsets[y % 4]
+            for x in range(width):
+                i = x * 3
+                offset = row_offsets[x % 4]
+                r = min(max(row[i] + offset, 0), 255)
+                g = min(max(row[i + 1] + offset, 0), 255)
+                b = min(max(row[i + 2] + offset, 0), 255)
+                key = (r << 16) | (g << 8) | b
+                index = cache.get(key)
+                if index is None:
+                    index = _find_nearest(palette, r, g, b)
+                    cache[key] = index
+                indices[x] = index
+
+        else:
+            for x in range(width):
+                i = x * 3
+                e = i + 3
+                r = min(max(int(round(row[i] + errors[e])), 0), 255)
+                g = min(max(int(round(row[i + 1] + errors[e + 1])), 0), 255)
+                b = min(max(int(round(row[i + 2] + errors[e + 2])), 0), 255)
+                key = (r << 16) | (g << 8) | b
+                index = cache.get(key)
+                if index is None:
+                    index = _find_nearest(palette, r, g, b)
+                    cache[key] = index
+                indices[x] = index
+
+                pr, pg, pb = palette[index]
+                er, eg, eb = r - pr, g - pg, b - pb
+                if er or eg or eb:
+                    errors[e + 3] += er * 0.4375  # 7/16
+                    errors[e + 4] += eg * 0.4375
+                    errors[e + 5] += eb * 0.4375
+                    next_errors[e - 3] += er * 0.1875  # 3/16
+                    next_errors[e - 2] += eg * 0.1875
+                    next_errors[e - 1] += eb * 0.1875
+                    next_errors[e] += er * 0.3125  # 5/16
+                    next_errors[e + 1] += eg * 0.3125
+                    next_errors[e + 2] += eb * 0.3125
+                    next_errors[e + 3] += er * 0.0625  # 1/16
+                    next_errors[e + 4] += eg * 0.0625
+                    next_errors[e + 5] += eb * 0.0625
+
+            errors = next_errors
+            next_errors = [0.0] * (row_size + 6)
+
+        yield indices
+
+
+def iter_quantize_rows(
+    rows: "Iterable[bytes]",
+    width: int,
+    palette: "Sequence[Color]",
+    *,
+    method: str = "nearest",
+    row_offset: int = 0,
+    spread: "Optional[float]" = None,
+) -> "Iterator[bytearray]":
+    """Quantizes the rows of an image one by one. Only the current row (and,
+    for Floyd-Steinberg dithering, the errors carried to the next one) is held
+    in memory, so the rows can be streamed from a file or a socket.
+
+    Args:
+        rows (Iterable[bytes]): the rows of the image. Every row is a
+        bytes-like object containing `width * 3` bytes (R, G, B)
+        width (int): the width of the image in pixels
+        palette (Sequence[Color]): the colors to map the pixels to (up to 256)
+        method (str): "nearest" for nearest-color mapping, "bayer" for
+        ordered dithering or "floyd_steinberg" for error diffusion
+        row_offset (int): the index of the first row in the whole image. It
+        aligns the Bayer matrix when an image is processed in parts
+        spread (float, optional): the strength of Bayer dithering. By default
+        it is derived from the size of the palette
+
+    Raises:
+        ValueError: if the palette is empty or contains more than 256 colors
+        ValueError: if the method is not supported
+        ValueError: if a row does not contain `width * 3` bytes
+
+    Returns:
+        Iterator[bytearray]: an iterator over the index rows
+    """
+    _check_method(method)
+
+    return _iter_rows(
+        rows, width, _palette_to_rgb(palette), method, row_offset, spread
+    )
+
+
+def _quantize_band(
+    band: bytes,
+    width: int,
+    palette: "List[Tuple[int, int, int]]",
+    method: str,
+    row_offset: int,
+    spread: "Optional[float]",
+) -> bytearray:
+    row_size = width * 3
+    rows = (band[i : i + row_size] for i in range(0, len(band), row_size))
+
+    result = bytearray()
+    for indices in _iter_rows(
+        rows, width, palette, method, row_offset, spread
+    ):
+        result += indices
+
+    return result
+
+
+def quantize(
+    pixels: bytes,
+    width: int,
+    height: int,
+    palette: "Sequence[Color]",
+    *,
+    method: str = "nearest",
+    bands: int = 1,
+    executor: "Optional[Executor]" = None,
+    spread: "Optional[float]" = None,
+) -> bytearray:
+    """Maps every pixel of an RGB image to a color from the palette.
+
+    The image can be split into several horizontal bands which are processed
+    independently, e.g. in parallel by passing an executor. Note that the
+    Floyd-Steinberg error is not carried across the bands' borders, so the
+    result of error diffusion depends on the number of bands.
+
+    Args:
+        pixels (bytes): the image, `width * height * 3` bytes (R, G, B)
+        width (int): the width of the image in pixels
+        height (int): the height of the image in pixels
+        palette (Sequence[Color]): the colors to map the pixels to (up to 256)
+        method (str): "nearest", "bayer" or "floyd_steinberg". See
+        iter_quantize_rows() for the details
+        bands (int): the number of horizontal bands to split the image into
+        executor (Executor, optional): an executor to process the bands in.
+        If omitted, the bands are processed one after another
+        spread (float, optional): the strength of Bayer dithering
+
+    Raises:
+        ValueError: if the width or the height is not positive
+        ValueError: if the size of the buffer does not match the dimensions
+        ValueError: if the number of bands is not positive
+        ValueError: if the palette or the method is invalid
+
+    Returns:
+        bytearray: the index buffer, one byte per pixel
+    """
+    if width < 1 or height < 1:
+        raise ValueError(
+            f"Expected the width and the height to be positive integers, but got {width}x{height}"
+        )
+
+    if len(pixels) != width * height * 3:
+        raise ValueError(
+            f"Expected the buffer to contain {width * height * 3} bytes for a {width}x{height} image, but got {len(pixels)}"
+        )
+
+    if bands < 1:
+        raise ValueError(
+            f"Expected the number of bands to be a positive integer, but got {bands}"
+        )
+
+    _check_method(method)
+    palette_rgb = _palette_to_rgb(palette)
+
+    pixels = memoryview(pixels)
+    row_size = width * 3
+    band_height = max(-(-height // bands), 1)
+    starts = range(0, height, band_height)
+
+    bands_pixels = [
+        pixels[start * row_size : (start + band_height) * row_size]
+        for start in starts
+    ]
+
+    if executor is None:
+        results = [
+            _quantize_band(band, width, palette_rgb, method, start, spread)
+            for band, start in zip(bands_pixels, starts)
+        ]
+    else:
+        # Bands are copied to bytes, since memoryview objects cannot be
+        # pickled for process pools
+        results = executor.map(
+            _quantize_band,
+            [bytes(band) for band in bands_pixels],
+            [width] * len(starts),
+            [palette_rgb] * len(starts),
+            [method] * len(starts),
+            starts,
+            [spread] * len(starts),
+        )
+
+    indices = bytearray()
+    for result in results:
+        indices += result
+
+    return indices
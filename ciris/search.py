@@ -0,0 +1,402 @@
+"""Searching an inventory of colors for sets that satisfy a harmony rule.
+
+HarmonyIndex sorts the inventory by hue once, after that every color that
+is derived by a harmony rule is looked up with a binary search over a hue
+range instead of a scan of the whole inventory. Building the index takes
+O(N log N), and a search takes O(N log N + M), where M is the number of
+matches.
+"""
+
+from bisect import bisect_left, bisect_right
+from itertools import permutations, product
+
+from .harmony import HARMONY_RULES, PHI_RULES, HarmonyRule
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+    from .color import Color
+
+    # (saturation cell, value cell) -> (hues, inventory positions)
+    Grid = Dict[Tuple[int, int], Tuple[List[float], List[int]]]
+
+
+# Rules whose colors are evenly spaced on the color wheel. A set of colors
+# that satisfies them may be found from several of its members, so it is
+# only reported for the first one
+SYMMETRIC_RULES = ("complementary", "triadic", "tetradic")
+
+# Hue offsets of the rules that do not accept phi
+_OFFSETS = {
+    "complementary": (180,),
+    "triadic": (120, 240),
+    "tetradic": (90, 180, 270),
+}
+
+
+def rule_offsets(rule: str, phi: "Optional[int]" = None) -> "Tuple[int, ...]":
+    """Returns the hue offsets of the secondary colors of a harmony rule, the
+    same ones that are used by the Color.harmony_<rule> methods
+
+    Args:
+        rule (str): "complementary", "split_complementary", "triadic",
+        "tetradic" or "analogous"
+        phi (int, optional): the offset used by the split complementary
+        (default 150) and the analogous (default 30) rules
+
+    Raises:
+        ValueError: if the rule is not supported
+        ValueError: if phi is passed to a rule that does not use it
+
+    Returns:
+        Tuple[int, ...]: the offsets in degrees
+    """
+    if rule not in HARMONY_RULES:
+        raise ValueError(
+            f"Expected harmony rule to be one of {', '.join(HARMONY_RULES)}, but got {rule!r}"
+        )
+
+    if rule in PHI_RULES:
+        if phi is None:
+            phi = 150 if rule == "split_complementary" else 30
+
+        if rule == "split_complementary":
+            return (phi, 360 - phi)
+        return (-phi, phi)
+
+    if phi is not None:
+        raise ValueError(f"The {rule} rule does not accept phi")
+
+    return _OFFSETS[rule]
+
+
+def _hue_distance(a: float, b: float) -> float:
+    distance = abs(a - b) % 360
+    return min(distance, 360 - distance)
+
+
+def _hue_range(
+    hues: "List[float]", order: "List[int]", hue: float, tolerance: float
+) -> "List[int]":
+    if tolerance >= 180:
+        return list(order)
+
+    hue = hue % 360
+    low, high = hue - tolerance, hue + tolerance
+
+    ranges = [(max(low, 0), min(high, 360))]
+    if low < 0:
+        ranges.append((low + 360, 360))
+    if high >= 360:
+        ranges.append((0, high - 360))
+
+    matches = []
+    for start, end in ranges:
+        first = bisect_left(hues, start)
+        last = bisect_right(hues, end)
+        matches.extend(order[first:last])
+
+    return matches
+
+
+def _sv_cell(fraction: float, cell_size: int) -> int:
+    # Saturation and value are stored in range [0..1]. The function is
+    # monotonic, so the cells of the range bounds enclose all the colors in
+    # the range
+    return int(fraction * 100 + 1e-6) // cell_size
+
+
+class HarmonyIndex:
+    def __init__(self, colors: "Iterable[Color]") -> None:
+        """Builds a hue index over an inventory of colors
+
+        Args:
+            colors (Iterable[Color]): the inventory. The colors are not
+            copied, so they should not be modified while the index is used
+        """
+        self.colors: "List[Color]" = list(colors)
+
+        hues = [color.h % 360 for color in self.colors]
+
+        # Inventory positions sorted by hue, and the hues in the same order
+        self._order = sorted(range(len(hues)), key=hues.__getitem__)
+        self._hues = [hues[i] for i in self._order]
+
+        # The same, but split into a grid by saturation and value, for the
+        # searches limited by sv_tolerance. A grid is built on first use for
+        # every cell size
+        self._grids: "Dict[int, Grid]" = {}
+
+    def __len__(self) -> int:
+        return len(self.colors)
+
+    def _grid(self, cell_size: int) -> "Grid":
+        grid = self._grids.get(cell_size)
+        if grid is not None:
+            return grid
+
+        grid = {}
+        colors = self.colors
+
+        # Iterating in the hue order keeps every cell sorted by hue
+        for hue, index in zip(self._hues, self._order):
+            color = colors[index]
+            key = (
+                _sv_cell(color.s, cell_size),
+                _sv_cell(color.v, cell_size),
+            )
+            cell = grid.setdefault(key, ([], []))
+            cell[0].append(hue)
+            cell[1].append(index)
+
+        self._grids[cell_size] = grid
+
+        return grid
+
+    def hue_range(
+        self,
+        hue: float,
+        tolerance: float,
+        *,
+        near: "Optional[Color]" = None,
+        sv_tolerance: float = 0,
+    ) -> "List[int]":
+        """Returns the positions of the inventory colors whose hue is within
+        the tolerance from the given one, on the color wheel
+
+        Args:
+            hue (float): the hue to look up
+            tolerance (float): the maximum distance in degrees
+            near (Color, optional): if passed, only the colors whose
+            saturation and value are within sv_tolerance from the ones of
+            this color are returned
+            sv_tolerance (float): the maximum saturation and value distance
+            (in range [0..100]) from the `near` color
+
+        Returns:
+            List[int]: the positions of the colors in the inventory
+        """
+        if near is None:
+            return _hue_range(self._hues, self._order, hue, tolerance)
+
+        # Cells as wide as the tolerance keep the number of visited cells
+        # (up to 3x3) and the number of colors in each of them small
+        cell_size = max(int(sv_tolerance), 1)
+
+        return self._grid_range(
+            self._grid(cell_size),
+            cell_size,
+            hue,
+            tolerance,
+            near,
+            sv_tolerance,
+        )
+
+    def _grid_range(
+        self,
+        grid: "Grid",
+        cell_size: int,
+        hue: float,
+        tolerance: float,
+        near: "Color",
+        sv_tolerance: float,
+    ) -> "List[int]":
+        # Saturation and value are stored as fractions, the epsilon absorbs
+        # the rounding errors of e.g. 0.29 - 0.3
+        limit = sv_tolerance * 0.01 + 1e-9
+        s, v = near.s, near.v
+
+        s_first = _sv_cell(s - limit, cell_size)
+        s_last = _sv_cell(s + limit, cell_size)
+        v_first = _sv_cell(v - limit, cell_size)
+        v_last = _sv_cell(v + limit, cell_size)
+
+        colors = self.colors
+        matches = []
+
+        for s_cell in range(s_first, s_last + 1):
+            for v_cell in range(v_first, v_last + 1):
+                cell = grid.get((s_cell, v_cell))
+                if cell is None:
+                    continue
+
+                for index in _hue_range(cell[0], cell[1], hue, tolerance):
+                    color = colors[index]
+                    if abs(color.s - s) <= limit and abs(color.v - v) <= limit:
+                        matches.append(index)
+
+        return matches
+
+    def find_indices(
+        self,
+        rule: str,
+        tolerance: float = 5,
+        *,
+        phi: "Optional[int]" = None,
+        sv_tolerance: "Optional[float]" = None,
+    ) -> "Iterator[Tuple[int, ...]]":
+        """Finds the sets of inventory colors that approximately satisfy a
+        harmony rule.
+
+        Args:
+            rule (str): "complementary", "split_complementary", "triadic",
+            "tetradic" or "analogous"
+            tolerance (float): the maximum hue distance in degrees between
+            an inventory color and the one derived by the rule. Default is 5
+            phi (int, optional): the offset for the split complementary and
+            the analogous rules
+            sv_tolerance (float, optional): if passed, the saturation and the
+            value of the matching colors must be within this distance (in
+            range [0..100]) from the ones of the base color, like they are for
+            the colors derived by Color.harmony_<rule> methods
+
+        Raises:
+            ValueError: if the rule is not supported
+
+        Returns:
+            Iterator[Tuple[int, ...]]: tuples of inventory positions. The
+            first one is the base color, the rest are the secondary colors in
+            the same order as in the HarmonyRule returned by the Color method
+        """
+        offsets = rule_offsets(rule, phi)
+
+        return self._find(
+            offsets, rule in SYMMETRIC_RULES, tolerance, sv_tolerance
+        )
+
+    def _orders(
+        self,
+        base_index: int,
+        members: "Tuple[int, ...]",
+        offsets: "Tuple[int, ...]",
+        tolerance: float,
+        sv_tolerance: "Optional[float]",
+    ) -> "Iterator[Tuple[int, ...]]":
+        # The orders of the other members of a set that the search from
+        # base_index finds, with the same tolerances as the range queries
+        colors = self.colors
+        base = colors[base_index]
+        others = [index for index in members if index != base_index]
+
+        if sv_tolerance is not None:
+            limit = sv_tolerance * 0.01 + 1e-9
+            for index in others:
+                color = colors[index]
+                if (
+                    abs(color.s - base.s) > limit
+                    or abs(color.v - base.v) > limit
+                ):
+                    return
+
+        for order in permutations(others):
+            if all(
+                _hue_distance(colors[index].h % 360, base.h + offset)
+                <= tolerance
+                for index, offset in zip(order, offsets)
+            ):
+                yield order
+
+    def _is_first(
+        self,
+        base_index: int,
+        secondary: "Tuple[int, ...]",
+        offsets: "Tuple[int, ...]",
+        tolerance: float,
+        sv_tolerance: "Optional[float]",
+    ) -> bool:
+        members = (base_index, *secondary)
+
+        for index in secondary:
+            if index < base_index and any(
+                self._orders(index, members, offsets, tolerance, sv_tolerance)
+            ):
+                return False
+
+        # With a wide tolerance, the same member may match several offsets
+        if len(offsets) > 1:
+            orders = self._orders(
+                base_index, members, offsets, tolerance, sv_tolerance
+            )
+            return min(orders) == secondary
+
+        return True
+
+    def _find(
+        self,
+        offsets: "Tuple[int, ...]",
+        symmetric: bool,
+        tolerance: float,
+        sv_tolerance: "Optional[float]",
+    ) -> "Iterator[Tuple[int, ...]]":
+        if sv_tolerance is not None:
+            cell_size = max(int(sv_tolerance), 1)
+            grid = self._grid(cell_size)
+
+        for base_index, base in enumerate(self.colors):
+            candidates = []
+            for offset in offsets:
+                if sv_tolerance is None:
+                    matches = _hue_range(
+                        self._hues, self._order, base.h + offset, tolerance
+                    )
+                else:
+                    matches = self._grid_range(
+                        grid,
+                        cell_size,
+                        base.h + offset,
+                        tolerance,
+                        base,
+                        sv_tolerance,
+                    )
+
+                matches = [index for index in matches if index != base_index]
+
+                if not matches:
+                    break
+                candidates.append(matches)
+            else:
+                for secondary in product(*candidates):
+                    if len(set(secondary)) != len(secondary):
+                        continue
+
+                    # A set of a symmetric rule is only reported from its
+                    # first member that finds it, in the first order of the
+                    # other members. This is checked directly instead of
+                    # remembering the reported sets, so the memory usage
+                    # does not grow with the number of matches
+                    if symmetric and not self._is_first(
+                        base_index, secondary, offsets, tolerance, sv_tolerance
+                    ):
+                        continue
+
+                    yield (base_index, *secondary)
+
+    def find(
+        self,
+        rule: str,
+        tolerance: float = 5,
+        *,
+        phi: "Optional[int]" = None,
+        sv_tolerance: "Optional[float]" = None,
+    ) -> "Iterator[HarmonyRule]":
+        """Finds the sets of inventory colors that approximately satisfy a
+        harmony rule. See find_indices() for the description of the arguments
+
+        Returns:
+            Iterator[HarmonyRule]: HarmonyRule objects made of the inventory
+            colors
+        """
+        colors = self.colors
+        matches = self.find_indices(
+            rule, tolerance, phi=phi, sv_tolerance=sv_tolerance
+        )
+
+        return (
+            HarmonyRule(
+                rule,
+                colors[base],
+                [colors[index] for index in secondary],
+            )
+            for base, *secondary in matches
+        )
@@ -0,0 +1,306 @@
+"""Hue histograms and summary statistics over batches of colors.
+
+ColorStats only keeps integer histograms of hue, saturation and value, so
+every statistic is derived from them, any number of colors can be added in a
+single pass, and partial results computed by different workers or over
+different chunks can be merged exactly with ColorStats.merge().
+"""
+
+import math
+
+from .color import _rgb_to_hsv
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, Iterable, List, Optional, Tuple
+
+    from typing_extensions import Self
+
+    from .color import Color
+
+
+def _median(histogram: "List[int]", total: int) -> "Optional[float]":
+    if total == 0:
+        return None
+
+    # Positions of the two middle elements (the same one if total is odd)
+    low, high = (total - 1) // 2, total // 2
+    low_value = high_value = None
+
+    seen = 0
+    for value, count in enumerate(histogram):
+        seen += count
+        if low_value is None and seen > low:
+            low_value = value
+        if seen > high:
+            high_value = value
+            break
+
+    return (low_value + high_value) / 2
+
+
+def _mean(histogram: "List[int]", total: int) -> "Optional[float]":
+    if total == 0:
+        return None
+
+    return sum(value * count for value, count in enumerate(histogram)) / total
+
+
+class ColorStats:
+    def __init__(self) -> None:
+        """Creates an empty statistics accumulator. Colors are added to it
+        with the update methods, and the statistics can be queried at any
+        point.
+
+        The hue of achromatic colors (shades of gray) is undefined, so they
+        are counted in the saturation and value statistics, but not in the
+        hue statistics.
+        """
+        self.count = 0
+        self.chromatic_count = 0
+        self.hue_counts = [0] * 360
+        self.saturation_counts = [0] * 101
+        self.value_counts = [0] * 101
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(count={self.count})"
+
+    def __eq__(self, __o: object) -> bool:
+        return isinstance(__o, ColorStats) and (
+            (self.count == __o.count)
+            and (self.hue_counts == __o.hue_counts)
+            and (self.saturation_counts == __o.saturation_counts)
+            and (self.value_counts == __o.value_counts)
+        )
+
+    def add_hsv(self, h: float, s: float, v: float) -> "Self":
+        """Adds a color defined by its HSV values
+
+        Args:
+            h (float): Hue (from 0 up to 360)
+            s (float): Saturation (from 0 up to 100)
+            v (float): Value (from 0 up to 100)
+
+        Raises:
+            ValueError: if Hue is not in range [0..360]
+            ValueError: if Saturation is not in range [0..100]
+            ValueError: if Value is not in range [0..100]
+        """
+        if not (0 <= h <= 360):
+            raise ValueError(
+                f"Expected Hue to be in range [0..360], but got {h}"
+            )
+
+        if not (0 <= s <= 100):
+            raise ValueError(
+                f"Expected Saturation to be in range [0..100], but got {s}"
+            )
+
+        if not (0 <= v <= 100):
+            raise ValueError(
+                f"Expected Value to be in range [0..100], but got {v}"
+            )
+
+        s = int(round(s))
+
+        self.count += 1
+        self.saturation_counts[s] += 1
+        self.value_counts[int(round(v))] += 1
+
+        if s > 0:
+            self.chromatic_count += 1
+            self.hue_counts[int(round(h)) % 360] += 1
+
+        return self
+
+    def update(self, colors: "Iterable[Color]") -> "Self":
+        """Adds the colors from a batch
+
+        Args:
+            colors (Iterable[Color]): the colors to add
+        """
+        for color in colors:
+            self.add_hsv(*color.as_hsv())
+
+        return self
+
+    def update_pixels(self, pixels: bytes) -> "Self":
+        """Adds the pixels from a buffer that stores them row by row, 3 bytes
+        (red, green, blue) per pixel
+
+        Args:
+            pixels (bytes): the pixel buffer
+
+        Raises:
+            ValueError: if the buffer size is not a multiple of 3
+        """
+        if len(pixels) % 3:
+            raise ValueError(
+                f"Expected the buffer size to be a multiple of 3, but got {len(pixels)}"
+            )
+
+        # The HSV values of every distinct pixel are only computed once
+        cache: "Dict[int, Tuple[int, int, int]]" = {}
+
+        hue_counts = self.hue_counts
+        saturation_counts = self.saturation_counts
+        value_counts = self.value_counts
+        chromatic = 0
+
+        for i in range(0, len(pixels), 3):
+            r, g, b = pixels[i], pixels[i + 1], pixels[i + 2]
+            key = (r << 16) | (g << 8) | b
+            hsv = cache.get(key)
+            if hsv is None:
+                hsv = _rgb_to_hsv(r, g, b)
+                cache[key] = hsv
+
+            h, s, v = hsv
+            saturation_counts[s] += 1
+            value_counts[v] += 1
+            if s > 0:
+                chromatic += 1
+                hue_counts[h] += 1
+
+        self.count += len(pixels) // 3
+        self.chromatic_count += chromatic
+
+        return self
+
+    def merge(self, other: "ColorStats") -> "Self":
+        """Adds the statistics collected by another accumulator, e.g. by
+        another worker or over another chunk of data
+
+        Args:
+            other (ColorStats): the statistics to merge
+        """
+        self.count += other.count
+        self.chromatic_count += other.chromatic_count
+
+        for mine, theirs in (
+            (self.hue_counts, other.hue_counts),
+            (self.saturation_counts, other.saturation_counts),
+            (self.value_counts, other.value_counts),
+        ):
+            for i, count in enumerate(theirs):
+                mine[i] += count
+
+        return self
+
+    def hue_histogram(self, bins: int = 12) -> "List[int]":
+        """Returns the histogram of hues. The first bin is centered on 0
+        degrees (red), so with the default 12 bins the bin 0 covers hues
+        [345..15), the bin 1 covers [15..45) and so on
+
+        Args:
+            bins (int): the number of bins, must divide 360
+
+        Raises:
+            ValueError: if 360 is not divisible by the number of bins
+
+        Returns:
+            List[int]: the number of colors in each bin
+        """
+        if bins < 1 or 360 % bins:
+            raise ValueError(
+                f"Expected the number of bins to be a divisor of 360, but got {bins}"
+            )
+
+        width = 360 // bins
+        half = width // 2
+        histogram = [0] * bins
+
+        for hue, count in enumerate(self.hue_counts):
+            histogram[((hue + half) % 360) // width] += count
+
+        return histogram
+
+    def dominant_hues(
+        self, count: int = 3, bins: int = 12
+    ) -> "List[Tuple[int, int]]":
+        """Returns the most populated hue bins
+
+        Args:
+            count (int): how many bins to return. Default is 3
+            bins (int): the number of bins, see hue_histogram()
+
+        Raises:
+            ValueError: if 360 is not divisible by the number of bins
+
+        Returns:
+            List[Tuple[int, int]]: tuples containing the hue at the center of
+            the bin and the number of colors in it, the most populated first.
+            Empty bins are not returned
+        """
+        histogram = self.hue_histogram(bins)
+        width = 360 // bins
+
+        ranked = sorted(
+            (
+                (index * width, amount)
+                for index, amount in enumerate(histogram)
+                if amount
+            ),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+        return ranked[:count]
+
+    def _hue_resultant(self) -> "Tuple[float, float]":
+        x = y = 0.0
+        for hue, count in enumerate(self.hue_counts):
+            if count:
+                angle = math.radians(hue)
+                x += count * math.cos(angle)
+                y += count * math.sin(angle)
+
+        return x, y
+
+    def mean_hue(self) -> "Optional[float]":
+        """Returns the circular mean of the hues, so that e.g. the mean of
+        350 and 10 degrees is 0, not 180
+
+        Returns:
+            Optional[float]: the mean hue in range [0..360), or None if there
+            are no chromatic colors or the hues cancel each other out
+        """
+        x, y = self._hue_resultant()
+
+        if self.chromatic_count == 0 or math.hypot(x, y) < 1e-9:
+            return None
+
+        return math.degrees(math.atan2(y, x)) % 360
+
+    def hue_concentration(self) -> "Optional[float]":
+        """Returns how concentrated the hues are around the mean hue (the
+        mean resultant length)
+
+        Returns:
+            Optional[float]: a value from 0 (hues are spread evenly) up to 1
+            (all hues are the same), or None if there are no chromatic colors
+        """
+        if self.chromatic_count == 0:
+            return None
+
+        return math.hypot(*self._hue_resultant()) / self.chromatic_count
+
+    def mean_saturation(self) -> "Optional[float]":
+        """Returns the mean saturation (from 0 up to 100), or None if no
+        colors were added"""
+        return _mean(self.saturation_counts, self.count)
+
+    def median_saturation(self) -> "Optional[float]":
+        """Returns the median saturation (from 0 up to 100), or None if no
+        colors were added"""
+        return _median(self.saturation_counts, self.count)
+
+    def mean_value(self) -> "Optional[float]":
+        """Returns the mean value (from 0 up to 100), or None if no colors
+        were added"""
+        return _mean(self.value_counts, self.count)
+
+    def median_value(self) -> "Optional[float]":
+        """Returns the median value (from 0 up to 100), or None if no colors
+        were added"""
+        return _median(self.value_counts, self.count)
@@ -0,0 +1,323 @@
+"""A store of named palettes that is shared between threads.
+
+Every palette is kept as an immutable PaletteSnapshot. Reading never takes a
+lock: the store publishes its palettes as a dict that is never modified
+afterwards, so a reader sees either the state before an update or the state
+after it, never a half-applied one. Writers are serialized by a lock, copy
+the dict, change the copy and publish it with a single assignment.
+
+Snapshots cache the views derived from their colors (e.g. the hex-strings or
+the harmonies), so every thread that uses a palette shares the same
+precomputed values instead of converting the colors on its own.
+"""
+
+import copy
+import threading
+
+from .convert import converter
+from .harmony import HARMONY_RULES, PHI_RULES
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import (
+        Any,
+        Callable,
+        Dict,
+        Iterable,
+        Iterator,
+        List,
+        Mapping,
+        Optional,
+        Tuple,
+    )
+
+    from .color import Color
+
+
+def _convert_colors(
+    colors: "Iterable[Color]", space: str
+) -> "Tuple[Any, ...]":
+    # The Color.as_<space> methods are used where they exist, so that the
+    # views match them exactly. Other spaces are converted from HSV
+    method = f"as_{space}"
+    to_space = None
+    converted = []
+
+    for color in colors:
+        if hasattr(color, method):
+            converted.append(getattr(color, method)())
+        else:
+            if to_space is None:
+                to_space = converter("hsv", space)
+            converted.append(to_space(color.as_hsv()))
+
+    return tuple(converted)
+
+
+class PaletteSnapshot:
+    """An immutable version of a named palette. Snapshots are created by
+    PaletteStore, there is no need to create them directly"""
+
+    __slots__ = ("_name", "_version", "_colors", "_views")
+
+    def __init__(
+        self, name: str, colors: "Iterable[Color]", version: int = 0
+    ) -> None:
+        self._name = name
+        self._version = version
+
+        # Colors are mutable, so the snapshot keeps private copies of them
+        # and only hands out new copies
+        self._colors: "Tuple[Color, ...]" = tuple(
+            copy.copy(color) for color in colors
+        )
+
+        # Derived views, computed on first use. Two threads may compute the
+        # same view at the same time, but as the views are immutable and
+        # equal, it does not matter which one ends up cached
+        self._views: "Dict[Tuple[Any, ...], Tuple[Any, ...]]" = {}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(name={self._name!r}, version={self._version}, colors={len(self._colors)})"
+
+    def __len__(self) -> int:
+        return len(self._colors)
+
+    def __iter__(self) -> "Iterator[Color]":
+        return (copy.copy(color) for color in self._colors)
+
+    @property
+    def name(self) -> str:
+        """The name of the palette"""
+        return self._name
+
+    @property
+    def version(self) -> int:
+        """The version of the store in which the snapshot was published"""
+        return self._version
+
+    def colors(self) -> "List[Color]":
+        """Returns the colors of the palette
+
+        Returns:
+            List[Color]: copies of the colors, which can be modified without
+            affecting the snapshot
+        """
+        return list(self)
+
+    def view(self, space: str) -> "Tuple[Any, ...]":
+        """Returns the colors of the palette in the given color space. The
+        result is computed once and cached
+
+        Args:
+            space (str): "hex", "rgb", "hsv", "cmyk" or any other space known
+            to ciris.convert
+
+        Raises:
+            ValueError: if the conversion to the space is not possible
+
+        Returns:
+            Tuple: the colors in the same format as the Color.as_<space>
+            methods return them
+        """
+        key = ("view", space)
+        view = self._views.get(key)
+        if view is not None:
+            return view
+
+        view = _convert_colors(self._colors, space)
+        self._views[key] = view
+
+        return view
+
+    def harmonies(
+        self, rule: str, *, phi: "Optional[int]" = None, space: str = "hex"
+    ) -> "Tuple[Tuple[Any, ...], ...]":
+        """Returns the harmony rule applied to every color of the palette.
+        The result is computed once and cached
+
+        Args:
+            rule (str): "complementary", "split_complementary", "triadic",
+            "tetradic" or "analogous"
+            phi (int, optional): the offset for the split complementary and
+            the analogous rules
+            space (str): the color space of the result, see view()
+
+        Raises:
+            ValueError: if the rule is not supported
+            ValueError: if phi is passed to a rule that does not use it
+            ValueError: if the conversion to the space is not possible
+
+        Returns:
+            Tuple[Tuple, ...]: a tuple per palette color, containing the base
+            color followed by the secondary colors of the rule
+        """
+        key = ("harmonies", rule, phi, space)
+        harmonies = self._views.get(key)
+        if harmonies is not None:
+            return harmonies
+
+        if rule not in HARMONY_RULES:
+            raise ValueError(
+                f"Expected harmony rule to be one of {', '.join(HARMONY_RULES)}, but got {rule!r}"
+            )
+
+        if phi is not None and rule not in PHI_RULES:
+            raise ValueError(f"The {rule} rule does not accept phi")
+
+        kwargs = {} if phi is None else {"phi": phi}
+        harmonies = []
+
+        for color in self._colors:
+            harmony = getattr(color, f"harmony_{rule}")(**kwargs)
+            harmonies.append(
+                _convert_colors(
+                    [
+                        harmony.get_base_color(),
+                        *harmony.get_secondary_colors(),
+                    ],
+                    space,
+                )
+            )
+
+        harmonies = tuple(harmonies)
+        self._views[key] = harmonies
+
+        return harmonies
+
+
+class PaletteStore:
+    def __init__(
+        self, palettes: "Optional[Mapping[str, Iterable[Color]]]" = None
+    ) -> None:
+        """Creates a store of named palettes that can be shared between
+        threads. Reading is lock-free, while the updates are applied
+        atomically, one at a time
+
+        Args:
+            palettes (Mapping[str, Iterable[Color]], optional): the initial
+            palettes
+        """
+        self._lock = threading.Lock()
+        self._version = 0
+
+        # Replaced as a whole on every update, never modified in place
+        self._palettes: "Dict[str, PaletteSnapshot]" = {
+            name: PaletteSnapshot(name, colors)
+            for name, colors in (palettes or {}).items()
+        }
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(palettes={len(self._palettes)}, version={self._version})"
+
+    def __len__(self) -> int:
+        return len(self._palettes)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._palettes
+
+    def __getitem__(self, name: str) -> "PaletteSnapshot":
+        return self._palettes[name]
+
+    @property
+    def version(self) -> int:
+        """The number of updates applied to the store"""
+        return self._version
+
+    def get(
+        self, name: str, default: "Optional[PaletteSnapshot]" = None
+    ) -> "Optional[PaletteSnapshot]":
+        """Returns the current snapshot of a palette
+
+        Args:
+            name (str): the name of the palette
+            default (PaletteSnapshot, optional): the value to return if there
+            is no such palette
+
+        Returns:
+            Optional[PaletteSnapshot]: the snapshot
+        """
+        return self._palettes.get(name, default)
+
+    def names(self) -> "List[str]":
+        """Returns the names of the palettes, sorted alphabetically"""
+        return sorted(self._palettes)
+
+    def snapshot(self) -> "Dict[str, PaletteSnapshot]":
+        """Returns the current snapshots of all the palettes at once. Unlike
+        reading the palettes one by one, this is guaranteed to never mix the
+        palettes from before and after an update
+
+        Returns:
+            Dict[str, PaletteSnapshot]: the snapshots by name
+        """
+        return dict(self._palettes)
+
+    def _publish(
+        self, changes: "Mapping[str, Optional[Iterable[Color]]]"
+    ) -> "Dict[str, PaletteSnapshot]":
+        # Must be called with the lock held
+        version = self._version + 1
+        palettes = dict(self._palettes)
+
+        for name, colors in changes.items():
+            if colors is None:
+                del palettes[name]
+            else:
+                palettes[name] = PaletteSnapshot(name, colors, version)
+
+        self._palettes = palettes
+        self._version = version
+
+        return palettes
+
+    def set(self, name: str, colors: "Iterable[Color]") -> "PaletteSnapshot":
+        """Adds a palette or replaces an existing one
+
+        Args:
+            name (str): the name of the palette
+            colors (Iterable[Color]): the colors. They are copied, so they can
+            be modified afterwards without affecting the store
+
+        Returns:
+            PaletteSnapshot: the published snapshot
+        """
+        with self._lock:
+            return self._publish({name: colors})[name]
+
+    def update(
+        self, name: str, func: "Callable[[List[Color]], Iterable[Color]]"
+    ) -> "PaletteSnapshot":
+        """Atomically replaces a palette with a modified version of it. No
+        other update can happen between reading the palette and publishing
+        the result
+
+        Args:
+            name (str): the name of the palette
+            func (Callable): a function that takes a list of the palette
+            colors (copies that it may modify) and returns the new colors
+
+        Raises:
+            KeyError: if there is no such palette
+
+        Returns:
+            PaletteSnapshot: the published snapshot
+        """
+        with self._lock:
+            colors = func(self._palettes[name].colors())
+            return self._publish({name: colors})[name]
+
+    def delete(self, name: str) -> None:
+        """Removes a palette
+
+        Args:
+            name (str): the name of the palette
+
+        Raises:
+            KeyError: if there is no such palette
+        """
+        with self._lock:
+            if name not in self._palettes:
+                raise KeyError(name)
+
+            self._publish({name: None})
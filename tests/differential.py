@@ -0,0 +1,707 @@
+"""Differential checks of the fast paths against the reference implementation.
+
+Every check runs a whole domain of inputs, the full 8-bit RGB cube or the
+full integer HSV or CMYK grid, through a fast path (a ciris.convert kernel,
+a Color method or the ciris.cvd lookup tables) and through the reference
+implementation, and compares the results. The conversions are compared with
+a frozen copy of the Color formulas kept in this module, the lookup tables
+with the exact formulas. The sweep is split into chunks that are spread
+across worker processes.
+
+test_iris_differential.py sweeps a sample of every domain. The full sweep
+is run with
+
+    python -m tests.differential [--jobs N] [CHECK ...]
+
+or as a part of the test suite, by setting the CIRIS_FULL_SWEEP environment
+variable.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from ciris import Color, convert, cvd
+
+# How many divergences of every check are kept for the report
+MAX_DIVERGENCES = 10
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+@dataclass(frozen=True)
+class Domain:
+    """A set of inputs, addressed by their position"""
+
+    size: int
+    item: Callable[[int], Any]
+
+    # Positions of the inputs that are checked even by the sampled sweeps
+    edge_cases: Tuple[int, ...] = ()
+
+
+def _rgb(index: int) -> Tuple[int, int, int]:
+    return (index >> 16, (index >> 8) & 0xFF, index & 0xFF)
+
+
+def _rgb_index(r: int, g: int, b: int) -> int:
+    return (r << 16) | (g << 8) | b
+
+
+def _hsv(index: int) -> Tuple[int, int, int]:
+    return (index // 10201, index // 101 % 101, index % 101)
+
+
+def _hsv_index(h: int, s: int, v: int) -> int:
+    return h * 10201 + s * 101 + v
+
+
+RGB_CUBE = Domain(
+    1 << 24,
+    _rgb,
+    tuple(
+        _rgb_index(*rgb)
+        for rgb in (
+            (0, 0, 0),
+            (255, 255, 255),
+            (252, 186, 3),  # the "strange color" of the Color tests
+            (255, 0, 255),  # the hue is negative before it is wrapped
+            (255, 0, 1),
+            (1, 0, 0),
+        )
+    ),
+)
+
+HSV_GRID = Domain(
+    361 * 101 * 101,
+    _hsv,
+    tuple(
+        _hsv_index(*hsv)
+        for hsv in (
+            (0, 0, 0),
+            (0, 100, 100),
+            (359, 100, 100),
+            (360, 100, 100),
+            (44, 99, 99),
+        )
+    ),
+)
+
+
+def _cmyk(index: int) -> Tuple[int, int, int, int]:
+    return (
+        index // 1030301,
+        index // 10201 % 101,
+        index // 101 % 101,
+        index % 101,
+    )
+
+
+def _cmyk_index(c: int, m: int, y: int, k: int) -> int:
+    return c * 1030301 + m * 10201 + y * 101 + k
+
+
+CMYK_GRID = Domain(
+    101**4,
+    _cmyk,
+    tuple(
+        _cmyk_index(*cmyk)
+        for cmyk in (
+            (0, 0, 0, 0),
+            (0, 0, 0, 100),
+            (100, 100, 100, 100),
+            (0, 26, 99, 1),  # the "strange color" in CMYK
+            (100, 0, 0, 99),
+        )
+    ),
+)
+
+
+# The reference implementation: the formulas of the Color class as they
+# were before the fast paths were added, frozen here so that the checks do
+# not compare the shared helpers of ciris.color with themselves. Only the
+# fixes that Color has documented since are applied: the hue of the red
+# sector is wrapped into [0..360), a hue of 360 is converted like 0, and
+# black has no color components in CMYK. Saturation and value are integer
+# percentages, like the ones stored by Color (which multiplies them by 0.01)
+
+_HEX_DIGITS = "0123456789ABCDEF"
+
+
+def reference_rgb_to_hsv(rgb: Tuple[float, float, float]) -> Tuple[int, ...]:
+    r_clamp, g_clamp, b_clamp = rgb[0] / 255, rgb[1] / 255, rgb[2] / 255
+
+    c_max = max(r_clamp, g_clamp, b_clamp)
+    c_min = min(r_clamp, g_clamp, b_clamp)
+    delta = c_max - c_min
+
+    if c_max == c_min:
+        hue = 0
+    elif c_max == r_clamp:
+        hue = 60 * (0 + (g_clamp - b_clamp) / delta)
+    elif c_max == g_clamp:
+        hue = 60 * (2 + (b_clamp - r_clamp) / delta)
+    else:
+        hue = 60 * (4 + (r_clamp - g_clamp) / delta)
+
+    saturation = 0 if c_max == 0 else (delta / c_max) * 100
+    value = c_max * 100
+
+    return (
+        int(round(hue)) % 360,
+        int(round(saturation)),
+        int(round(value)),
+    )
+
+
+def reference_hsv_to_rgb(hsv: Tuple[int, int, int]) -> Tuple[int, ...]:
+    h, s, v = hsv[0], hsv[1] * 0.01, hsv[2] * 0.01
+
+    chroma = v * s
+    h_dash = (h % 360) / 60.0
+    x_buf = chroma * (1 - abs(h_dash % 2 - 1))
+
+    sector = int(h_dash)
+    r1, g1, b1 = (
+        (chroma, x_buf, 0),
+        (x_buf, chroma, 0),
+        (0, chroma, x_buf),
+        (0, x_buf, chroma),
+        (x_buf, 0, chroma),
+        (chroma, 0, x_buf),
+    )[sector]
+
+    m = v - chroma
+
+    return (
+        round((r1 + m) * 255),
+        round((g1 + m) * 255),
+        round((b1 + m) * 255),
+    )
+
+
+def reference_rgb_to_cmyk(rgb: Tuple[int, int, int]) -> Tuple[int, ...]:
+    r_dash, g_dash, b_dash = rgb[0] / 255, rgb[1] / 255, rgb[2] / 255
+
+    k = 1 - max(r_dash, g_dash, b_dash)
+    if k == 1:
+        return (0, 0, 0, 100)
+
+    c = (1 - r_dash - k) / (1 - k)
+    m = (1 - g_dash - k) / (1 - k)
+    y = (1 - b_dash - k) / (1 - k)
+
+    return (
+        int(round(c, 2) * 100),
+        int(round(m, 2) * 100),
+        int(round(y, 2) * 100),
+        int(round(k, 2) * 100),
+    )
+
+
+def reference_cmyk_to_rgb(
+    cmyk: Tuple[int, int, int, int]
+) -> Tuple[float, float, float]:
+    # Not rounded, Color.from_cmyk passes the channels to from_rgb as is
+    c, m, y, k = (value * 0.01 for value in cmyk)
+
+    return (
+        255 * (1 - c) * (1 - k),
+        255 * (1 - m) * (1 - k),
+        255 * (1 - y) * (1 - k),
+    )
+
+
+def reference_hex_to_rgb(clr_hex: str) -> Tuple[int, int, int]:
+    digits = clr_hex[1:].upper()
+
+    return tuple(
+        _HEX_DIGITS.index(digits[i]) * 16 + _HEX_DIGITS.index(digits[i + 1])
+        for i in (0, 2, 4)
+    )
+
+
+def reference_rgb_to_hex(rgb: Tuple[int, int, int]) -> str:
+    return "#" + "".join(
+        _HEX_DIGITS[channel // 16] + _HEX_DIGITS[channel % 16]
+        for channel in rgb
+    )
+
+
+def reference_hsv_to_hsl(hsv: Tuple[int, int, int]) -> Tuple[int, ...]:
+    h, s, v = hsv[0], hsv[1] * 0.01, hsv[2] * 0.01
+
+    lightness = v * (1 - s / 2)
+    if lightness == 0 or lightness == 1:
+        saturation = 0
+    else:
+        saturation = (v - lightness) / min(lightness, 1 - lightness)
+
+    return (h, int(round(saturation * 100)), int(round(lightness * 100)))
+
+
+def reference_hsl_to_hsv(hsl: Tuple[int, int, int]) -> Tuple[int, ...]:
+    h, s, l = hsl[0], hsl[1] * 0.01, hsl[2] * 0.01
+
+    value = l + s * min(l, 1 - l)
+    saturation = 0 if value == 0 else 2 * (1 - l / value)
+
+    return (
+        int(round(h)),
+        int(round(saturation * 100)),
+        int(round(value * 100)),
+    )
+
+
+def reference_hsv_to_hwb(hsv: Tuple[int, int, int]) -> Tuple[int, ...]:
+    h, s, v = hsv[0], hsv[1] * 0.01, hsv[2] * 0.01
+
+    return (h, int(round((1 - s) * v * 100)), int(round((1 - v) * 100)))
+
+
+def reference_hwb_to_hsv(hwb: Tuple[int, int, int]) -> Tuple[int, ...]:
+    h, w, b = hwb[0], hwb[1] * 0.01, hwb[2] * 0.01
+
+    # Whiteness and blackness over 100% in total are scaled down, like CSS
+    if w + b >= 1:
+        return (int(round(h)), 0, int(round(w / (w + b) * 100)))
+
+    value = 1 - b
+
+    return (
+        int(round(h)),
+        int(round((1 - w / value) * 100)),
+        int(round(value * 100)),
+    )
+
+
+def _chain(*steps: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def chained(value: Any) -> Any:
+        for step in steps:
+            value = step(value)
+        return value
+
+    return chained
+
+
+def _color_hsv(color: Color) -> Tuple[int, int, int]:
+    # Color stores saturation and value as fractions
+    return (color.h, int(round(color.s * 100)), int(round(color.v * 100)))
+
+
+def _batch(func: Callable[[Any], Any]) -> Callable[[List[Any]], List[Any]]:
+    return lambda values: [func(value) for value in values]
+
+
+def _kernel(src: str, dst: str) -> Callable[[List[Any]], List[Any]]:
+    return lambda values: convert.convert(values, src, dst)
+
+
+@dataclass(frozen=True)
+class Check:
+    """A fast path and the reference implementation it must match"""
+
+    domain: Domain
+    fast: Callable[[List[Any]], List[Any]]
+    reference: Callable[[Any], Any]
+
+    # The maximum difference between the channels of the results
+    tolerance: int = 0
+
+
+_HEX_STRINGS = Domain(
+    RGB_CUBE.size,
+    lambda index: "#{:02X}{:02X}{:02X}".format(*_rgb(index)),
+    RGB_CUBE.edge_cases,
+)
+
+# What every conversion does in terms of the reference formulas, the same
+# steps that Color.from_<src>(...).as_<dst>() takes
+_REFERENCE_CONVERSIONS = {
+    ("rgb", "hsv"): (RGB_CUBE, reference_rgb_to_hsv),
+    ("hex", "hsv"): (
+        _HEX_STRINGS,
+        _chain(reference_hex_to_rgb, reference_rgb_to_hsv),
+    ),
+    ("hex", "rgb"): (_HEX_STRINGS, reference_hex_to_rgb),
+    ("rgb", "hex"): (RGB_CUBE, reference_rgb_to_hex),
+    ("hex", "cmyk"): (
+        _HEX_STRINGS,
+        _chain(
+            reference_hex_to_rgb,
+            reference_rgb_to_hsv,
+            reference_hsv_to_rgb,
+            reference_rgb_to_cmyk,
+        ),
+    ),
+    ("rgb", "cmyk"): (
+        RGB_CUBE,
+        _chain(
+            reference_rgb_to_hsv, reference_hsv_to_rgb, reference_rgb_to_cmyk
+        ),
+    ),
+    ("rgb", "hsl"): (
+        RGB_CUBE,
+        _chain(reference_rgb_to_hsv, reference_hsv_to_hsl),
+    ),
+    ("hsv", "rgb"): (HSV_GRID, reference_hsv_to_rgb),
+    ("hsv", "hex"): (
+        HSV_GRID,
+        _chain(reference_hsv_to_rgb, reference_rgb_to_hex),
+    ),
+    ("hsv", "cmyk"): (
+        HSV_GRID,
+        _chain(reference_hsv_to_rgb, reference_rgb_to_cmyk),
+    ),
+    ("hsv", "hsl"): (HSV_GRID, reference_hsv_to_hsl),
+    ("hsv", "hwb"): (HSV_GRID, reference_hsv_to_hwb),
+    # HSL and HWB values cover the same integer grid as HSV ones
+    ("hsl", "rgb"): (
+        HSV_GRID,
+        _chain(reference_hsl_to_hsv, reference_hsv_to_rgb),
+    ),
+    ("hwb", "rgb"): (
+        HSV_GRID,
+        _chain(reference_hwb_to_hsv, reference_hsv_to_rgb),
+    ),
+    ("cmyk", "hsv"): (
+        CMYK_GRID,
+        _chain(reference_cmyk_to_rgb, reference_rgb_to_hsv),
+    ),
+    ("cmyk", "rgb"): (
+        CMYK_GRID,
+        _chain(
+            reference_cmyk_to_rgb, reference_rgb_to_hsv, reference_hsv_to_rgb
+        ),
+    ),
+    ("cmyk", "hex"): (
+        CMYK_GRID,
+        _chain(
+            reference_cmyk_to_rgb,
+            reference_rgb_to_hsv,
+            reference_hsv_to_rgb,
+            reference_rgb_to_hex,
+        ),
+    ),
+}
+
+# The ciris.convert kernels, including the fused ones
+CHECKS: Dict[str, Check] = {
+    f"{src}-{dst}": Check(domain, _kernel(src, dst), reference)
+    for (src, dst), (domain, reference) in _REFERENCE_CONVERSIONS.items()
+}
+
+# The Color methods, which share their helpers with the kernels
+CHECKS.update(
+    {
+        "color-rgb-hsv": Check(
+            RGB_CUBE,
+            _batch(lambda rgb: _color_hsv(Color.from_rgb(*rgb))),
+            reference_rgb_to_hsv,
+        ),
+        "color-hex-hsv": Check(
+            _HEX_STRINGS,
+            _batch(lambda clr_hex: _color_hsv(Color.from_hex(clr_hex))),
+            _REFERENCE_CONVERSIONS[("hex", "hsv")][1],
+        ),
+        "color-hsv-rgb": Check(
+            HSV_GRID,
+            _batch(lambda hsv: Color(*hsv).as_rgb()),
+            reference_hsv_to_rgb,
+        ),
+        "color-hsv-hex": Check(
+            HSV_GRID,
+            _batch(lambda hsv: Color(*hsv).as_hex()),
+            _REFERENCE_CONVERSIONS[("hsv", "hex")][1],
+        ),
+        "color-hsv-cmyk": Check(
+            HSV_GRID,
+            _batch(lambda hsv: Color(*hsv).as_cmyk()),
+            _REFERENCE_CONVERSIONS[("hsv", "cmyk")][1],
+        ),
+        "color-hsv-hsl": Check(
+            HSV_GRID,
+            _batch(lambda hsv: Color(*hsv).as_hsl()),
+            reference_hsv_to_hsl,
+        ),
+        "color-hsv-hwb": Check(
+            HSV_GRID,
+            _batch(lambda hsv: Color(*hsv).as_hwb()),
+            reference_hsv_to_hwb,
+        ),
+        "color-hsl-hsv": Check(
+            HSV_GRID,
+            _batch(lambda hsl: _color_hsv(Color.from_hsl(*hsl))),
+            reference_hsl_to_hsv,
+        ),
+        "color-hwb-hsv": Check(
+            HSV_GRID,
+            _batch(lambda hwb: _color_hsv(Color.from_hwb(*hwb))),
+            reference_hwb_to_hsv,
+        ),
+        "color-cmyk-hsv": Check(
+            CMYK_GRID,
+            _batch(lambda cmyk: _color_hsv(Color.from_cmyk(*cmyk))),
+            _REFERENCE_CONVERSIONS[("cmyk", "hsv")][1],
+        ),
+    }
+)
+
+# The lookup tables of ciris.cvd are documented to stay within one unit of
+# the exact formulas
+for _kind in cvd.KINDS:
+    CHECKS[f"cvd-simulate-{_kind}"] = Check(
+        RGB_CUBE,
+        lambda values, kind=_kind: cvd.simulate(values, kind),
+        lambda rgb, kind=_kind: cvd.simulate([rgb], kind, lut=False)[0],
+        tolerance=1,
+    )
+    CHECKS[f"cvd-daltonize-{_kind}"] = Check(
+        RGB_CUBE,
+        lambda values, kind=_kind: cvd.daltonize(values, kind),
+        lambda rgb, kind=_kind: cvd.daltonize([rgb], kind, lut=False)[0],
+        tolerance=1,
+    )
+
+
+@dataclass
+class Result:
+    """The outcome of a check over a part of its domain"""
+
+    name: str
+    checked: int = 0
+    fast_time: float = 0.0
+    reference_time: float = 0.0
+    divergence_count: int = 0
+
+    # (input, fast result, reference result) of the first divergences
+    divergences: List[Tuple[Any, Any, Any]] = field(default_factory=list)
+
+    def merge(self, other: "Result") -> "Result":
+        """Adds the outcome of another part of the domain. The parts must be
+        merged in the domain order for the first divergences to be correct
+        """
+        self.checked += other.checked
+        self.fast_time += other.fast_time
+        self.reference_time += other.reference_time
+        self.divergence_count += other.divergence_count
+
+        room = MAX_DIVERGENCES - len(self.divergences)
+        self.divergences.extend(other.divergences[:room])
+
+        return self
+
+
+def _matches(fast: Any, reference: Any, tolerance: int) -> bool:
+    if fast == reference:
+        return True
+
+    if tolerance == 0 or isinstance(fast, str):
+        return False
+
+    return len(fast) == len(reference) and all(
+        abs(a - b) <= tolerance for a, b in zip(fast, reference)
+    )
+
+
+def run_chunk(name: str, indices: Iterable[int]) -> Result:
+    """Runs a check over the inputs at the given positions of its domain
+
+    Args:
+        name (str): the name of the check, one of CHECKS
+        indices (Iterable[int]): the positions of the inputs
+
+    Returns:
+        Result: the outcome
+    """
+    check = CHECKS[name]
+    values = [check.domain.item(index) for index in indices]
+
+    start = time.perf_counter()
+    fast = check.fast(values)
+    fast_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference = [check.reference(value) for value in values]
+    reference_time = time.perf_counter() - start
+
+    result = Result(name, len(values), fast_time, reference_time)
+
+    for value, fast_value, reference_value in zip(values, fast, reference):
+        if not _matches(fast_value, reference_value, check.tolerance):
+            result.divergence_count += 1
+            if len(result.divergences) < MAX_DIVERGENCES:
+                result.divergences.append((value, fast_value, reference_value))
+
+    return result
+
+
+def _chunks(domain: Domain, step: int, chunk_size: int) -> List[Sequence[int]]:
+    chunks: List[Sequence[int]] = []
+
+    # A sampled sweep may skip the edge cases, so they are checked first
+    if step > 1:
+        chunks.append(domain.edge_cases)
+
+    span = chunk_size * step
+    for start in range(0, domain.size, span):
+        chunks.append(range(start, min(start + span, domain.size), step))
+
+    return chunks
+
+
+def sweep(
+    names: Optional[Sequence[str]] = None,
+    *,
+    step: int = 1,
+    jobs: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> List[Result]:
+    """Runs the checks over their whole domains
+
+    Args:
+        names (Sequence[str], optional): the checks to run. Default is all
+        step (int): check only every step-th input (and the edge cases).
+        Default is 1, the exhaustive sweep
+        jobs (int): the number of worker processes. Default is 1, no workers
+        chunk_size (int): how many inputs a worker checks at once
+
+    Returns:
+        List[Result]: the outcome of every check
+    """
+    names = list(CHECKS) if names is None else list(names)
+    for name in names:
+        if name not in CHECKS:
+            raise ValueError(
+                f"Expected check to be one of {', '.join(CHECKS)}, but got {name!r}"
+            )
+
+    tasks = [
+        (name, chunk)
+        for name in names
+        for chunk in _chunks(CHECKS[name].domain, step, chunk_size)
+    ]
+
+    if jobs == 1:
+        outcomes = [run_chunk(name, chunk) for name, chunk in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            outcomes = list(executor.map(run_chunk, *zip(*tasks)))
+
+    results = {name: Result(name) for name in names}
+    for outcome in outcomes:
+        results[outcome.name].merge(outcome)
+
+    return list(results.values())
+
+
+def _rate(count: int, seconds: float) -> str:
+    if seconds <= 0:
+        return "-"
+    return f"{count / seconds / 1e6:.2f}M/s"
+
+
+def format_report(results: Sequence[Result]) -> str:
+    """Formats the outcome of a sweep for humans. The timings are the sums
+    of the times spent by all the workers
+
+    Args:
+        results (Sequence[Result]): the outcome, as returned by sweep()
+
+    Returns:
+        str: the report
+    """
+    width = max((len(result.name) for result in results), default=0)
+    lines = []
+
+    for result in results:
+        status = (
+            "OK"
+            if result.divergence_count == 0
+            else f"{result.divergence_count} DIVERGENCES"
+        )
+        speedup = (
+            f"x{result.reference_time / result.fast_time:.1f}"
+            if result.fast_time > 0
+            else "-"
+        )
+        lines.append(
+            f"{result.name:<{width}}  {result.checked:>9} inputs  "
+            f"fast {result.fast_time:7.2f}s ({_rate(result.checked, result.fast_time)})  "
+            f"reference {result.reference_time:7.2f}s ({_rate(result.checked, result.reference_time)})  "
+            f"{speedup}  {status}"
+        )
+
+        for value, fast, reference in result.divergences:
+            lines.append(
+                f"    {value!r}: fast {fast!r}, reference {reference!r}"
+            )
+
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tests.differential",
+        description="Compares the fast paths of ciris with the reference implementation.",
+    )
+    parser.add_argument(
+        "checks",
+        nargs="*",
+        metavar="CHECK",
+        help=f"the checks to run (default: all). One of {', '.join(CHECKS)}",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="the number of worker processes (default: the number of CPUs)",
+    )
+    parser.add_argument(
+        "--step",
+        type=int,
+        default=1,
+        help="check only every STEP-th input (default: 1, all of them)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"how many inputs a worker checks at once (default: {DEFAULT_CHUNK_SIZE})",
+    )
+    args = parser.parse_args(argv)
+
+    for name in args.checks:
+        if name not in CHECKS:
+            parser.error(f"unknown check {name!r}")
+
+    start = time.perf_counter()
+    results = sweep(
+        args.checks or None,
+        step=args.step,
+        jobs=args.jobs,
+        chunk_size=args.chunk_size,
+    )
+
+    print(format_report(results))
+    print(f"Finished in {time.perf_counter() - start:.1f}s")
+
+    return 1 if any(result.divergence_count for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
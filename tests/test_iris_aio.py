@@ -0,0 +1,150 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from ciris import Color, aio, convert
+
+
+async def _agen(values):
+    for value in values:
+        yield value
+
+
+class TestAio:
+    def test_convert_many(self):
+        """Tests that the batch conversion matches the conversion graph"""
+        values = [(61, 255, 226), (252, 186, 3), (3, 78, 252)]
+
+        result = asyncio.run(
+            aio.convert_many(values, "rgb", "hex", chunk_size=2)
+        )
+
+        assert result == convert.convert(values, "rgb", "hex")
+
+    def test_convert_many_from_hex(self):
+        """Tests the batch conversion of hex strings"""
+        result = asyncio.run(aio.convert_many(["#3dffe2"], "hex", "cmyk"))
+
+        assert result == [(76, 0, 11, 0)]
+
+    def test_convert_many_async_input(self):
+        """Tests that the batch conversion accepts async iterables"""
+        values = [(171, 76, 100)] * 5
+
+        result = asyncio.run(
+            aio.convert_many(_agen(values), "hsv", "hex", chunk_size=2)
+        )
+
+        assert result == ["#3DFFE2"] * 5
+
+    def test_convert_many_executor(self):
+        """Tests that the batch conversion can be offloaded to an executor"""
+        values = [(r, 128, 64) for r in range(256)]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = asyncio.run(
+                aio.convert_many(
+                    values, "rgb", "hsv", chunk_size=16, executor=executor
+                )
+            )
+
+        assert result == convert.convert(values, "rgb", "hsv")
+
+    def test_convert_many_transform(self):
+        """Tests that the transforms of the conversion graph are applied"""
+        values = ["#3DFFE2", "#FCBA03"] * 3
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = asyncio.run(
+                aio.convert_many(
+                    values,
+                    "hex",
+                    "hex",
+                    transform="simulate_deuteranopia",
+                    chunk_size=2,
+                    executor=executor,
+                )
+            )
+
+        assert result == convert.convert(
+            values, "hex", "hex", "simulate_deuteranopia"
+        )
+
+        with pytest.raises(ValueError):
+            aio.iter_convert(values, "hex", "hex", transform="achromatopsia")
+
+    def test_convert_many_bad_space(self):
+        """Tests the error handling of unsupported color spaces"""
+        with pytest.raises(ValueError):
+            asyncio.run(aio.convert_many([], "rgb", "lab"))
+
+    def test_convert_many_bad_value(self):
+        """Tests that errors raised by conversions are propagated"""
+        with pytest.raises(ValueError):
+            asyncio.run(aio.convert_many([(100, 555, -98)], "rgb", "hex"))
+
+    @pytest.mark.parametrize("executor", [False, True])
+    def test_iter_convert_backpressure(self, executor):
+        """Tests that the producer does not run ahead of the consumer further
+        than max_pending chunks"""
+        consumed = []
+
+        def source():
+            for i in range(100):
+                consumed.append(i)
+                yield (i, 0, 0)
+
+        async def take_one(pool):
+            stream = aio.iter_convert(
+                source(),
+                "rgb",
+                "hex",
+                chunk_size=10,
+                max_pending=2,
+                executor=pool,
+            )
+            first = await stream.__anext__()
+            for _ in range(20):
+                await asyncio.sleep(0.01 if pool else 0)
+            await stream.aclose()
+            return first
+
+        if executor:
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                assert asyncio.run(take_one(pool)) == "#000000"
+        else:
+            assert asyncio.run(take_one(None)) == "#000000"
+
+        # A chunk is only read once a slot is free, and the first one is
+        # still being consumed
+        assert len(consumed) == 20
+
+    def test_iter_convert_releases_slots(self):
+        """Tests that the producer keeps going as the chunks are consumed"""
+
+        async def collect():
+            return [
+                value
+                async for value in aio.iter_convert(
+                    ((i, 0, 0) for i in range(256)),
+                    "rgb",
+                    "hex",
+                    chunk_size=3,
+                    max_pending=1,
+                )
+            ]
+
+        assert asyncio.run(collect()) == [f"#{i:02X}0000" for i in range(256)]
+
+    def test_harmonies(self):
+        """Tests that the batch harmonies match the Color API"""
+        colors = [Color.from_rgb(3, 78, 252), Color.from_hsv(171, 76, 100)]
+
+        result = asyncio.run(aio.harmonies(colors, "analogous", phi=40))
+
+        assert result == [c.harmony_analogous(phi=40) for c in colors]
+
+    def test_harmonies_bad_rule(self):
+        """Tests the error handling of unsupported harmony rules"""
+        with pytest.raises(ValueError):
+            asyncio.run(aio.harmonies([], "monochrome"))
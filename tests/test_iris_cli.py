@@ -0,0 +1,203 @@
+import io
+
+import pytest
+from ciris import Color, cli, convert, cvd
+
+
+def _run(capsys, monkeypatch, argv, stdin=""):
+    monkeypatch.setattr("sys.stdin", io.StringIO(stdin))
+    code = cli.main(argv)
+    captured = capsys.readouterr()
+
+    return code, captured.out, captured.err
+
+
+class TestCli:
+    def test_convert_lines(self, capsys, monkeypatch):
+        """Tests the conversion of colors read line by line from stdin"""
+        code, out, _ = _run(
+            capsys, monkeypatch, ["--to", "rgb"], "#3DFFE2\n\n#fcba03\n"
+        )
+
+        assert code == 0
+        assert out == "61,255,226\n252,186,3\n"
+
+    def test_convert_lines_separators(self, capsys, monkeypatch):
+        """Tests that the values may be separated by commas or spaces"""
+        code, out, _ = _run(
+            capsys,
+            monkeypatch,
+            ["--from", "rgb", "--to", "hex"],
+            "61, 255, 226\n252 186 3\n",
+        )
+
+        assert code == 0
+        assert out == "#3DFFE2\n#FCBA03\n"
+
+    def test_convert_csv(self, capsys, monkeypatch):
+        """Tests the conversion of CSV rows"""
+        code, out, _ = _run(
+            capsys,
+            monkeypatch,
+            ["--from", "rgb", "--to", "cmyk", "--format", "csv"],
+            "61,255,226\r\n0,0,0\r\n",
+        )
+
+        assert code == 0
+        assert out == "76,0,11,0\n0,0,0,100\n"
+
+    def test_convert_matches_color(self, capsys, monkeypatch):
+        """Tests that the conversions give the same results as Color"""
+        code, out, _ = _run(
+            capsys, monkeypatch, ["--to", "cmyk"], "#000507\n#0073FB\n"
+        )
+
+        expected = [
+            Color.from_hex(value).as_cmyk() for value in ("#000507", "#0073FB")
+        ]
+        assert code == 0
+        assert out == "".join(
+            ",".join(map(str, cmyk)) + "\n" for cmyk in expected
+        )
+
+    def test_convert_ndjson(self, capsys, monkeypatch):
+        """Tests the conversion of JSON values"""
+        code, out, _ = _run(
+            capsys,
+            monkeypatch,
+            ["--to", "hsv", "--format", "ndjson"],
+            '"#3DFFE2"\n"#FCBA03"\n',
+        )
+
+        assert code == 0
+        assert out == "[171, 76, 100]\n[44, 99, 99]\n"
+
+    def test_harmony(self, capsys, monkeypatch):
+        """Tests that the harmony colors match the Color API"""
+        code, out, _ = _run(
+            capsys,
+            monkeypatch,
+            ["--harmony", "analogous", "--phi", "40"],
+            "#3DFFE2\n",
+        )
+        rule = Color.from_hex("#3DFFE2").harmony_analogous(phi=40)
+        expected = [rule.get_base_color(), *rule.get_secondary_colors()]
+
+        assert code == 0
+        assert out.split() == [color.as_hex() for color in expected]
+
+    def test_transform(self, capsys, monkeypatch):
+        """Tests that the transforms are applied to every output color"""
+        code, out, _ = _run(
+            capsys,
+            monkeypatch,
+            ["--to", "rgb", "--transform", "simulate_protanopia"],
+            "#FF0000\n#3DFFE2\n",
+        )
+        expected = cvd.simulate([(255, 0, 0), (61, 255, 226)], "protanopia")
+
+        assert code == 0
+        assert out == "".join(f"{r},{g},{b}\n" for r, g, b in expected)
+
+        code, out, _ = _run(
+            capsys,
+            monkeypatch,
+            [
+                "--harmony",
+                "complementary",
+                "--transform",
+                "daltonize_protanopia",
+            ],
+            "#FF0000\n",
+        )
+
+        assert code == 0
+        assert out.split() == [
+            convert.convert([color], "hex", "hex", "daltonize_protanopia")[0]
+            for color in ("#FF0000", "#00FFFF")
+        ]
+
+    def test_files(self, capsys, monkeypatch, tmp_path):
+        """Tests that the files are read in order, in chunks"""
+        first = tmp_path / "first.txt"
+        second = tmp_path / "second.txt"
+        first.write_text("".join(f"{r},0,0\n" for r in range(256)))
+        second.write_text("0,0,255\n")
+
+        code, out, _ = _run(
+            capsys,
+            monkeypatch,
+            ["-f", "rgb", "--chunk-size", "10", str(first), str(second)],
+        )
+
+        assert code == 0
+        assert out.split() == [f"#{r:02X}0000" for r in range(256)] + [
+            "#0000FF"
+        ]
+
+    def test_jobs(self, capsys, monkeypatch, tmp_path):
+        """Tests that the parallel processing keeps the input order"""
+        path = tmp_path / "colors.txt"
+        path.write_text("".join(f"{r},128,64\n" for r in range(256)))
+
+        _, expected, _ = _run(capsys, monkeypatch, ["-f", "rgb", str(path)])
+        code, out, _ = _run(
+            capsys,
+            monkeypatch,
+            ["-f", "rgb", "-j", "2", "--chunk-size", "16", str(path)],
+        )
+
+        assert code == 0
+        assert out == expected
+
+    def test_bad_value(self, capsys, monkeypatch):
+        """Tests that the invalid colors are reported with their line"""
+        code, _, err = _run(
+            capsys,
+            monkeypatch,
+            ["--from", "rgb"],
+            "61,255,226\n100,555,-98\n",
+        )
+
+        assert code == 1
+        assert "<stdin>:2:" in err
+
+    def test_bad_hex(self, capsys, monkeypatch):
+        """Tests that the input is checked even if it is not converted"""
+        for stdin in ("garbage\n", "#-1-1-1\n"):
+            code, out, err = _run(capsys, monkeypatch, [], stdin)
+
+            assert code == 1
+            assert out == ""
+            assert "<stdin>:1:" in err
+
+        code, _, err = _run(
+            capsys, monkeypatch, ["--to", "rgb"], "#3DFFE2\n#-1-1-1\n"
+        )
+
+        assert code == 1
+        assert "<stdin>:2:" in err
+
+    def test_bad_arity(self, capsys, monkeypatch):
+        """Tests that a color with missing values is reported clearly"""
+        code, _, err = _run(capsys, monkeypatch, ["--from", "rgb"], "1,2\n")
+
+        assert code == 1
+        assert "<stdin>:1: Expected 3 values (R, G, B), but got (1, 2)" in err
+
+    def test_missing_file(self, capsys, monkeypatch, tmp_path):
+        """Tests the error handling of files that can not be read"""
+        code, _, err = _run(capsys, monkeypatch, [str(tmp_path / "nope")])
+
+        assert code == 1
+        assert "nope" in err
+
+    def test_bad_arguments(self, capsys, monkeypatch):
+        """Tests the error handling of invalid arguments"""
+        for argv in (
+            ["--to", "lab"],
+            ["--harmony", "triadic", "--phi", "40"],
+            ["--jobs", "0"],
+        ):
+            with pytest.raises(SystemExit):
+                _run(capsys, monkeypatch, argv)
@@ -0,0 +1,162 @@
+import math
+import random
+
+import pytest
+from ciris import Color
+from ciris.cluster import ColorClusters, _rgb_to_lab, dedupe
+
+
+class TestColorClusters:
+    def test_dedupe(self):
+        """Tests merging the colors within the tolerance"""
+        colors = [
+            Color.from_rgb(10, 10, 10),
+            Color.from_rgb(11, 10, 10),
+            Color.from_rgb(200, 0, 0),
+            Color.from_rgb(12, 11, 10),
+        ]
+        # Color stores HSV values, so the last color is (13, 12, 11) in RGB
+        representatives, mapping = dedupe(colors, 4)
+
+        assert mapping == [0, 0, 1, 0]
+        assert representatives == [colors[0], colors[2]]
+        assert representatives[0] is not colors[0]
+
+    def test_exact_duplicates(self):
+        """Tests that a zero tolerance only merges equal colors"""
+        colors = [Color.from_rgb(10, 10, 10), Color.from_rgb(11, 10, 10)] * 2
+        representatives, mapping = dedupe(colors, 0)
+
+        assert mapping == [0, 1, 0, 1]
+        assert len(representatives) == 2
+
+    def test_closest_representative(self):
+        """Tests that a color joins the closest cluster, not the first one"""
+        clusters = ColorClusters(10)
+
+        assert clusters.add_rgb(0, 0, 0) == 0
+        assert clusters.add_rgb(15, 0, 0) == 1
+        assert clusters.add_rgb(9, 0, 0) == 1
+        assert clusters.add_rgb(7, 0, 0) == 0
+        assert clusters.counts == [2, 2]
+
+    def test_hsv_grays(self):
+        """Tests that the HSV distance ignores the hue of the shades of gray"""
+        representatives, mapping = dedupe(
+            [Color(0, 0, 50), Color(180, 0, 50), Color(180, 100, 50)], 1, "hsv"
+        )
+
+        assert mapping == [0, 0, 1]
+        assert len(representatives) == 2
+
+    def test_hsv_hue_wraps(self):
+        """Tests that the hues on both sides of 0 are close"""
+        _, mapping = dedupe(
+            [Color(359, 100, 100), Color(1, 100, 100)], 4, "hsv"
+        )
+
+        assert mapping == [0, 0]
+
+    def test_lab(self):
+        """Tests the CIE76 color difference"""
+        assert _rgb_to_lab(255, 255, 255) == pytest.approx(
+            (100, 0, 0), abs=1e-3
+        )
+        assert _rgb_to_lab(255, 0, 0) == pytest.approx(
+            (53.24, 80.09, 67.20), abs=0.01
+        )
+
+        clusters = ColorClusters(2.3, "lab")
+        assert clusters.add_rgb(0, 0, 100) == 0
+        assert clusters.add_rgb(0, 0, 103) == 0
+        assert clusters.add_rgb(0, 0, 106) == 1
+
+    def test_update_pixels(self):
+        """Tests that pixels are clustered like the colors"""
+        random.seed(3)
+        pixels = [
+            tuple(random.randrange(0, 256, 16) for _ in range(3))
+            for _ in range(500)
+        ]
+        buffer = bytes(channel for pixel in pixels for channel in pixel)
+
+        for space in ("rgb", "hsv", "lab"):
+            clusters = ColorClusters(20, space)
+            mapping = clusters.update_pixels(buffer)
+
+            expected = ColorClusters(20, space)
+            assert list(mapping) == [
+                expected.add_rgb(*pixel) for pixel in pixels
+            ]
+            assert clusters.counts == expected.counts
+            assert sum(clusters.counts) == len(pixels)
+
+    def test_streaming(self):
+        """Tests that processing the pixels in chunks gives the same result"""
+        random.seed(5)
+        buffer = bytes(random.randrange(256) for _ in range(3 * 3000))
+
+        whole = ColorClusters(30)
+        mapping = list(whole.update_pixels(buffer))
+
+        chunked = ColorClusters(30)
+        chunked_mapping = []
+        for start in range(0, len(buffer), 3 * 700):
+            chunk = buffer[start : start + 3 * 700]
+            chunked_mapping.extend(chunked.update_pixels(chunk))
+
+        assert chunked_mapping == mapping
+        assert chunked.counts == whole.counts
+
+    def test_tolerance_guarantees(self):
+        """Tests that the colors are within the tolerance from their
+        representatives, and the representatives are further apart"""
+        random.seed(7)
+        pixels = [
+            tuple(random.randrange(256) for _ in range(3)) for _ in range(2000)
+        ]
+
+        for space, tolerance in (("rgb", 40), ("hsv", 15), ("lab", 12)):
+            clusters = ColorClusters(tolerance, space)
+            mapping = [clusters.add_rgb(*pixel) for pixel in pixels]
+            points = clusters._points
+
+            # Every distinct pixel is cached with the cluster it was
+            # assigned to, so the point is computed the same way
+            for pixel, cluster in zip(pixels, mapping):
+                single = ColorClusters(tolerance, space)
+                single.add_rgb(*pixel)
+                assert (
+                    math.dist(single._points[0], points[cluster]) <= tolerance
+                )
+
+            for i, first in enumerate(points):
+                for second in points[i + 1 :]:
+                    assert math.dist(first, second) > tolerance
+
+    def test_representatives_are_copies(self):
+        """Tests that modifying the representatives does not affect the
+        clusters"""
+        clusters = ColorClusters(5)
+        clusters.add(Color(100, 50, 50))
+        clusters.representatives[0].invert()
+
+        assert clusters.representatives == [Color(100, 50, 50)]
+        assert (
+            repr(clusters)
+            == "ColorClusters(tolerance=5, space='rgb', clusters=1)"
+        )
+
+    def test_errors(self):
+        """Tests the invalid arguments"""
+        with pytest.raises(ValueError):
+            ColorClusters(-1)
+
+        with pytest.raises(ValueError):
+            ColorClusters(1, "cmyk")
+
+        with pytest.raises(ValueError):
+            ColorClusters(1).add_rgb(256, 0, 0)
+
+        with pytest.raises(ValueError):
+            ColorClusters(1).update_pixels(b"\x00\x00")
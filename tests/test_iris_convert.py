@@ -0,0 +1,248 @@
+import pytest
+from ciris import Color, convert, cvd
+
+SAMPLE_RGB = [
+    (61, 255, 226),
+    (252, 186, 3),
+    (3, 78, 252),
+    (255, 0, 255),
+    (0, 0, 0),
+    (255, 255, 255),
+    (128, 128, 128),
+]
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    """Isolates the changes made to the conversion graph by a test"""
+    kernels = {src: dict(edges) for src, edges in convert._KERNELS.items()}
+
+    monkeypatch.setattr(convert, "_KERNELS", kernels)
+    monkeypatch.setattr(convert, "_TRANSFORMS", dict(convert._TRANSFORMS))
+    monkeypatch.setattr(convert, "_CONVERTERS", {})
+
+
+class TestConvert:
+    def test_find_path(self):
+        """Tests that the cheapest path is picked, including fused kernels"""
+        assert convert.find_path("hex", "hsv") == ["hex", "rgb", "hsv"]
+        assert convert.find_path("hex", "cmyk") == ["hex", "cmyk"]
+        assert convert.find_path("cmyk", "hsv") == ["cmyk", "hsv"]
+        assert convert.find_path("cmyk", "hex") == ["cmyk", "rgb", "hex"]
+        assert convert.find_path("hsv", "hex") == ["hsv", "rgb", "hex"]
+
+    def test_convert_to_hsv_matches_color(self):
+        """Tests that the conversions to HSV match the Color initializers"""
+        hex_strings = [Color.from_rgb(*rgb).as_hex() for rgb in SAMPLE_RGB]
+        cmyk = [(76, 0, 11, 0), (0, 26, 99, 1), (15, 0, 45, 2), (0, 0, 0, 100)]
+
+        for h, s, v in convert.convert(SAMPLE_RGB, "rgb", "hsv"):
+            assert Color(h, s, v) in [
+                Color.from_rgb(*rgb) for rgb in SAMPLE_RGB
+            ]
+
+        assert [
+            Color(*hsv) for hsv in convert.convert(hex_strings, "hex", "hsv")
+        ] == [Color.from_hex(value) for value in hex_strings]
+        assert [
+            Color(*hsv) for hsv in convert.convert(cmyk, "cmyk", "hsv")
+        ] == [Color.from_cmyk(*value) for value in cmyk]
+
+    def test_convert_from_hsv_matches_color(self):
+        """Tests that the conversions from HSV match the Color methods"""
+        hsv = [(171, 76, 100), (42, 99, 99), (0, 0, 0), (360, 100, 100)]
+        colors = [Color(*value) for value in hsv]
+
+        assert convert.convert(hsv, "hsv", "rgb") == [
+            c.as_rgb() for c in colors
+        ]
+        assert convert.convert(hsv, "hsv", "hex") == [
+            c.as_hex() for c in colors
+        ]
+        assert convert.convert(hsv, "hsv", "cmyk") == [
+            c.as_cmyk() for c in colors
+        ]
+
+    def test_convert_direct(self):
+        """Tests the fused kernels that skip the intermediate tuples"""
+        assert convert.convert(["#3dffe2", "#000000"], "hex", "cmyk") == [
+            (76, 0, 11, 0),
+            (0, 0, 0, 100),
+        ]
+        assert convert.convert([(252, 186, 3)], "rgb", "hex") == ["#FCBA03"]
+        assert convert.convert([(0, 26, 99, 1)], "cmyk", "rgb") == [
+            (252, 186, 3)
+        ]
+
+    def test_convert_cmyk_matches_color(self):
+        """Tests that the CMYK conversions round the color to the integer
+        HSV values, like Color does"""
+        assert convert.convert(["#000507"], "hex", "cmyk") == [
+            Color.from_hex("#000507").as_cmyk()
+        ]
+        assert convert.convert([(1, 0, 0), (0, 5, 7)], "rgb", "cmyk") == [
+            Color.from_rgb(1, 0, 0).as_cmyk(),
+            Color.from_rgb(0, 5, 7).as_cmyk(),
+        ]
+
+        cmyk = [(0, 26, 99, 1), (3, 97, 41, 88), (100, 0, 1, 99)]
+        assert convert.convert(cmyk, "cmyk", "rgb") == [
+            Color.from_cmyk(*value).as_rgb() for value in cmyk
+        ]
+        assert convert.convert(cmyk, "cmyk", "hex") == [
+            Color.from_cmyk(*value).as_hex() for value in cmyk
+        ]
+
+    def test_convert_hex_rgb_is_exact(self):
+        """Tests that hex and RGB are converted without rounding the color to
+        the integer HSV values, which changes a channel by up to 3 units"""
+        rgb = [(12, 11, 10), (0, 115, 251), (255, 1, 128)]
+        hex_strings = convert.convert(rgb, "rgb", "hex")
+
+        assert hex_strings == ["#0C0B0A", "#0073FB", "#FF0180"]
+        assert convert.convert(hex_strings, "hex", "rgb") == rgb
+
+        # (0, 115, 251) is the worst case of the whole RGB cube
+        assert Color.from_rgb(0, 115, 251).as_rgb() == (0, 112, 250)
+
+        for index in range(0, 1 << 24, 4099):
+            value = (index >> 16, (index >> 8) & 0xFF, index & 0xFF)
+            round_trip = Color.from_rgb(*value).as_rgb()
+
+            assert max(abs(a - b) for a, b in zip(value, round_trip)) <= 3
+
+    def test_convert_hsl_hwb(self):
+        """Tests that HSL and HWB are converted directly from and to HSV"""
+        hsl = [(171, 100, 62), (0, 0, 0), (44, 98, 50)]
+
+        assert convert.find_path("hsl", "hwb") == ["hsl", "hsv", "hwb"]
+        assert convert.convert(hsl, "hsl", "rgb") == [
+            Color.from_hsl(*value).as_rgb() for value in hsl
+        ]
+        assert convert.convert(["#3DFFE2"], "hex", "hwb") == [(171, 24, 0)]
+
+    def test_convert_same_space(self):
+        """Tests that converting to the same space returns the colors as is,
+        once they are checked"""
+        assert convert.convert([(1, 2, 3)], "rgb", "rgb") == [(1, 2, 3)]
+        assert convert.convert(["#3dffe2"], "hex", "hex") == ["#3dffe2"]
+
+        for space, value in (
+            ("hex", "garbage"),
+            ("rgb", (1, 2, 300)),
+            ("hsv", (1, 2)),
+            ("cmyk", (0, 0, 0, 101)),
+        ):
+            with pytest.raises(ValueError):
+                convert.convert([value], space, space)
+
+    def test_convert_bad_space(self):
+        """Tests the error handling of unknown color spaces"""
+        with pytest.raises(ValueError):
+            convert.convert([(1, 2, 3)], "rgb", "lab")
+
+    def test_convert_bad_value(self):
+        """Tests the error handling of colors out of range"""
+        with pytest.raises(ValueError):
+            convert.convert([(100, 555, -98)], "rgb", "hsv")
+
+        with pytest.raises(ValueError):
+            convert.convert(["#FFFFFF00"], "hex", "rgb")
+
+    @pytest.mark.parametrize(
+        "clr_hex", ["#-1-1-1", "#+f+f+f", "# f f f", "#0_0_00", "#GGGGGG"]
+    )
+    def test_convert_bad_hex(self, clr_hex):
+        """Tests that a hex color must have exactly six hex digits, like in
+        Color.from_hex()"""
+        with pytest.raises(ValueError):
+            Color.from_hex(clr_hex)
+
+        for dst in ("rgb", "hsv", "cmyk"):
+            with pytest.raises(ValueError):
+                convert.convert([clr_hex], "hex", dst)
+
+    def test_convert_bad_arity(self):
+        """Tests the error handling of colors with a wrong number of values"""
+        with pytest.raises(ValueError, match=r"Expected 3 values \(R, G, B\)"):
+            convert.convert([(1, 2)], "rgb", "hex")
+
+        with pytest.raises(ValueError, match="Expected 4 values"):
+            convert.convert([(1, 2, 3)], "cmyk", "hsv")
+
+        with pytest.raises(ValueError, match="Expected 3 values"):
+            convert.convert([5], "hsv", "hsl")
+
+    def test_convert_transform(self):
+        """Tests that the color vision deficiency transforms are applied in
+        RGB, between the source and the target space"""
+        values = [(171, 76, 100), (44, 99, 99)]
+        rgb = convert.convert(values, "hsv", "rgb")
+
+        for kind in cvd.KINDS:
+            simulated = cvd.simulate(rgb, kind)
+            assert (
+                convert.convert(values, "hsv", "rgb", f"simulate_{kind}")
+                == simulated
+            )
+            assert convert.convert(
+                values, "hsv", "hex", f"simulate_{kind}"
+            ) == convert.convert(simulated, "rgb", "hex")
+
+            daltonized = cvd.daltonize(rgb, kind)
+            assert (
+                convert.convert(rgb, "rgb", "rgb", f"daltonize_{kind}")
+                == daltonized
+            )
+
+    def test_convert_transform_bad_value(self):
+        """Tests that the colors are checked before they are transformed"""
+        with pytest.raises(ValueError):
+            convert.convert([(0, 0, 300)], "rgb", "hex", "simulate_protanopia")
+
+        with pytest.raises(ValueError):
+            convert.convert(["#-1-1-1"], "hex", "hex", "daltonize_tritanopia")
+
+        with pytest.raises(ValueError):
+            convert.convert([(0, 0, 0)], "rgb", "hex", "achromatopsia")
+
+    def test_register_transform(self, graph):
+        """Tests that new transforms can be applied in any space"""
+        convert.register_transform("flatten", "hsv", lambda hsv: (0, 0, 100))
+
+        assert "flatten" in convert.transforms()
+        assert convert.convert(["#3DFFE2"], "hex", "rgb", "flatten") == [
+            (255, 255, 255)
+        ]
+
+        convert.register_transform("flatten", "rgb", lambda rgb: (0, 0, 0))
+        assert convert.convert(["#3DFFE2"], "hex", "rgb", "flatten") == [
+            (0, 0, 0)
+        ]
+
+    def test_register_kernel(self, graph):
+        """Tests that new spaces are reachable through the existing ones"""
+        convert.register_kernel("rgb", "gray", lambda rgb: (sum(rgb) // 3,))
+
+        assert "gray" in convert.spaces()
+        assert convert.find_path("hex", "gray") == ["hex", "rgb", "gray"]
+        assert convert.convert(["#3DFFE2"], "hex", "gray") == [(180,)]
+
+    def test_register_fused_kernel(self, graph):
+        """Tests that a cheaper direct kernel replaces the chain"""
+        convert.register_kernel("hex", "hsv", lambda value: (0, 0, 0), 0.5)
+
+        assert convert.find_path("hex", "hsv") == ["hex", "hsv"]
+        assert convert.convert(["#3DFFE2"], "hex", "hsv") == [(0, 0, 0)]
+
+    def test_no_path(self, graph):
+        """Tests the error handling of spaces that are not connected"""
+        convert.register_space("lab")
+
+        with pytest.raises(ValueError):
+            convert.find_path("rgb", "lab")
+
+    def test_register_kernel_bad_cost(self, graph):
+        """Tests the error handling of a non-positive cost"""
+        with pytest.raises(ValueError):
+            convert.register_kernel("rgb", "hsv", lambda value: value, 0)
@@ -77,6 +77,43 @@ class TestColor:
         with pytest.raises(ValueError):
             c = Color.from_cmyk(c, m, y, k)
 
+    def test_init_from_hsl(self):
+        """Tests the class' initialization from HSL"""
+        h, s, l = (171, 100, 62)
+
+        c = Color.from_hsl(h, s, l)
+
+        assert c.as_hsv() == (171, 76, 100)
+
+    def test_init_from_hsl_bad_values(self):
+        """Tests the error handling of HSL initiator if HSL values are bad"""
+        h, s, l = (10000, -99, 1939)
+
+        with pytest.raises(ValueError):
+            c = Color.from_hsl(h, s, l)
+
+    def test_init_from_hwb(self):
+        """Tests the class' initialization from HWB"""
+        h, w, b = (171, 24, 0)
+
+        c = Color.from_hwb(h, w, b)
+
+        assert c.as_hsv() == (171, 76, 100)
+
+    def test_init_from_hwb_gray(self):
+        """Tests that whiteness and blackness adding up to more than 100
+        result in a shade of gray"""
+        c = Color.from_hwb(171, 60, 60)
+
+        assert c.as_rgb() == (128, 128, 128)
+
+    def test_init_from_hwb_bad_values(self):
+        """Tests the error handling of HWB initiator if HWB values are bad"""
+        h, w, b = (171, 101, -1)
+
+        with pytest.raises(ValueError):
+            c = Color.from_hwb(h, w, b)
+
     def test_color_as_hsv(self):
         """Tests the conversion to HSV"""
         h, s, v = (171, 76, 100)
@@ -124,6 +161,25 @@ class TestColor:
         assert y == 11
         assert k == 0
 
+    def test_color_as_hsl(self):
+        """Tests the conversion to HSL"""
+        h, s, v = (171, 76, 100)
+
+        c = Color.from_hsv(h, s, v)
+
+        assert c.as_hsl() == (171, 100, 62)
+        assert Color(0, 0, 0).as_hsl() == (0, 0, 0)
+        assert Color(0, 0, 100).as_hsl() == (0, 0, 100)
+
+    def test_color_as_hwb(self):
+        """Tests the conversion to HWB"""
+        h, s, v = (171, 76, 100)
+
+        c = Color.from_hsv(h, s, v)
+
+        assert c.as_hwb() == (171, 24, 0)
+        assert Color(0, 0, 0).as_hwb() == (0, 0, 100)
+
     def test_color_hue_shift_positive(self):
         """Tests the correctness of positive hue shift"""
         h, s, v = (171, 76, 100)
@@ -255,6 +311,22 @@ class TestColor:
         assert y == 99
         assert k == 1
 
+    def test_init_from_rgb_negative_hue(self):
+        """Tests the colors whose hue is computed as a negative angle (the red
+        sector wraps around 0 degrees)"""
+        c = Color.from_rgb(255, 0, 255)
+        c1 = Color.from_rgb(255, 0, 10)
+
+        assert c.h == 300
+        assert c.as_hex() == "#FF00FF"
+        assert c1.h == 358
+
+    def test_color_as_rgb_full_turn(self):
+        """Tests the conversion to RGB if the hue is 360 degrees"""
+        c = Color.from_hsv(360, 100, 100)
+
+        assert c.as_rgb() == (255, 0, 0)
+
     def test_color_equality(self):
         """Tests whether the comparison between two objects works correctly"""
         c1 = Color.from_hsv(100, 50, 50)
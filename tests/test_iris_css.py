@@ -0,0 +1,132 @@
+import pytest
+from ciris import css
+
+
+class TestCss:
+    def test_parse_color(self):
+        """Tests parsing the functional notations and hex colors"""
+        assert css.parse_color("rgb(61, 255, 226)") == (
+            "rgb",
+            (61, 255, 226),
+            None,
+        )
+        assert css.parse_color("rgb(100% 0% 50%)") == (
+            "rgb",
+            (255, 0, 128),
+            None,
+        )
+        assert css.parse_color("hsl(171deg 100% 62%)") == (
+            "hsl",
+            (171, 100, 62),
+            None,
+        )
+        assert css.parse_color(" hwb(171 24% 0%) ") == (
+            "hwb",
+            (171, 24, 0),
+            None,
+        )
+        assert css.parse_color("#3dffe2") == ("hex", "#3DFFE2", None)
+        assert css.parse_color("#fff") == ("hex", "#FFFFFF", None)
+
+    def test_parse_color_alpha(self):
+        """Tests parsing the alpha channel in both syntaxes"""
+        assert css.parse_color("rgba(61, 255, 226, 0.5)")[2] == 0.5
+        assert css.parse_color("rgb(61 255 226 / 50%)")[2] == 0.5
+        assert css.parse_color("hsla(171, 100%, 62%, 1)")[2] == 1
+        assert css.parse_color("#3DFFE280")[1:] == ("#3DFFE2", 0.502)
+
+    def test_parse_color_hue_units(self):
+        """Tests that the hue angles are converted to degrees"""
+        assert css.parse_color("hsl(0.5turn 50% 50%)")[1] == (180, 50, 50)
+        assert css.parse_color("hsl(200grad 50% 50%)")[1] == (180, 50, 50)
+        assert css.parse_color("hsl(-90 50% 50%)")[1] == (270, 50, 50)
+        assert css.parse_color("hwb(none 0% 0%)")[1] == (0, 0, 0)
+
+    def test_parse_color_clamp(self):
+        """Tests that the values out of range are clamped, like CSS does"""
+        assert css.parse_color("rgb(300 -5 0)")[1] == (255, 0, 0)
+        assert css.parse_color("hsl(0 120% 50% / 2)")[1:] == ((0, 100, 50), 1)
+
+    def test_parse_color_bad_values(self):
+        """Tests the error handling of invalid colors"""
+        for value in (
+            "rgb(1 2)",
+            "rgb(1deg 2 3)",
+            "hsl(10% 50% 50%)",
+            "cmyk(1 2 3 4)",
+            "#12345",
+            "red",
+        ):
+            with pytest.raises(ValueError):
+                css.parse_color(value)
+
+    def test_format_color(self):
+        """Tests formatting the colors in the CSS notations"""
+        assert css.format_color("rgb", (61, 255, 226)) == "rgb(61 255 226)"
+        assert (
+            css.format_color("hsl", (171, 100, 62.5)) == "hsl(171 100% 62.5%)"
+        )
+        assert css.format_color("hwb", (171, 24, 0), 0.5) == (
+            "hwb(171 24% 0% / 0.5)"
+        )
+        assert css.format_color("hex", "#3DFFE2", 0.5) == "#3DFFE280"
+
+        with pytest.raises(ValueError):
+            css.format_color("cmyk", (76, 0, 11, 0))
+
+    def test_round_trip(self):
+        """Tests that formatted colors are parsed back to the same values"""
+        for space, value in (
+            ("rgb", (61, 255, 226)),
+            ("hsl", (171, 100, 62)),
+            ("hwb", (171, 24, 0)),
+        ):
+            text = css.format_color(space, value, 0.25)
+
+            assert css.parse_color(text) == (space, value, 0.25)
+
+    def test_iter_colors(self):
+        """Tests finding the colors in a stylesheet"""
+        stylesheet = (
+            "/* color: #fff */\n"
+            "#add, a:hover #fed { color: #3DFFE2; content: 'rgb(1 2 3)' }\n"
+            ".x{fill:hwb(0 0% 0%);stroke:rgb(var(--x) 0 0);border:1px solid #000}"
+        )
+
+        colors = list(css.iter_colors(stylesheet))
+
+        assert [stylesheet[start:end] for start, end, *_ in colors] == [
+            "#3DFFE2",
+            "hwb(0 0% 0%)",
+            "#000",
+        ]
+        assert colors[1][2:] == ("hwb", (0, 0, 0), None)
+
+    def test_convert_css(self):
+        """Tests rewriting the colors of a stylesheet in another notation"""
+        stylesheet = "a { color: #3DFFE2; background: rgba(252, 186, 3, .5) }"
+
+        assert css.convert_css(stylesheet, "hsl") == (
+            "a { color: hsl(171 100% 62%); background: hsl(44 98% 50% / 0.5) }"
+        )
+        assert css.convert_css(stylesheet, "hex") == (
+            "a { color: #3DFFE2; background: #FCBA0380 }"
+        )
+
+    def test_convert_css_urls(self):
+        """Tests that the fragments of url() references are not converted"""
+        stylesheet = (
+            ".a { filter: url(#fade); mask: URL( #beef ); fill: #cafe }\n"
+            ".b { background: url(img.png#fff) #fff }"
+        )
+
+        assert css.convert_css(stylesheet, "rgb") == (
+            ".a { filter: url(#fade); mask: URL( #beef ); "
+            "fill: rgb(204 170 255 / 0.93) }\n"
+            ".b { background: url(img.png#fff) rgb(255 255 255) }"
+        )
+
+    def test_convert_css_bad_space(self):
+        """Tests the error handling of spaces without a CSS notation"""
+        with pytest.raises(ValueError):
+            css.convert_css("a { color: #fff }", "cmyk")
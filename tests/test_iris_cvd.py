@@ -0,0 +1,142 @@
+import pytest
+from ciris import Color, cvd
+
+
+class TestCvd:
+    def test_simulate(self):
+        """Tests that the simulation of dichromacy merges red and green"""
+        red, green = cvd.simulate([(255, 0, 0), (0, 255, 0)], "protanopia")
+
+        assert red[0] - red[1] < 40
+        assert green[0] - green[1] < 40
+
+    def test_simulate_keeps_gray(self):
+        """Tests that the simulation does not change the shades of gray"""
+        grays = [(v, v, v) for v in (0, 64, 128, 255)]
+
+        for kind in cvd.KINDS:
+            for simulated, gray in zip(cvd.simulate(grays, kind), grays):
+                assert max(abs(a - b) for a, b in zip(simulated, gray)) <= 1
+
+    def test_simulate_severity_zero(self):
+        """Tests that zero severity corresponds to normal vision"""
+        values = [(252, 186, 3), (3, 78, 252)]
+
+        simulated = cvd.simulate(values, "tritanopia", severity=0.0, lut=False)
+
+        assert simulated == values
+
+    def test_simulate_lut(self):
+        """Tests that the lookup tables are within one unit of the exact formula"""
+        steps = range(0, 256, 15)
+        values = [(r, g, b) for r in steps for g in steps for b in steps]
+
+        exact = cvd.simulate(values, "deuteranopia", lut=False)
+        fast = cvd.simulate(values, "deuteranopia")
+
+        for a, b in zip(exact, fast):
+            assert max(abs(x - y) for x, y in zip(a, b)) <= 1
+
+    def test_simulate_pixels(self):
+        """Tests that pixel buffers are transformed like RGB tuples"""
+        values = [(255, 0, 0), (0, 255, 0), (255, 0, 0)]
+        pixels = bytes(channel for rgb in values for channel in rgb)
+
+        result = cvd.simulate_pixels(pixels, "protanopia")
+
+        expected = cvd.simulate(values, "protanopia")
+        assert result == bytearray(ch for rgb in expected for ch in rgb)
+
+    def test_daltonize(self):
+        """Tests that daltonization keeps the grays and shifts the colors
+        that are lost to the deficiency"""
+        gray, red = cvd.daltonize([(128, 128, 128), (255, 0, 0)], "protanopia")
+
+        assert max(abs(a - 128) for a in gray) <= 1
+        assert red != (255, 0, 0)
+        assert red[2] > 0
+
+    def test_color_simulate_cvd(self):
+        """Tests that the Color method matches the batch function"""
+        c = Color.from_rgb(252, 186, 3)
+
+        expected = cvd.simulate([c.as_rgb()], "protanopia", lut=False)[0]
+        c.simulate_cvd("protanopia")
+
+        assert c == Color.from_rgb(*expected)
+
+    def test_color_as_cvd(self):
+        """Tests that the accessors match the batch functions and leave the
+        color unchanged"""
+        c = Color.from_rgb(252, 186, 3)
+        rgb = c.as_rgb()
+
+        assert (
+            c.as_cvd("tritanopia", 0.5)
+            == cvd.simulate([rgb], "tritanopia", severity=0.5, lut=False)[0]
+        )
+        assert (
+            c.as_daltonized("protanopia")
+            == cvd.daltonize([rgb], "protanopia", lut=False)[0]
+        )
+        assert c == Color.from_rgb(252, 186, 3)
+
+    def test_simulator(self):
+        """Tests that the single color transforms match the batch functions"""
+        values = [(252, 186, 3), (3, 78, 252), (0, 0, 0)]
+
+        simulate = cvd.simulator("deuteranopia", severity=0.7)
+        daltonize = cvd.daltonizer("deuteranopia", lut=False)
+
+        assert [simulate(rgb) for rgb in values] == cvd.simulate(
+            values, "deuteranopia", severity=0.7
+        )
+        assert [daltonize(rgb) for rgb in values] == cvd.daltonize(
+            values, "deuteranopia", lut=False
+        )
+
+        with pytest.raises(ValueError):
+            simulate((0, -1, 0))
+
+    def test_color_daltonize_chaining(self):
+        """Tests that the Color methods support method chaining"""
+        hex_s = Color.from_hex("#FF0000").daltonize("deuteranopia").as_hex()
+
+        expected = cvd.daltonize([(255, 0, 0)], "deuteranopia", lut=False)[0]
+        assert hex_s == Color.from_rgb(*expected).as_hex()
+
+    def test_bad_kind(self):
+        """Tests the error handling of an unsupported deficiency"""
+        with pytest.raises(ValueError):
+            cvd.simulate([(0, 0, 0)], "achromatopsia")
+
+        with pytest.raises(ValueError):
+            Color.from_rgb(0, 0, 0).daltonize("achromatopsia")
+
+        with pytest.raises(ValueError):
+            Color.from_rgb(0, 0, 0).as_cvd("achromatopsia")
+
+        with pytest.raises(ValueError):
+            cvd.daltonizer("achromatopsia")
+
+    def test_bad_severity(self):
+        """Tests the error handling of severity out of range"""
+        with pytest.raises(ValueError):
+            cvd.simulate([(0, 0, 0)], "protanopia", severity=2)
+
+    @pytest.mark.parametrize("lut", [True, False])
+    def test_bad_value(self, lut):
+        """Tests the error handling of channel values out of range"""
+        with pytest.raises(ValueError):
+            cvd.simulate([(-1, 0, 0)], "protanopia", lut=lut)
+
+        with pytest.raises(ValueError):
+            cvd.simulate([(256, 0, 0)], "protanopia", lut=lut)
+
+        with pytest.raises(ValueError):
+            cvd.daltonize([(0, 0, 300)], "tritanopia", lut=lut)
+
+    def test_bad_buffer(self):
+        """Tests the error handling of a buffer with a partial pixel"""
+        with pytest.raises(ValueError):
+            cvd.simulate_pixels(bytes(4), "protanopia")
@@ -0,0 +1,161 @@
+import os
+
+import pytest
+
+from ciris import Color, convert
+from tests import differential
+
+# Every n-th input of the RGB cube and of the HSV and CMYK grids is checked
+# by default. The numbers are primes, so that the samples do not fall on a
+# pattern
+RGB_STEP = 4099
+HSV_STEP = 1031
+CMYK_STEP = 10007
+
+
+class TestDifferential:
+    @pytest.mark.parametrize(
+        "name",
+        [
+            name
+            for name, check in differential.CHECKS.items()
+            if check.domain.size == differential.HSV_GRID.size
+        ],
+    )
+    def test_sampled_hsv_grid(self, name):
+        """Tests the fast paths against the reference on a sample of the HSV
+        grid"""
+        (result,) = differential.sweep([name], step=HSV_STEP)
+
+        assert result.divergence_count == 0, differential.format_report(
+            [result]
+        )
+
+    @pytest.mark.parametrize(
+        "name",
+        [
+            name
+            for name, check in differential.CHECKS.items()
+            if check.domain.size == differential.RGB_CUBE.size
+        ],
+    )
+    def test_sampled_rgb_cube(self, name):
+        """Tests the fast paths against the reference on a sample of the RGB
+        cube"""
+        (result,) = differential.sweep([name], step=RGB_STEP)
+
+        assert result.divergence_count == 0, differential.format_report(
+            [result]
+        )
+
+    @pytest.mark.parametrize(
+        "name",
+        [
+            name
+            for name, check in differential.CHECKS.items()
+            if check.domain.size == differential.CMYK_GRID.size
+        ],
+    )
+    def test_sampled_cmyk_grid(self, name):
+        """Tests the fast paths against the reference on a sample of the CMYK
+        grid"""
+        (result,) = differential.sweep([name], step=CMYK_STEP)
+
+        assert result.divergence_count == 0, differential.format_report(
+            [result]
+        )
+
+    @pytest.mark.parametrize(
+        "name, value, color",
+        [
+            ("hex-cmyk", "#000507", lambda: Color.from_hex("#000507")),
+            ("rgb-cmyk", (1, 0, 0), lambda: Color.from_rgb(1, 0, 0)),
+            (
+                "cmyk-hsv",
+                (3, 97, 41, 88),
+                lambda: Color.from_cmyk(3, 97, 41, 88),
+            ),
+            (
+                "cmyk-rgb",
+                (3, 97, 41, 88),
+                lambda: Color.from_cmyk(3, 97, 41, 88),
+            ),
+            (
+                "cmyk-hex",
+                (3, 97, 41, 88),
+                lambda: Color.from_cmyk(3, 97, 41, 88),
+            ),
+        ],
+    )
+    def test_cmyk_checks(self, name, value, color):
+        """Tests that the CMYK paths are checked against the Color formulas"""
+        dst = name.split("-")[1]
+        if dst == "hsv":
+            expected = differential._color_hsv(color())
+        else:
+            expected = getattr(color(), f"as_{dst}")()
+
+        assert differential.CHECKS[name].reference(value) == expected
+        assert differential.CHECKS[name].fast([value]) == [expected]
+
+    def test_reference_is_independent(self, monkeypatch):
+        """Tests that a broken helper of ciris.color is reported, instead of
+        being compared with itself"""
+        from ciris import color
+
+        def broken(r, g, b):
+            return (0, 0, 0)
+
+        monkeypatch.setattr(color, "_rgb_to_hsv", broken)
+        monkeypatch.setattr(convert, "_rgb_to_hsv", broken)
+
+        results = differential.sweep(
+            ["rgb-hsv", "color-rgb-hsv"], step=RGB_STEP
+        )
+
+        assert all(result.divergence_count > 0 for result in results)
+
+    def test_edge_cases(self):
+        """Tests that the sampled sweeps always include the edge cases"""
+        (result,) = differential.sweep(["rgb-hsv"], step=1 << 24)
+
+        assert result.checked == len(differential.RGB_CUBE.edge_cases) + 1
+
+    def test_report_divergences(self, monkeypatch):
+        """Tests that the first divergences are reported in the domain order"""
+        monkeypatch.setitem(
+            differential.CHECKS,
+            "broken",
+            differential.Check(
+                differential.Domain(50, lambda index: (index, 0)),
+                lambda values: [(0, 0)] * len(values),
+                lambda value: value,
+            ),
+        )
+
+        (result,) = differential.sweep(["broken"], chunk_size=3)
+
+        assert result.checked == 50
+        assert result.divergence_count == 49
+        assert result.divergences[0] == ((1, 0), (0, 0), (1, 0))
+        assert len(result.divergences) == differential.MAX_DIVERGENCES
+        assert "(1, 0): fast (0, 0), reference (1, 0)" in (
+            differential.format_report([result])
+        )
+
+    def test_unknown_check(self):
+        """Tests the error handling of unknown checks"""
+        with pytest.raises(ValueError):
+            differential.sweep(["lab-hsv"])
+
+    @pytest.mark.skipif(
+        not os.environ.get("CIRIS_FULL_SWEEP"),
+        reason="the exhaustive sweep takes minutes, set CIRIS_FULL_SWEEP to run it",
+    )
+    def test_full_sweep(self):
+        """Tests the fast paths against the reference on every input"""
+        results = differential.sweep(jobs=os.cpu_count() or 1)
+
+        assert not any(
+            result.divergence_count for result in results
+        ), differential.format_report(results)
@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+
+import ciris
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative time budget for `from ciris import Color`, in microseconds, as
+# reported by `python -X importtime`. The import used to take ~45ms before
+# the package was split into lazily loaded submodules
+IMPORT_TIME_BUDGET_US = 20000
+
+# Modules that are too expensive to be imported by `import ciris`
+HEAVY_MODULES = ("asyncio", "dataclasses", "typing", "typing_extensions")
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _import_time_us(statement: str) -> int:
+    """Returns the cumulative import time of the ciris modules imported by
+    the statement"""
+    result = _run_python("-X", "importtime", "-c", statement)
+
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        # import time: self [us] | cumulative | imported package
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if name.strip() in ("ciris", "ciris.color"):
+            total += int(cumulative)
+
+    return total
+
+
+class TestImport:
+    def test_lazy_attributes(self):
+        """Tests that the lazily loaded public names are accessible"""
+        assert ciris.Color.__module__ == "ciris.color"
+        assert ciris.HarmonyRule.__module__ == "ciris.harmony"
+        assert "Color" in dir(ciris)
+        assert "aio" in dir(ciris)
+
+    def test_unknown_attribute(self):
+        """Tests that accessing a non-existent attribute raises AttributeError"""
+        with pytest.raises(AttributeError):
+            ciris.NotAColor
+
+    def test_import_does_not_load_heavy_modules(self):
+        """Tests that importing ciris and the Color class does not pull in
+        modules that are only needed by the optional features"""
+        script = (
+            "import sys\n"
+            "before = set(sys.modules)\n"
+            "from ciris import Color\n"
+            "print(' '.join(sorted(set(sys.modules) - before)))\n"
+        )
+
+        loaded = _run_python("-c", script).stdout.split()
+
+        for module in HEAVY_MODULES:
+            assert module not in loaded
+        assert "ciris.aio" not in loaded
+        assert "ciris.harmony" not in loaded
+
+    def test_import_time_budget(self):
+        """Tests that `from ciris import Color` fits in the import time budget.
+        The best of several runs is used to make the check less noisy"""
+        best = min(
+            _import_time_us("from ciris import Color") for _ in range(3)
+        )
+
+        assert best <= IMPORT_TIME_BUDGET_US
@@ -0,0 +1,108 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from ciris import Color
+from ciris.quantize import iter_quantize_rows, quantize
+
+BLACK_AND_WHITE = [Color.from_hex("#000000"), Color.from_hex("#FFFFFF")]
+RGB_PALETTE = [
+    Color.from_rgb(255, 0, 0),
+    Color.from_rgb(0, 255, 0),
+    Color.from_rgb(0, 0, 255),
+]
+
+
+def _gradient(width, height):
+    return bytes(
+        channel
+        for y in range(height)
+        for x in range(width)
+        for channel in ((x * 255) // max(width - 1, 1),) * 3
+    )
+
+
+class TestQuantize:
+    def test_quantize_nearest(self):
+        """Tests that every pixel is mapped to the nearest palette color"""
+        pixels = bytes([250, 10, 10, 5, 240, 20, 0, 30, 200, 255, 0, 0])
+
+        indices = quantize(pixels, 2, 2, RGB_PALETTE)
+
+        assert indices == bytearray([0, 1, 2, 0])
+
+    def test_quantize_bayer(self):
+        """Tests that ordered dithering of a flat gray mixes both colors"""
+        pixels = bytes([128, 128, 128] * 16)
+
+        indices = quantize(pixels, 4, 4, BLACK_AND_WHITE, method="bayer")
+
+        assert indices.count(0) == 8
+        assert indices.count(1) == 8
+
+    def test_quantize_floyd_steinberg(self):
+        """Tests that error diffusion preserves the average brightness"""
+        pixels = bytes([64, 64, 64] * 64)
+
+        indices = quantize(
+            pixels, 8, 8, BLACK_AND_WHITE, method="floyd_steinberg"
+        )
+
+        assert 12 <= indices.count(1) <= 20
+
+    @pytest.mark.parametrize("method", ["nearest", "bayer"])
+    def test_quantize_bands(self, method):
+        """Tests that splitting the image into bands processed by an executor
+        does not change the result of position-independent methods"""
+        pixels = _gradient(16, 10)
+
+        expected = quantize(pixels, 16, 10, BLACK_AND_WHITE, method=method)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            indices = quantize(
+                pixels,
+                16,
+                10,
+                BLACK_AND_WHITE,
+                method=method,
+                bands=3,
+                executor=executor,
+            )
+
+        assert indices == expected
+
+    def test_iter_quantize_rows(self):
+        """Tests that streaming the rows gives the same result as quantizing
+        the whole buffer"""
+        pixels = _gradient(8, 6)
+        rows = [pixels[i : i + 24] for i in range(0, len(pixels), 24)]
+
+        streamed = b"".join(
+            iter_quantize_rows(
+                rows, 8, BLACK_AND_WHITE, method="floyd_steinberg"
+            )
+        )
+
+        assert streamed == quantize(
+            pixels, 8, 6, BLACK_AND_WHITE, method="floyd_steinberg"
+        )
+
+    def test_quantize_bad_buffer(self):
+        """Tests the error handling of a buffer that does not match the size"""
+        with pytest.raises(ValueError):
+            quantize(bytes(10), 2, 2, BLACK_AND_WHITE)
+
+    @pytest.mark.parametrize("width, height", [(0, 3), (3, 0), (-1, -1)])
+    def test_quantize_bad_size(self, width, height):
+        """Tests the error handling of an empty or negative image size"""
+        with pytest.raises(ValueError, match="positive"):
+            quantize(b"", width, height, BLACK_AND_WHITE)
+
+    def test_quantize_bad_palette(self):
+        """Tests the error handling of an empty palette"""
+        with pytest.raises(ValueError):
+            quantize(bytes(12), 2, 2, [])
+
+    def test_quantize_bad_method(self):
+        """Tests the error handling of an unsupported method"""
+        with pytest.raises(ValueError):
+            quantize(bytes(12), 2, 2, BLACK_AND_WHITE, method="atkinson")
@@ -0,0 +1,147 @@
+import random
+from itertools import product
+
+import pytest
+from ciris import Color, HarmonyRule
+from ciris.search import HarmonyIndex, rule_offsets
+
+
+def _hue_distance(a, b):
+    distance = abs(a - b) % 360
+    return min(distance, 360 - distance)
+
+
+def _brute_force(colors, rule, tolerance, sv_tolerance=None):
+    """Scans the whole inventory for every derived color"""
+    found = set()
+
+    for i, base in enumerate(colors):
+        candidates = []
+        for offset in rule_offsets(rule):
+            candidates.append(
+                [
+                    j
+                    for j, color in enumerate(colors)
+                    if j != i
+                    and _hue_distance(color.h, base.h + offset) <= tolerance
+                    and (
+                        sv_tolerance is None
+                        or (
+                            abs(round(color.s * 100) - round(base.s * 100))
+                            <= sv_tolerance
+                            and abs(round(color.v * 100) - round(base.v * 100))
+                            <= sv_tolerance
+                        )
+                    )
+                ]
+            )
+
+        for secondary in product(*candidates):
+            if len(set(secondary)) == len(secondary):
+                found.add((i, *secondary))
+
+    return found
+
+
+@pytest.fixture
+def inventory():
+    rnd = random.Random(42)
+
+    return [
+        Color(rnd.randrange(360), rnd.randrange(101), rnd.randrange(101))
+        for _ in range(200)
+    ]
+
+
+class TestHarmonyIndex:
+    def test_rule_offsets(self):
+        """Tests that the offsets match the Color.harmony_<rule> methods"""
+        c = Color(100, 50, 50)
+
+        for rule in (
+            "split_complementary",
+            "triadic",
+            "tetradic",
+            "analogous",
+        ):
+            harmony = getattr(c, f"harmony_{rule}")()
+            expected = [color.h % 360 for color in harmony.secondary_colors]
+
+            assert [(100 + o) % 360 for o in rule_offsets(rule)] == expected
+
+    def test_rule_offsets_bad_rule(self):
+        """Tests the error handling of an unsupported rule"""
+        with pytest.raises(ValueError):
+            rule_offsets("monochrome")
+
+    def test_hue_range_wraps_around(self):
+        """Tests that hue ranges wrap around 0 degrees"""
+        colors = [Color(355, 50, 50), Color(3, 50, 50), Color(180, 50, 50)]
+        index = HarmonyIndex(colors)
+
+        assert sorted(index.hue_range(0, 5)) == [0, 1]
+        assert sorted(index.hue_range(358, 5)) == [0, 1]
+
+    @pytest.mark.parametrize("rule", ["split_complementary", "analogous"])
+    def test_find_matches_brute_force(self, inventory, rule):
+        """Tests the index against a scan of the whole inventory"""
+        index = HarmonyIndex(inventory)
+
+        found = list(index.find_indices(rule, 2))
+
+        assert len(found) == len(set(found))
+        assert set(found) == _brute_force(inventory, rule, 2)
+
+    @pytest.mark.parametrize("rule", ["complementary", "triadic", "tetradic"])
+    def test_find_symmetric_rules(self, inventory, rule):
+        """Tests that every set satisfying a symmetric rule is reported once"""
+        index = HarmonyIndex(inventory)
+
+        found = [frozenset(match) for match in index.find_indices(rule, 3)]
+        expected = {frozenset(m) for m in _brute_force(inventory, rule, 3)}
+
+        assert len(found) == len(set(found))
+        assert set(found) == expected
+
+    @pytest.mark.parametrize(
+        "rule, tolerance",
+        [("complementary", 40), ("triadic", 70), ("tetradic", 50)],
+    )
+    @pytest.mark.parametrize("sv_tolerance", [None, 30])
+    def test_find_symmetric_rules_wide(self, rule, tolerance, sv_tolerance):
+        """Tests that a set is reported once from its first member, even if
+        a member matches several offsets"""
+        rnd = random.Random(7)
+        inventory = [
+            Color(rnd.randrange(360), rnd.randrange(101), rnd.randrange(101))
+            for _ in range(40)
+        ]
+        index = HarmonyIndex(inventory)
+
+        found = list(
+            index.find_indices(rule, tolerance, sv_tolerance=sv_tolerance)
+        )
+        expected = {}
+        for match in sorted(
+            _brute_force(inventory, rule, tolerance, sv_tolerance)
+        ):
+            expected.setdefault(frozenset(match), match)
+
+        assert sorted(found) == sorted(expected.values())
+
+    def test_find_sv_tolerance(self, inventory):
+        """Tests the search limited by saturation and value"""
+        index = HarmonyIndex(inventory)
+
+        found = set(index.find_indices("analogous", 15, sv_tolerance=20))
+
+        assert found == _brute_force(inventory, "analogous", 15, 20)
+
+    def test_find_harmony_rules(self):
+        """Tests that the search returns HarmonyRule objects"""
+        base = Color.from_rgb(3, 78, 252)
+        colors = [base] + base.harmony_triadic().get_secondary_colors()
+
+        found = list(HarmonyIndex(colors).find("triadic", 0, sv_tolerance=0))
+
+        assert found == [HarmonyRule("triadic", colors[0], colors[1:])]
@@ -0,0 +1,115 @@
+import pytest
+from ciris import Color
+from ciris.stats import ColorStats
+
+
+class TestColorStats:
+    def test_empty(self):
+        """Tests that an empty accumulator has no statistics"""
+        stats = ColorStats()
+
+        assert stats.count == 0
+        assert stats.mean_hue() is None
+        assert stats.mean_saturation() is None
+        assert stats.median_value() is None
+
+    def test_circular_mean_hue(self):
+        """Tests that the mean hue wraps around 0 degrees"""
+        stats = ColorStats().update([Color(350, 50, 50), Color(10, 50, 50)])
+
+        mean = stats.mean_hue()
+
+        assert min(mean, 360 - mean) == pytest.approx(0, abs=1e-6)
+        assert stats.hue_concentration() == pytest.approx(0.985, abs=1e-3)
+
+    def test_saturation_and_value(self):
+        """Tests the mean and the median of saturation and value"""
+        stats = ColorStats().update(
+            [Color(0, 10, 20), Color(0, 20, 40), Color(0, 60, 90)]
+        )
+
+        assert stats.mean_saturation() == 30
+        assert stats.median_saturation() == 20
+        assert stats.mean_value() == 50
+        assert stats.median_value() == 40
+
+    def test_median_even(self):
+        """Tests the median of an even number of colors"""
+        stats = ColorStats().update([Color(0, 10, 10), Color(0, 20, 20)])
+
+        assert stats.median_saturation() == 15
+
+    def test_grays_have_no_hue(self):
+        """Tests that achromatic colors are excluded from the hue statistics"""
+        stats = ColorStats().update([Color(0, 0, 50), Color(120, 100, 100)])
+
+        assert stats.count == 2
+        assert stats.chromatic_count == 1
+        assert stats.mean_hue() == pytest.approx(120)
+
+    def test_hue_histogram(self):
+        """Tests the binning of hues"""
+        stats = ColorStats().update(
+            [Color(350, 50, 50), Color(14, 50, 50), Color(15, 50, 50)]
+        )
+
+        histogram = stats.hue_histogram(12)
+
+        assert len(histogram) == 12
+        assert histogram[0] == 2
+        assert histogram[1] == 1
+
+    def test_hue_histogram_bad_bins(self):
+        """Tests the error handling of a number of bins that does not
+        divide 360"""
+        for bins in (7, 0, -1):
+            with pytest.raises(ValueError):
+                ColorStats().hue_histogram(bins)
+
+            with pytest.raises(ValueError):
+                ColorStats().dominant_hues(bins=bins)
+
+    def test_dominant_hues(self):
+        """Tests that the most populated hue bins are returned first"""
+        colors = [Color(240, 90, 90)] * 3 + [Color(120, 90, 90)] * 2
+        stats = ColorStats().update(colors + [Color(0, 90, 90)])
+
+        assert stats.dominant_hues(2) == [(240, 3), (120, 2)]
+
+    def test_add_hsv_bad_value(self):
+        """Tests the error handling of HSV values out of range"""
+        stats = ColorStats()
+
+        for hsv in ((10, -1, 50), (10, 101, 50), (10, 50, 101), (361, 0, 0)):
+            with pytest.raises(ValueError):
+                stats.add_hsv(*hsv)
+
+        assert stats == ColorStats()
+
+    def test_update_pixels(self):
+        """Tests that pixel buffers give the same statistics as colors"""
+        rgb = [(252, 186, 3), (3, 78, 252), (255, 0, 255), (10, 10, 10)]
+        pixels = bytes(channel for value in rgb for channel in value)
+
+        from_pixels = ColorStats().update_pixels(pixels)
+        from_colors = ColorStats().update(Color.from_rgb(*v) for v in rgb)
+
+        assert from_pixels == from_colors
+
+    def test_update_pixels_bad_buffer(self):
+        """Tests the error handling of a buffer with a partial pixel"""
+        with pytest.raises(ValueError):
+            ColorStats().update_pixels(bytes(5))
+
+    def test_merge(self):
+        """Tests that merging partial results equals a single pass"""
+        colors = [Color.from_rgb(r, 255 - r, r // 2) for r in range(256)]
+
+        whole = ColorStats().update(colors)
+        head = ColorStats().update(colors[:100])
+        tail = ColorStats().update(colors[100:])
+
+        merged = head.merge(tail)
+
+        assert merged == whole
+        assert merged.mean_hue() == whole.mean_hue()
@@ -0,0 +1,160 @@
+import copy
+import threading
+
+import pytest
+from ciris import Color, convert
+from ciris.store import PaletteStore
+
+PALETTE = [
+    Color.from_hex("#3DFFE2"),
+    Color.from_rgb(252, 186, 3),
+    Color(0, 0, 0),
+]
+
+
+class TestPaletteStore:
+    def test_set_get(self):
+        """Tests adding and reading the palettes"""
+        store = PaletteStore({"base": PALETTE})
+        snapshot = store.set("accent", PALETTE[:1])
+
+        assert store["accent"] is snapshot
+        assert store.get("base").colors() == PALETTE
+        assert store.get("missing") is None
+        assert store.names() == ["accent", "base"]
+        assert "base" in store and len(store) == 2
+
+    def test_snapshot_is_immutable(self):
+        """Tests that modifying the colors does not affect the snapshot"""
+        colors = [Color.from_hex("#3DFFE2")]
+        store = PaletteStore({"base": colors})
+
+        colors[0].hue_shift(90)
+        store["base"].colors()[0].invert()
+        for color in store["base"]:
+            color.darken(50)
+
+        assert store["base"].view("hex") == ("#3DFFE2",)
+
+    def test_versions(self):
+        """Tests that every update publishes a new snapshot"""
+        store = PaletteStore({"base": PALETTE})
+        old = store["base"]
+
+        new = store.set("base", PALETTE[:1])
+
+        assert store.version == 1
+        assert (old.version, new.version) == (0, 1)
+        assert len(old) == 3 and len(new) == 1
+
+    def test_update_delete(self):
+        """Tests the read-modify-write updates and deleting the palettes"""
+        store = PaletteStore({"base": PALETTE})
+
+        store.update("base", lambda colors: [c.invert() for c in colors])
+
+        assert store["base"].colors() == [
+            copy.copy(c).invert() for c in PALETTE
+        ]
+
+        store.delete("base")
+
+        assert "base" not in store
+        with pytest.raises(KeyError):
+            store.delete("base")
+        with pytest.raises(KeyError):
+            store.update("base", list)
+
+    def test_snapshot_all(self):
+        """Tests that the snapshot of the store is not affected by updates"""
+        store = PaletteStore({"base": PALETTE})
+        palettes = store.snapshot()
+
+        store.set("accent", PALETTE)
+
+        assert list(palettes) == ["base"]
+
+    def test_views(self):
+        """Tests that the views match the Color methods and are cached"""
+        snapshot = PaletteStore({"base": PALETTE})["base"]
+
+        assert snapshot.view("hex") == tuple(c.as_hex() for c in PALETTE)
+        assert snapshot.view("cmyk") == tuple(c.as_cmyk() for c in PALETTE)
+        assert snapshot.view("hex") is snapshot.view("hex")
+
+    def test_views_custom_space(self, monkeypatch):
+        """Tests the views in the spaces that Color does not support"""
+        monkeypatch.setattr(
+            convert,
+            "_KERNELS",
+            {k: dict(v) for k, v in convert._KERNELS.items()},
+        )
+        monkeypatch.setattr(convert, "_CONVERTERS", {})
+        convert.register_kernel("rgb", "gray", lambda rgb: (sum(rgb) // 3,))
+
+        snapshot = PaletteStore({"base": PALETTE})["base"]
+
+        assert snapshot.view("gray") == ((180,), (147,), (0,))
+
+        with pytest.raises(ValueError):
+            snapshot.view("lab")
+
+    def test_harmonies(self):
+        """Tests that the cached harmonies match the Color methods"""
+        snapshot = PaletteStore({"base": PALETTE})["base"]
+
+        harmonies = snapshot.harmonies("analogous", phi=40)
+
+        assert harmonies is snapshot.harmonies("analogous", phi=40)
+        for color, colors in zip(PALETTE, harmonies):
+            rule = color.harmony_analogous(phi=40)
+            assert colors == (
+                rule.get_base_color().as_hex(),
+                *(c.as_hex() for c in rule.get_secondary_colors()),
+            )
+
+    def test_harmonies_bad_rule(self):
+        """Tests the error handling of unsupported rules and arguments"""
+        snapshot = PaletteStore({"base": PALETTE})["base"]
+
+        with pytest.raises(ValueError):
+            snapshot.harmonies("monochrome")
+
+        with pytest.raises(ValueError):
+            snapshot.harmonies("triadic", phi=40)
+
+    def test_concurrent_updates(self):
+        """Tests that the concurrent updates are not lost and the readers
+        never see a half-applied one"""
+        store = PaletteStore({"base": []})
+        errors = []
+        done = threading.Event()
+
+        def write():
+            for _ in range(50):
+                # Every version of the palette is made of a single hue
+                store.update(
+                    "base",
+                    lambda colors: [Color(len(colors), 50, 50)]
+                    * (len(colors) + 1),
+                )
+
+        def read():
+            while not done.is_set():
+                hues = {color.h for color in store["base"]}
+                if len(hues) > 1:
+                    errors.append(hues)
+
+        readers = [threading.Thread(target=read) for _ in range(2)]
+        writers = [threading.Thread(target=write) for _ in range(4)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        done.set()
+        for thread in readers:
+            thread.join()
+
+        assert not errors
+        assert len(store["base"]) == 200
+        assert store.version == 200